@@ -0,0 +1,51 @@
+"""
+Compares answering "how many birthdays in each of the next 52 weeks" with
+BirthdayIndex and with BirthdayColumns.
+
+Builds N random birthdays and times a full-year upcoming query bucketed by
+week on the index, then weekly_counts() on the columns, with NumPy when it
+is installed.
+
+Usage:
+    python benchmarks/bench_birthday_stats.py [N]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.models.indexes import BirthdayIndex, BirthdayColumns
+from personal_assistant.models.indexes import birthday_columns
+
+def build(count):
+    index, columns = BirthdayIndex(), BirthdayColumns()
+    for i in range(count):
+        birth_date = date(1940, 1, 1) + timedelta(days=random.randrange(30_000))
+        index.add(f"Contact {i}", birth_date)
+        columns.add(f"Contact {i}", birth_date)
+    return index, columns
+
+def index_weekly_counts(index, today):
+    counts = [0] * 52
+    for _, _, next_date in index.upcoming(today, 52 * 7 - 1):
+        counts[(next_date - today).days // 7] += 1
+    return counts
+
+def main(count=1_000_000):
+    index, columns = build(count)
+    today = date.today()
+    started = time.perf_counter()
+    expected = index_weekly_counts(index, today)
+    print(f"{count} birthdays: BirthdayIndex   {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    engine = "numpy" if birthday_columns.numpy is not None else "python"
+    started = time.perf_counter()
+    counts = columns.weekly_counts(today)
+    print(f"{count} birthdays: BirthdayColumns {(time.perf_counter() - started) * 1000:8.1f} ms ({engine})")
+    assert counts == expected
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
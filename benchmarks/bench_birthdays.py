@@ -0,0 +1,63 @@
+"""
+Measures birthday parsing and upcoming-birthday queries.
+
+Compares the previous approach (strptime plus datetime.now() for every value,
+and a datetime.now() call per record when looking for upcoming birthdays) with
+the fixed-width parser, a 'today' computed once and the birthday index.
+
+Usage:
+    python benchmarks/bench_birthdays.py [N]
+"""
+import os
+import sys
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook, Birthday
+from personal_assistant.models.interfaces import StorageBackend
+
+def strptime_birthday(value):
+    birth_date = datetime.strptime(value, "%d.%m.%Y").date()
+    if birth_date > datetime.now().date():
+        raise ValueError("Birthday cannot be in the future")
+    return birth_date
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+def main(count=200_000):
+    values = [f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 50}" for i in range(count)]
+    today = date.today()
+
+    old = timed(lambda: [strptime_birthday(value) for value in values])
+    new = timed(lambda: [Birthday(value, today) for value in values])
+    print(f"parse {count} birthdays: strptime+now {old:.3f}s, fast path {new:.3f}s ({old / new:.1f}x)")
+
+    manager = AddressBookManager(AddressBook(StorageBackend()))
+    for i, value in enumerate(values):
+        manager.add_record(f"Contact {i}")
+        manager.add_birthday(f"Contact {i}", Birthday(value, today))
+    records = manager.get_all_records()
+    manager.get_upcoming_birthdays(7)  # builds the birthday index
+
+    def scan(pass_today):
+        upcoming = []
+        for record in records:
+            next_date = record.get_next_birthday(today if pass_today else None)
+            if (next_date - today).days <= 7:
+                upcoming.append(record.name)
+        return upcoming
+
+    old = timed(lambda: scan(False))
+    new = timed(lambda: scan(True))
+    indexed = timed(lambda: manager.get_upcoming_birthdays(7, today))
+    print(f"upcoming birthdays in {count} contacts: scan with now() per record {old:.3f}s, "
+          f"scan with shared today {new:.3f}s, index {indexed * 1000:.2f} ms ({old / indexed:.0f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
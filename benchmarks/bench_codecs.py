@@ -0,0 +1,68 @@
+"""
+Compares save time, load time and file size of the snapshot file formats.
+
+Builds N contacts with two phones, a birthday, an address and an email, and
+saves and loads them with SnapshotStorage in every codec. 'objects' pickles
+the records as live objects, the way the address book was saved before the
+codecs; the other formats save them as tuples.
+
+The default run covers 10k, 100k and 1M contacts; the 1M run takes a few
+minutes, pass smaller counts to skip it.
+
+Usage:
+    python benchmarks/bench_codecs.py [N ...]    (default: 10000 100000 1000000)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.models import AddressBookRecord, Phone, Birthday, HomeAddress, Email
+from personal_assistant.models.interfaces import PickleStorage, SnapshotStorage
+
+STORAGES = {
+    "objects": lambda: PickleStorage("addressbook_state.pkl"),
+    "pickle": lambda: SnapshotStorage("addressbook_state.pkl", value_type=AddressBookRecord),
+    "json": lambda: SnapshotStorage("addressbook_state.json", value_type=AddressBookRecord),
+    "binary": lambda: SnapshotStorage("addressbook_state.bin", value_type=AddressBookRecord),
+}
+
+def build(count):
+    records = {}
+    for i in range(count):
+        record = AddressBookRecord(f"Contact {i}")
+        record.add_phone(Phone(f"050{i:07d}"))
+        record.add_phone(Phone(f"067{i:07d}"))
+        record.add_birthday(Birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 60}"))
+        record.add_address(HomeAddress(f"{i} Main Street"))
+        record.add_email(Email(f"contact{i}@example.com"))
+        records[record.name] = record
+    return records
+
+DEFAULT_COUNTS = (10_000, 100_000, 1_000_000)
+
+def main(counts=DEFAULT_COUNTS):
+    for count in counts:
+        records = build(count)
+        for name, create_storage in STORAGES.items():
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                storage = create_storage()
+                started = time.perf_counter()
+                storage.close(records)
+                saved = time.perf_counter() - started
+                size = os.path.getsize(storage.filename)
+
+                started = time.perf_counter()
+                loaded = create_storage().load()
+                elapsed = time.perf_counter() - started
+                assert len(loaded) == count
+                del loaded
+            print(f"{count:>8} contacts {name:8} save {saved * 1000:9.1f} ms  load {elapsed * 1000:9.1f} ms  "
+                  f"size {size / 1024 / 1024:8.2f} MiB")
+        del records
+
+if __name__ == "__main__":
+    main([int(count) for count in sys.argv[1:]] or DEFAULT_COUNTS)
@@ -0,0 +1,43 @@
+"""
+Measures the per-command overhead of the command dispatcher in batch mode.
+
+Runs N cheap commands through main.run_batch in a temporary directory: a
+greeting (pure dispatch), a command with a wrong number of arguments (dispatch
+and help message) and an unknown command. Reports microseconds per command.
+
+Usage:
+    python benchmarks/bench_dispatch.py [N]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from main import run_batch
+from personal_assistant import CommandsHandler
+
+SCENARIOS = {
+    "hello": "hi",
+    "arguments error": "search",
+    "unknown command": "frobnicate",
+}
+
+def measure(commands_handler, line, count):
+    lines = [line] * count
+    started = time.perf_counter()
+    run_batch(commands_handler, lines, io.StringIO(), errors_only=True)
+    return (time.perf_counter() - started) / count * 1_000_000
+
+def main(count=100_000):
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        commands_handler = CommandsHandler()
+        for scenario, line in SCENARIOS.items():
+            print(f"{scenario:16} {measure(commands_handler, line, count):6.2f} us/command")
+        commands_handler.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,48 @@
+"""
+Compares contact import throughput with 1, 2, 4 and 8 worker processes.
+
+Writes a CSV file with N rows (phones, birthday, address and email) to a
+temporary directory and imports it into an in-memory address book with each
+worker count, reporting rows per second and the speedup over one worker.
+
+Usage:
+    python benchmarks/bench_import.py [N]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook
+from personal_assistant.models.interfaces import StorageBackend
+
+WORKERS = (1, 2, 4, 8)
+
+def write_contacts(filename, count):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("name,phones,birthday,address,email\n")
+        for i in range(count):
+            f.write(f"Contact {i},+38 (050) {i:07d};044-{i % 1000:03d}-{i % 10000:04d},"
+                    f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 50},"
+                    f"{i} Main St,contact{i}@example.com\n")
+
+def main(count=200_000):
+    print(f"{os.cpu_count()} CPUs, {count} rows")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "contacts.csv")
+        write_contacts(filename, count)
+        baseline = None
+        for workers in WORKERS:
+            manager = AddressBookManager(AddressBook(StorageBackend()))
+            started = time.perf_counter()
+            result = manager.import_contacts(filename, chunk_size=5000, workers=workers)
+            elapsed = time.perf_counter() - started
+            assert result["imported"] == count, result
+            baseline = baseline or elapsed
+            print(f"{workers} workers: {count / elapsed:9.0f} rows/s, speedup {baseline / elapsed:.2f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,75 @@
+"""
+Compares a read-only session on a pickle snapshot and on a mapped snapshot.
+
+Saves N contacts with a phone and a birthday in a temporary directory in both
+layouts, then, in a fresh interpreter for each, opens the address book, looks
+up one contact, lists the upcoming birthdays and reports the time to each
+step and the peak memory of the process.
+
+Usage:
+    python benchmarks/bench_mapped.py [N]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook, AddressBookRecord, Birthday, MappedStorage, Phone
+from personal_assistant.models.interfaces import SnapshotStorage
+
+LAYOUTS = {
+    "pickle": lambda: AddressBook(SnapshotStorage("addressbook_state.pkl", value_type=AddressBookRecord)),
+    "mapped": lambda: AddressBook(MappedStorage("addressbook_state.pkl")),
+}
+
+def populate(count, layout):
+    address_book = LAYOUTS[layout]()
+    for i in range(count):
+        record = AddressBookRecord(f"Contact {i}")
+        record.add_phone(Phone(f"050{i:07d}"))
+        record.add_birthday(Birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 60}"))
+        address_book[record.name] = record
+    address_book.close()
+
+def peak_memory():
+    """Peak resident memory of this process in MiB."""
+    try:
+        # Unlike ru_maxrss, VmHWM is not inherited from the parent across exec
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def report(count, layout):
+    started = time.perf_counter()
+    manager = AddressBookManager(LAYOUTS[layout]())
+    manager.find("Contact 42")
+    found = time.perf_counter()
+    manager.get_upcoming_birthdays(7)
+    listed = time.perf_counter()
+    manager.close()
+    peak = peak_memory()
+    print(f"{layout:7} {count} contacts: first lookup {(found - started) * 1000:8.1f} ms, "
+          f"upcoming birthdays {(listed - started) * 1000:8.1f} ms, peak RSS {peak:6.1f} MiB")
+
+def main(count=100_000):
+    for layout in LAYOUTS:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            populate(count, layout)
+            # Measure in a fresh interpreter, like a new bot process
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", str(count), layout], check=True)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        report(int(sys.argv[2]), sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
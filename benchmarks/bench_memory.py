@@ -0,0 +1,38 @@
+"""
+Measures the memory footprint of address book records.
+
+Builds N records with a phone, an email and a birthday each and reports the
+bytes allocated per record, measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_memory.py [N]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.models import AddressBookRecord, Phone, Email, Birthday
+
+def build_records(count):
+    records = []
+    for i in range(count):
+        record = AddressBookRecord(f"Contact {i}")
+        record.add_phone(Phone(f"+38 (050) {i % 10000000:07d}"))
+        record.add_email(Email(f"contact{i}@example.com"))
+        record.add_birthday(Birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 50}"))
+        records.append(record)
+    return records
+
+def main(count=100_000):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    records = build_records(count)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(records)} records: {(after - before) / count:.0f} bytes/record, "
+          f"peak {peak / 2 ** 20:.1f} MiB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,50 @@
+"""
+Measures listing an unchanged address book again with the 'all' command.
+
+Builds N contacts with a phone, a birthday and an email, then times rendering
+the whole book twice and the same 50-contact page twice through
+CommandsHandler. The second runs reuse the strings cached on the records and
+the manager's page cache.
+
+Usage:
+    python benchmarks/bench_render.py [N]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.commands_handler import CommandsHandler
+from personal_assistant.managers import AddressBookManager, NotesManager
+from personal_assistant.models import AddressBook, AddressBookRecord, Birthday, Email, Notebook, Phone
+from personal_assistant.models.interfaces import StorageBackend
+
+def build(count):
+    address_book = AddressBook(StorageBackend())
+    for i in range(count):
+        record = AddressBookRecord(f"Contact {i}")
+        record.add_phone(Phone(f"050{i:07d}"))
+        record.add_birthday(Birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.{1950 + i % 60}"))
+        record.add_email(Email(f"contact{i}@example.com"))
+        address_book[record.name] = record
+    return address_book
+
+def timed(handler, args, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _ in handler.execute_command("all", args).lines():
+            pass
+    return (time.perf_counter() - started) / repeat * 1000
+
+def main(count=500_000):
+    handler = CommandsHandler(AddressBookManager(build(count)), NotesManager(Notebook(StorageBackend())))
+    print(f"{count} contacts: all, first    {timed(handler, []):9.1f} ms")
+    print(f"{count} contacts: all, again    {timed(handler, []):9.1f} ms")
+    page = [str(count // 2), "50"]
+    handler.address_book_manager.add_record("Changed")
+    print(f"{count} contacts: page, first   {timed(handler, page):9.3f} ms")
+    print(f"{count} contacts: page, again   {timed(handler, page, repeat=100):9.3f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,46 @@
+"""
+Measures the cost of saving after editing a single contact.
+
+Builds an address book with N contacts on every storage layout, then adds a
+phone to one contact through AddressBookManager and times flush().
+
+Usage:
+    python benchmarks/bench_save.py [N]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook, AddressBookRecord, SqliteAddressBook, Phone
+from personal_assistant.models.interfaces import PickleStorage, JournalStorage, ShardedStorage
+
+BOOKS = {
+    "pickle": lambda: AddressBook(PickleStorage("addressbook_state.pkl")),
+    "journal": lambda: AddressBook(JournalStorage("addressbook_state.pkl", value_type=AddressBookRecord)),
+    "sharded": lambda: AddressBook(ShardedStorage("addressbook_state.pkl", value_type=AddressBookRecord)),
+    "sqlite": lambda: SqliteAddressBook("addressbook_state.sqlite3"),
+}
+
+def main(count=100_000):
+    for layout, create_book in BOOKS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            manager = AddressBookManager(create_book())
+            for i in range(count):
+                manager.add_record(f"Contact {i}")
+                manager.add_phone(f"Contact {i}", Phone(f"050{i:07d}"))
+            manager.flush()
+
+            manager.add_phone("Contact 42", Phone("0441234567"))
+            started = time.perf_counter()
+            manager.flush()
+            elapsed = time.perf_counter() - started
+            manager.close()
+            print(f"{layout:8} {count} contacts: flush after one edit {elapsed * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,97 @@
+"""
+Load generator for the multi-session server.
+
+Opens many concurrent sessions, each sending a mix of contact and note
+commands, and reports the p50/p99 command latency and the throughput. Without
+--address, a server with 'contacts' contacts is started in this process in a
+temporary directory.
+
+Usage:
+    python benchmarks/bench_server.py [--address HOST:PORT|unix:PATH]
+                                      [--sessions 200] [--commands 50] [--contacts 10000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant import AssistantServer, AddressBookManager, NotesManager, Phone
+
+def session_commands(session, count, contacts):
+    for i in range(count):
+        contact = f"'Contact {(session * count + i) % contacts}'"
+        yield (
+            f"search {contact}",
+            f"add-phone {contact} {session:04d}{i:06d}",
+            f"add-note 'Session {session} note {i}' 'Call {contact} about the report'",
+            "find-notes report",
+            "search Contact*",
+        )[i % 5]
+
+async def open_connection(address):
+    if address.startswith("unix:"):
+        return await asyncio.open_unix_connection(address[len("unix:"):])
+    host, _, port = address.rpartition(":")
+    return await asyncio.open_connection(host, int(port))
+
+async def run_session(address, session, count, contacts, latencies):
+    reader, writer = await open_connection(address)
+    for command in session_commands(session, count, contacts):
+        started = time.perf_counter()
+        writer.write(command.encode() + b"\n")
+        await writer.drain()
+        while await reader.readline() != b".\n":
+            pass
+        latencies.append(time.perf_counter() - started)
+    writer.write(b"exit\n")
+    await writer.drain()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+def start_local_server(contacts):
+    address_book_manager = AddressBookManager()
+    for i in range(contacts):
+        address_book_manager.add_record(f"Contact {i}")
+        address_book_manager.add_phone(f"Contact {i}", Phone(f"050{i:07d}"))
+    return AssistantServer(address_book_manager, NotesManager())
+
+async def run(arguments):
+    server = None
+    address = arguments.address
+    if address is None:
+        server = start_local_server(arguments.contacts)
+        listening = await server.start("127.0.0.1:0")
+        address = "127.0.0.1:{}".format(listening.sockets[0].getsockname()[1])
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(address, session, arguments.commands, arguments.contacts, latencies)
+                           for session in range(arguments.sessions)))
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.close()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{arguments.sessions} sessions, {len(latencies)} commands in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} commands/s)")
+    print(f"latency p50 {percentiles[49] * 1000:.2f} ms, p99 {percentiles[98] * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--address")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--contacts", type=int, default=10000)
+    arguments = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        asyncio.run(run(arguments))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures the time to the first prompt and to the first contact lookup.
+
+Saves N contacts (and N notes) in a temporary directory, once as single pickle
+files and once as shard files, then times creating the CommandsHandler and
+running one 'search' command on each layout.
+
+Usage:
+    python benchmarks/bench_startup.py [N]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_assistant import CommandsHandler
+from personal_assistant.managers import AddressBookManager, NotesManager
+from personal_assistant.models import AddressBook, AddressBookRecord, Notebook, Phone, ShardedStorage
+
+def create_handler(sharded):
+    if not sharded:
+        return CommandsHandler()
+    return CommandsHandler(
+        AddressBookManager(AddressBook(ShardedStorage("addressbook_state.pkl", value_type=AddressBookRecord))),
+        NotesManager(notebook=Notebook(ShardedStorage("notes_state.pkl"))))
+
+def populate(count, sharded):
+    handler = create_handler(sharded)
+    manager = handler.address_book_manager
+    for i in range(count):
+        manager.add_record(f"Contact {i}")
+        manager.add_phone(f"Contact {i}", Phone(f"050{i:07d}"))
+        handler.notes_manager.add_note(f"Note {i}", f"Call contact {i} about the meeting")
+    handler.close()
+
+def measure(sharded):
+    started = time.perf_counter()
+    handler = create_handler(sharded)
+    ready = time.perf_counter()
+    handler.execute_command("search", ["Contact 42"])
+    found = time.perf_counter()
+    handler.close()
+    return (ready - started) * 1000, (found - started) * 1000
+
+def main(count=50_000):
+    for sharded in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            populate(count, sharded)
+            # Measure in a fresh interpreter, like a real cold start
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", str(count), str(int(sharded))],
+                           check=True)
+
+def report(count, sharded):
+    startup, lookup = measure(sharded)
+    layout = "sharded" if sharded else "pickle"
+    print(f"{layout:8} {count} contacts: first prompt {startup:.1f} ms, first lookup {lookup:.1f} ms")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        report(int(sys.argv[2]), bool(int(sys.argv[3])))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -13,7 +13,15 @@ setup(
         "dev": [
             "pytest>=6.0",
             "pytest-cov",
-        ]
+        ],
+        # Faster BinaryCodec; the built-in encoder writes the same format
+        "msgpack": [
+            "msgpack>=1.0",
+        ],
+        # Vectorized BirthdayColumns queries; they fall back to plain Python without it
+        "numpy": [
+            "numpy>=1.22",
+        ],
     },
     author="Team 13",
     description="A personal assistant bot for managing contacts and notes",
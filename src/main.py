@@ -10,51 +10,242 @@ The bot supports commands for:
 - Managing notes (creating, updating, deleting notes)
 - Viewing contact and note information
 """
-import shlex
-from personal_assistant import CommandsHandler
+import argparse
+import asyncio
+import cProfile
+import pstats
+import sys
+import time
+from personal_assistant import AssistantServer, CommandsHandler, parse_input
+from personal_assistant.managers import AddressBookManager, NotesManager
+from personal_assistant.models import (AddressBook, AddressBookRecord, Notebook, SnapshotStorage, JournalStorage,
+                                      ShardedStorage, MappedStorage)
 
-def parse_input(user_input):
+def print_response(response, page_size=0):
     """
-    Parse the user input into a command and its arguments.
-    Splits the input string by spaces while respecting quoted substrings,
-    allowing for multi-word arguments enclosed in quotes.
+    Print a response line by line, so long listings start printing immediately.
     Args:
-        user_input (str): The raw input string from the user.
+        response (CommandsHandler.Response): The response to print.
+        page_size (int): Pause after this many lines; 0 prints without pausing.
+    """
+    if response.is_error:
+        print(f"Error: {response.message}")
+        return
+
+    for number, line in enumerate(response.lines()):
+        if page_size and number and number % page_size == 0:
+            if input("-- More (Enter to continue, q to stop) --").strip().lower() == "q":
+                break
+        print(line)
+
+def run_batch(commands_handler, lines, output, errors_only=False, buffer_size=1024):
+    """
+    Execute commands read from lines without any interaction.
+    Output is collected and written in chunks of buffer_size lines. Blank lines and
+    lines starting with '#' are skipped, and an exit command stops the batch.
+    Args:
+        commands_handler (CommandsHandler): The handler that executes the commands.
+        lines (Iterable[str]): Command lines, e.g. an open file.
+        output (TextIO): Where responses are written.
+        errors_only (bool): Write only the responses of failed commands.
+        buffer_size (int): Number of output lines buffered between two writes.
     Returns:
-        tuple: A tuple containing the command name and arguments.
+        tuple: The number of executed commands and the number of failed ones.
+    """
+    executed = failed = 0
+    buffer = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        try:
+            cmd, args = parse_input(line)
+        except ValueError as e:
+            response = CommandsHandler.Response(f"Parse error: {e}", is_error=True)
+        else:
+            response = commands_handler.execute_command(cmd, args)
+        executed += 1
+
+        if response.is_error:
+            failed += 1
+            buffer.append(f"Line {line_number}: Error: {response.message}")
+        elif not errors_only:
+            buffer.extend(response.lines())
+        if len(buffer) >= buffer_size:
+            output.write("\n".join(buffer) + "\n")
+            buffer.clear()
+
+        if response.should_exit:
+            break
+
+    if buffer:
+        output.write("\n".join(buffer) + "\n")
+    return executed, failed
+
+STORAGES = {
+    "file": SnapshotStorage,
+    "journal": JournalStorage,
+    "sharded": ShardedStorage,
+    "mapped": MappedStorage,
+}
+
+FORMATS = {
+    "pickle": ".pkl",
+    "json": ".json",
+    "binary": ".bin",
+}
+
+def create_storage(arguments, name, value_type=None):
+    """
+    Create the --storage backend for the state file 'name'. A single file is
+    written in the --format encoding; the journal and shards are always pickled.
+    The mapped snapshot only holds contacts, so notes use a single file with it.
+    """
+    storage = arguments.storage
+    if storage == "mapped" and value_type is not AddressBookRecord:
+        storage = "file"
+    if storage == "file":
+        return SnapshotStorage(name + FORMATS[arguments.format], value_type=value_type)
+    if storage == "mapped":
+        return MappedStorage(name + ".pkl")
+    return STORAGES[storage](name + ".pkl", value_type=value_type)
+
+def create_commands_handler(arguments, thread_safe=False, checkpoint=True):
     """
-    parts = shlex.split(user_input)
-    cmd = parts[0].lower() if parts else ""
-    args = parts[1:] if len(parts) > 1 else []
+    Create the commands handler, keeping the data in the --storage layout and,
+    unless checkpoint=False, checkpointing changes in the background every
+    --autosave seconds if it is set. The managers are thread safe with
+    thread_safe=True or a checkpoint interval.
+    """
+    interval = arguments.autosave if checkpoint and arguments.autosave else None
+    return CommandsHandler(
+        AddressBookManager(AddressBook(create_storage(arguments, "addressbook_state", AddressBookRecord)),
+                           thread_safe=thread_safe, checkpoint_interval=interval),
+        NotesManager(notebook=Notebook(create_storage(arguments, "notes_state")), thread_safe=thread_safe,
+                     checkpoint_interval=interval))
+
+def batch(arguments):
+    """
+    Run the commands from the --batch file (or stdin for '-'), save once at the end
+    and report the throughput on stderr. --autosave is ignored.
+    """
+    commands_handler = create_commands_handler(arguments, checkpoint=False)
+    source = sys.stdin if arguments.batch == "-" else open(arguments.batch, encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        executed, failed = run_batch(commands_handler, source, sys.stdout, arguments.errors_only)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        commands_handler.close()
+    elapsed = time.perf_counter() - started
+    rate = executed / elapsed if elapsed else 0
+    print(f"Executed {executed} commands ({failed} failed) in {elapsed:.2f}s, {rate:.0f} commands/s.",
+          file=sys.stderr)
+    return 1 if failed else 0
 
-    return cmd, args
+def serve(arguments):
+    """
+    Serve many concurrent sessions on the --serve address until interrupted.
+    """
+    commands_handler = create_commands_handler(arguments, thread_safe=True)
+    server = AssistantServer(commands_handler.address_book_manager, commands_handler.notes_manager)
+    print(f"Serving on {arguments.serve}, press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever(arguments.serve))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Personal Assistant Bot")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="pause long listings after this many lines (default: no pause)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) instead of the interactive prompt")
+    parser.add_argument("--errors-only", action="store_true",
+                        help="in batch mode, print only the commands that failed")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="serve many sessions on HOST:PORT or unix:PATH instead of the interactive prompt")
+    parser.add_argument("--storage", choices=STORAGES, default="file",
+                        help="how contacts and notes are saved: one file rewritten on save (default), "
+                             "a journal of changes, shard files that are read on demand, or a memory-mapped "
+                             "contacts snapshot that opens instantly")
+    parser.add_argument("--format", choices=FORMATS, default="pickle",
+                        help="encoding of the single file storage: pickle (default, fastest), "
+                             "json or binary (safe to load from untrusted sources)")
+    parser.add_argument("--autosave", type=float, metavar="SECONDS", default=0,
+                        help="also save changes in the background every SECONDS seconds, which makes listings "
+                             "read in chunks (default: off; ignored with --batch); they are always saved on exit")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the session with cProfile, save the statistics to FILE and print the "
+                             "slowest calls on exit; with --serve, commands run in worker threads and are not "
+                             "profiled")
+    return parser.parse_args(argv)
+
+PROFILE_LINES = 30
+
+def profile(run, arguments):
+    """
+    Call run(arguments) under cProfile. The statistics are saved to the --profile
+    file, for pstats or snakeviz, and the PROFILE_LINES calls with the highest
+    cumulative time are printed on stderr, also when the session fails.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run, arguments)
+    finally:
+        profiler.dump_stats(arguments.profile)
+        print(f"Profile saved to {arguments.profile}.", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_LINES)
 
-def main():
+def main(argv=None):
+    """
+    Run the bot in the mode chosen on the command line, under the profiler with --profile.
+    """
+    arguments = parse_arguments(argv)
+    if arguments.profile:
+        return profile(run, arguments)
+    return run(arguments)
+
+def run(arguments):
+    if arguments.batch:
+        return batch(arguments)
+    if arguments.serve:
+        return serve(arguments)
+    return interactive(arguments)
+
+def interactive(arguments):
     """
     Main interactive loop of the Personal Assistant bot.
     The loop continues until the user enters an exit command, processing each
     command through the CommandsHandler and displaying appropriate responses.
     """
-
-    commands_handler = CommandsHandler()
+    commands_handler = create_commands_handler(arguments)
     print("Welcome! I am your assistant bot. You can manage your contacts and notes here.")
     print(commands_handler.get_help())
 
-    while True:
-        user_input = input("Enter a command: ")
-        cmd, args = parse_input(user_input)
-        if not cmd:
-            print("Please enter a command.")
-            continue
+    try:
+        while True:
+            user_input = input("Enter a command: ")
+            cmd, args = parse_input(user_input)
+            if not cmd:
+                print("Please enter a command.")
+                continue
 
-        response = commands_handler.execute_command(cmd, args)
-        if response.is_error:
-            print(f"Error: {response.message}")
-        else:
-            print(response.message)
+            response = commands_handler.execute_command(cmd, args)
+            print_response(response, arguments.page_size)
 
-        if response.should_exit:
-            break
+            if response.should_exit:
+                break
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        # Also saves when the prompt is interrupted with Ctrl+C or Ctrl+D
+        commands_handler.close()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -14,6 +14,9 @@ Modules:
     models: Contains data models for contacts, notes, and related entities
     commands: Command handlers for user interactions
     commands_palette: Command palette for mapping user inputs to commands
+    input_parser: Splits a line of user input into a command and its arguments
+    server: Asyncio server running many sessions against shared managers
+    instrumentation: Latency histograms and counters shown by the stats command
     main: Entry point for the application
 
 Authors: Team 13 (Veronika, Ilona, Vitalii)
@@ -21,7 +24,10 @@ Project: GoIT Python Core Final Project
 """
 
 from .managers import AddressBookManager, NotesManager
-from .models import AddressBook, Notebook, AddressBookRecord, HomeAddress, Phone, Birthday, Email
+from .models import AddressBook, SqliteAddressBook, Notebook, AddressBookRecord, HomeAddress, Phone, Birthday, Email
 from .commands_handler import CommandsHandler
+from .input_parser import parse_input
+from .server import AssistantServer
 
-__all__ = ['AddressBookManager', 'NotesManager', 'AddressBook', 'Notebook', 'AddressBookRecord', 'HomeAddress', 'Phone', 'Birthday', 'Email', 'CommandsHandler']
\ No newline at end of file
+__all__ = ['AddressBookManager', 'NotesManager', 'AddressBook', 'SqliteAddressBook', 'Notebook', 'AddressBookRecord', 'HomeAddress', 'Phone', 'Birthday', 'Email', 'CommandsHandler',
+           'parse_input', 'AssistantServer']
\ No newline at end of file
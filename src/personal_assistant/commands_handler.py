@@ -1,6 +1,47 @@
+import inspect
+import time
+from .instrumentation import METRICS
 from .managers import AddressBookManager, NotesManager
 from .models import HomeAddress, Phone, Birthday
-from .commands_palette import COMMANDS, get_help_message
+from .commands_palette import COMMANDS, ALIASES, CommandsInfo, get_help_message
+
+
+class _CompiledCommand:
+    """
+    A command handler with its accepted argument range resolved once.
+
+    Attributes:
+        name (str): The command name, used to look up its help message
+        store (str | None): The store the command works on, see CommandsInfo
+        function (callable): The bound handler method
+        min_args (int): Number of required arguments
+        max_args (int | None): Maximum number of arguments, None for varargs handlers
+    """
+
+    __slots__ = ("name", "store", "function", "min_args", "max_args")
+
+    def __init__(self, info: CommandsInfo, function):
+        self.name = info.name
+        self.store = info.store
+        self.function = function
+        self.min_args = self.max_args = 0
+        for parameter in inspect.signature(function).parameters.values():
+            if parameter.kind == parameter.VAR_POSITIONAL:
+                self.max_args = None
+            elif parameter.kind == parameter.POSITIONAL_OR_KEYWORD:
+                self.max_args += 1
+                if parameter.default is parameter.empty:
+                    self.min_args += 1
+
+    def accepts(self, count: int) -> bool:
+        return self.min_args <= count and (self.max_args is None or count <= self.max_args)
+
+    def expected(self) -> str:
+        if self.max_args is None:
+            return f"at least {self.min_args}"
+        if self.min_args != self.max_args:
+            return f"{self.min_args} to {self.max_args}"
+        return f"{self.min_args}"
 
 class CommandsHandler:
     """
@@ -17,28 +58,61 @@ class CommandsHandler:
         address_book_manager (AddressBookManager): Handles contact-related operations
         notes_manager (NotesManager): Handles note-related operations
         commands (dict): Registry of available commands with their metadata
+
+    The registry is compiled once into a dispatch table that resolves aliases and
+    knows each command's argument range, so executing a command costs one
+    dictionary lookup. Help messages are rendered on first use and cached.
+    The latency of every command is recorded in METRICS as 'command.<name>';
+    for streamed responses it covers producing the response, not reading its
+    lines.
+    Handler functions are bound per instance and the shared command metadata is
+    immutable, so any number of handlers can live in one process.
     """
 
-    def __init__(self):
-        self.address_book_manager = AddressBookManager()
-        self.notes_manager = NotesManager()
-
-        # Map command names to their handler methods
-        self.commands = COMMANDS.copy()
-        self.commands["help"].function = self.get_help
-        self.commands["add-phone"].function = self.__add_phone
-        self.commands["remove-phone"].function = self.__remove_phone
-        self.commands["add-birthday"].function = self.__add_birthday
-        self.commands["add-address"].function = self.__add_address
-        self.commands["upcoming-birthdays"].function = self.__upcoming_birthdays
-        self.commands["search"].function = self.__show_contact
-        self.commands["delete"].function = self.__delete_contact
-        self.commands["all"].function = self.__show_all_contacts
-        self.commands["add-note"].function = self.__add_note
-        self.commands["search-note"].function = self.__show_note
-        self.commands["update-note"].function = self.__update_note
-        self.commands["delete-note"].function = self.__delete_note
-        self.commands["all-notes"].function = self.__show_all_notes
+    SEARCH_RESULTS_LIMIT = 10
+
+    def __init__(self, address_book_manager: AddressBookManager = None, notes_manager: NotesManager = None):
+        self.address_book_manager = address_book_manager or AddressBookManager()
+        self.notes_manager = notes_manager or NotesManager()
+
+        # Map command names to this instance's handler methods
+        handlers = {
+            "hello": self.__hello,
+            "help": self.get_help,
+            "add-phone": self.__add_phone,
+            "remove-phone": self.__remove_phone,
+            "add-birthday": self.__add_birthday,
+            "add-address": self.__add_address,
+            "upcoming-birthdays": self.__upcoming_birthdays,
+            "birthday-stats": self.__birthday_stats,
+            "turning": self.__turning,
+            "search": self.__show_contact,
+            "search-phone": self.__show_contacts_by_phone,
+            "delete": self.__delete_contact,
+            "all": self.__show_all_contacts,
+            "import-contacts": self.__import_contacts,
+            "export-contacts": self.__export_contacts,
+            "add-note": self.__add_note,
+            "search-note": self.__show_note,
+            "find-notes": self.__find_notes,
+            "update-note": self.__update_note,
+            "delete-note": self.__delete_note,
+            "all-notes": self.__show_all_notes,
+            "stats": self.__stats,
+            "exit": self.__exit,
+            "close": self.__exit,
+        }
+        self.commands = dict(COMMANDS)
+        self.__dispatch_table = {name: _CompiledCommand(info, handlers[name]) for name, info in self.commands.items()}
+        for alias, name in ALIASES.items():
+            self.__dispatch_table[alias] = self.__dispatch_table[name]
+        self.__help_messages = {}
+
+    def __hello(self):
+        return CommandsHandler.Response("How can I help you?")
+
+    def __exit(self):
+        return CommandsHandler.Response("Goodbye!", should_exit=True)
 
     def __add_phone(self, name, phone) -> str:
         self.address_book_manager.add_phone(name, Phone(phone))
@@ -56,7 +130,7 @@ class CommandsHandler:
         self.address_book_manager.add_address(name, HomeAddress(*args))
         return f"Address {args} added for contact {name}."
 
-    def __upcoming_birthdays(self, days) -> str:
+    def __upcoming_birthdays(self, days="7") -> str:
         birthdays = self.address_book_manager.get_upcoming_birthdays(int(days))
         if not birthdays:
             return f"No upcoming birthdays in {days} days."
@@ -64,18 +138,62 @@ class CommandsHandler:
             f"\t{b['name']} - {b['next_date']} (turning {b['years_reached']})" for b in birthdays
         )
 
+    def __birthday_stats(self, weeks="52") -> str:
+        stats = self.address_book_manager.get_birthday_stats(int(weeks))
+        return "Birthdays per week:\n" + "\n".join(
+            f"\tWeek of {week_start}: {count}" for week_start, count in stats
+        )
+
+    def __turning(self, age, days="365") -> str:
+        birthdays = self.address_book_manager.get_turning(int(age), int(days))
+        if not birthdays:
+            return f"Nobody turns {age} in {days} days."
+        return f"Turning {age}:\n" + "\n".join(f"\t{b['name']} - {b['next_date']}" for b in birthdays)
+
     def __show_contact(self, name) -> str:
+        if name.endswith("*"):
+            contacts = self.address_book_manager.find_by_prefix(name[:-1], self.SEARCH_RESULTS_LIMIT)
+            if not contacts:
+                raise KeyError(f"No contact with name starting with '{name[:-1]}' found.")
+            return "\n".join(str(contact) for contact in contacts)
+        if name.startswith("~"):
+            contacts = self.address_book_manager.find_similar(name[1:], self.SEARCH_RESULTS_LIMIT)
+            if not contacts:
+                raise KeyError(f"No contact with name similar to '{name[1:]}' found.")
+            return "\n".join(str(contact) for contact in contacts)
+
         contact = self.address_book_manager.find(name)
         if contact is None:
             raise KeyError(f"Contact with name '{name}' not found.")
         return str(contact)
-    
+
+    def __show_contacts_by_phone(self, phone) -> str:
+        contacts = self.address_book_manager.find_by_phone(phone)
+        if not contacts:
+            raise KeyError(f"No contact with phone '{phone}' found.")
+        return "\n".join(str(contact) for contact in contacts)
+
     def __delete_contact(self, name) -> str:
         self.address_book_manager.delete(name)
         return f"Contact '{name}' deleted."
 
-    def __add_note(self, *args) -> str:
-        self.notes_manager.add_note(*args)
+    def __import_contacts(self, filename, workers="1") -> str:
+        result = self.address_book_manager.import_contacts(filename, workers=int(workers))
+        message = f"Imported {result['imported']} contacts from {filename}."
+        if result["failed"]:
+            message += f" {result['failed']} rows failed:"
+            message += "".join(f"\n\tLine {line}: {error}" for line, error in result["errors"])
+            hidden = result["failed"] - len(result["errors"])
+            if hidden:
+                message += f"\n\t... and {hidden} more."
+        return message
+
+    def __export_contacts(self, filename) -> str:
+        exported = self.address_book_manager.export_contacts(filename)
+        return f"Exported {exported} contacts to {filename}."
+
+    def __add_note(self, title, content) -> str:
+        self.notes_manager.add_note(title, content)
         return "Note is added."
 
     def __update_note(self, title, content) -> str:
@@ -92,14 +210,56 @@ class CommandsHandler:
             raise KeyError(f"Note with title '{title}' not found.")
         return f"Note '{title}': {note}"
 
-    def __show_all_contacts(self):
-        return "\n".join(str(record) for record in self.address_book_manager.get_all_records())
+    def __find_notes(self, query) -> str:
+        titles = self.notes_manager.search(query, self.SEARCH_RESULTS_LIMIT)
+        if not titles:
+            raise KeyError(f"No notes matching '{query}' found.")
+        return "\n".join(f"{title}: {self.notes_manager.find(title)}" for title in titles)
+
+    def __show_all_contacts(self, offset="0", limit=None):
+        return self.address_book_manager.iter_rendered(*self.__page(offset, limit))
+
+    def __show_all_notes(self, offset="0", limit=None):
+        return self.notes_manager.iter_notes(*self.__page(offset, limit))
+
+    @staticmethod
+    def __page(offset: str, limit: str | None) -> tuple[int, int | None]:
+        # Checked here, as the listing is only produced while the response is printed
+        offset = int(offset)
+        limit = int(limit) if limit else None
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset and limit must not be negative.")
+        return offset, limit
+
+    def __stats(self) -> str:
+        lines = METRICS.report()
+        if not lines:
+            return "No statistics collected yet."
+        return "Statistics:\n" + "\n".join(f"\t{line}" for line in lines)
+
+    def store_of(self, cmd_name: str) -> str | None:
+        """Returns the store a command works on, or None if it touches no data or is unknown."""
+        command = self.__dispatch_table.get(cmd_name)
+        return command.store if command else None
 
-    def __show_all_notes(self):
-        return "\n".join(str(note) for note in self.notes_manager.get_all_notes())
-    
     def get_help(self) -> str:
-        return get_help_message()
+        return self.__help_message(None)
+
+    def __help_message(self, command_name: str | None) -> str:
+        message = self.__help_messages.get(command_name)
+        if message is None:
+            message = self.__help_messages[command_name] = get_help_message(command_name)
+        return message
+
+    def flush(self):
+        """Saves the contacts and notes changed since the last flush."""
+        self.address_book_manager.flush()
+        self.notes_manager.flush()
+
+    def close(self):
+        """Persists contacts and notes at the end of a session."""
+        self.address_book_manager.close()
+        self.notes_manager.close()
 
     class Response:
         def __init__(self, message, is_error=False, should_exit=False):
@@ -107,6 +267,30 @@ class CommandsHandler:
             self.is_error = is_error
             self.should_exit = should_exit
 
+        def lines(self):
+            """Yields the response text line by line."""
+            yield from self.message.splitlines()
+
+    class StreamResponse(Response):
+        """
+        Response whose lines are produced lazily, e.g. while iterating the address book.
+
+        Printing it line by line keeps memory constant regardless of how many lines
+        there are. Reading 'message' joins all remaining lines into one string.
+        """
+
+        def __init__(self, lines):
+            self.__lines = iter(lines)
+            self.is_error = False
+            self.should_exit = False
+
+        @property
+        def message(self) -> str:
+            return "\n".join(self.__lines)
+
+        def lines(self):
+            yield from self.__lines
+
     def execute_command(self, cmd_name: str, args: list[str]) -> Response:
         """
         Execute a command with the given arguments.
@@ -121,24 +305,32 @@ class CommandsHandler:
         Returns:
             Response: Response object containing the result or error message
         """
-        if cmd_name not in self.commands:
+        command = self.__dispatch_table.get(cmd_name)
+        if command is None:
+            METRICS.increment("command.unknown")
             return CommandsHandler.Response("Unknown command", is_error=True)
-        elif cmd_name in ["hi", "hello"]:
-            return CommandsHandler.Response("How can I help you?")
-        elif cmd_name in ["exit", "close"]:
-            return CommandsHandler.Response("Goodbye!", should_exit=True)
-
-        command = self.commands[cmd_name]
-        expected_args_count = command.function.__code__.co_argcount - 1  # exclude 'self'
-        if len(args) != expected_args_count:
+        if not command.accepts(len(args)):
             return CommandsHandler.Response("Arguments error: " +
-                                            f"Expected {expected_args_count} arguments, got {len(args)}.\n" +
-                                            get_help_message(cmd_name)
+                                            f"Expected {command.expected()} arguments, got {len(args)}.\n" +
+                                            self.__help_message(command.name)
                                             , is_error=True)
 
+        started = time.perf_counter()
+        response = self.__run(command, args)
+        METRICS.observe("command." + command.name, time.perf_counter() - started)
+        if response.is_error:
+            METRICS.increment("command.errors")
+        return response
+
+    @staticmethod
+    def __run(command: _CompiledCommand, args: list[str]) -> Response:
         try:
-            result = command.function(self, *args)
-            return CommandsHandler.Response(result)
+            result = command.function(*args)
+            if isinstance(result, CommandsHandler.Response):
+                return result
+            if isinstance(result, str):
+                return CommandsHandler.Response(result)
+            return CommandsHandler.StreamResponse(result)
         except ValueError as ve:
             return CommandsHandler.Response(f"Value error: {ve}", is_error=True)
         except KeyError as ke:
@@ -1,16 +1,30 @@
+from dataclasses import dataclass
+from types import MappingProxyType
 from colorama import Fore, Style, init
 
 init(autoreset=True)
 
+@dataclass(frozen=True)
 class CommandsInfo:
-    def __init__(self, name: str, desc: str, args: list[str]=None, example: str=None):
-        self.name = name
-        self.desc = desc
-        self.args = args or []
-        self.example = example
-        self.function = None
+    """
+    Immutable description of a command, shared by all CommandsHandler instances.
+
+    The handler functions are bound per CommandsHandler instance and are not
+    part of the metadata. 'store' names the data the command works on
+    (CONTACTS or NOTES), so concurrent sessions only wait for commands that
+    touch the same store.
+    """
+    name: str
+    desc: str
+    args: tuple[str, ...] = ()
+    example: str = None
+    store: str = None
 
-COMMANDS = {
+CONTACTS = "contacts"
+NOTES = "notes"
+
+# Read-only, so no handler instance can change the registry of another one
+COMMANDS = MappingProxyType({
     "hello": CommandsInfo(
         name="hello", desc="Greets the user."
     ),
@@ -19,64 +33,120 @@ COMMANDS = {
     ),
     "add-phone": CommandsInfo(
         name="add-phone", desc="Add a phone number to a contact.",
-        args=["name", "phone"],
-        example="add-phone John 1234567890"
+        args=("name", "phone"),
+        example="add-phone John 1234567890",
+        store=CONTACTS
     ),
     "add-birthday": CommandsInfo(
         name="add-birthday", desc="Add a birthday to a contact.",
-        args=["name", "birthday"],
-        example="add-birthday John 01.01.1990"
+        args=("name", "birthday"),
+        example="add-birthday John 01.01.1990",
+        store=CONTACTS
     ),
     "add-address": CommandsInfo(
         name="add-address", desc="Add an address to a contact.",
-        args=["name", "address"],
-        example="add-address John '123 Main St'"
+        args=("name", "address"),
+        example="add-address John '123 Main St'",
+        store=CONTACTS
     ),
     "remove-phone": CommandsInfo(
         name="remove-phone", desc="Remove a phone number from a contact.",
-        args=["name", "phone"],
-        example="remove-phone John 1234567890"
-    ),
-    "upcoming-birthday": CommandsInfo(
-        name="upcoming-birthday", desc="Show contacts with birthdays in the next N days.",
-        args=["days(optional, default=7)"],
-        example="upcoming-birthday 7"
+        args=("name", "phone"),
+        example="remove-phone John 1234567890",
+        store=CONTACTS
+    ),
+    "upcoming-birthdays": CommandsInfo(
+        name="upcoming-birthdays", desc="Show contacts with birthdays in the next N days.",
+        args=("days(optional, default=7)",),
+        example="upcoming-birthdays 7",
+        store=CONTACTS
+    ),
+    "birthday-stats": CommandsInfo(
+        name="birthday-stats", desc="Count the birthdays in each of the next N weeks.",
+        args=("weeks(optional, default=52)",),
+        example="birthday-stats 12",
+        store=CONTACTS
+    ),
+    "turning": CommandsInfo(
+        name="turning", desc="Show contacts turning a given age in the next N days.",
+        args=("age", "days(optional, default=365)"),
+        example="turning 30 90",
+        store=CONTACTS
     ),
     "search": CommandsInfo(
-        name="search", desc="Search for a contact by name.",
-        args=["name"],
-        example="search John"
+        name="search", desc="Search for a contact by name, prefix (Jo*) or similar name (~Jhon).",
+        args=("name",),
+        example="search Jo*",
+        store=CONTACTS
+    ),
+    "search-phone": CommandsInfo(
+        name="search-phone", desc="Find the contacts that own a phone number.",
+        args=("phone",),
+        example="search-phone 1234567890",
+        store=CONTACTS
     ),
     "delete": CommandsInfo(
         name="delete", desc="Delete a contact.",
-        args=["name"],
-        example="delete John"
+        args=("name",),
+        example="delete John",
+        store=CONTACTS
     ),
     "all": CommandsInfo(
-        name="all", desc="Show all contacts.",
+        name="all", desc="Show all contacts, optionally a page of them.",
+        args=("offset(optional, default=0)", "limit(optional)"),
+        example="all 100 50",
+        store=CONTACTS
+    ),
+    "import-contacts": CommandsInfo(
+        name="import-contacts", desc="Import contacts from a .csv or .jsonl file, optionally in parallel.",
+        args=("filename", "workers(optional, default=1)"),
+        example="import-contacts contacts.csv 4",
+        store=CONTACTS
+    ),
+    "export-contacts": CommandsInfo(
+        name="export-contacts", desc="Export all contacts to a .csv or .jsonl file.",
+        args=("filename",),
+        example="export-contacts contacts.jsonl",
+        store=CONTACTS
     ),
     "add-note": CommandsInfo(
         name="add-note", desc="Add a new note.",
-        args=["title", "content"],
-        example="add-note 'shopping_list': 'Buy milk'"
+        args=("title", "content"),
+        example="add-note 'shopping_list': 'Buy milk'",
+        store=NOTES
     ),
     "search-note": CommandsInfo(
         name="search-note", desc="Search notes by title.",
-        args=["title"],
-        example="search-note 'shopping_list'"
+        args=("title",),
+        example="search-note 'shopping_list'",
+        store=NOTES
+    ),
+    "find-notes": CommandsInfo(
+        name="find-notes", desc="Full-text search in notes: words, \"phrases\" and prefixes*.",
+        args=("query",),
+        example="find-notes '\"buy milk\" shop*'",
+        store=NOTES
     ),
     "update-note": CommandsInfo(
         name="update-note", desc="Edit an existing note - override by title.",
-        args=["title", "content"],
-        example="update-note 'shopping_list': 'Buy bread instead'"
+        args=("title", "content"),
+        example="update-note 'shopping_list': 'Buy bread instead'",
+        store=NOTES
     ),
     "delete-note": CommandsInfo(
         name="delete-note", desc="Delete a note.",
-        args=["title"],
-        example="delete-note 'shopping_list'"
+        args=("title",),
+        example="delete-note 'shopping_list'",
+        store=NOTES
     ),
     "all-notes": CommandsInfo(
-        name="all-notes", desc="Show all notes.",
+        name="all-notes", desc="Show all notes, optionally a page of them.",
+        args=("offset(optional, default=0)", "limit(optional)"),
+        example="all-notes 0 20",
+        store=NOTES
+    ),
+    "stats": CommandsInfo(
+        name="stats", desc="Show command latencies, cache and index hits and save timings.",
     ),
     "exit": CommandsInfo(
         name="exit", desc="Exit the assistant and save data.",
@@ -84,6 +154,11 @@ COMMANDS = {
     "close": CommandsInfo(
         name="close", desc="Exit the assistant and save data.",
     )
+})
+
+# Alternative names accepted for commands
+ALIASES = {
+    "hi": "hello",
 }
 
 
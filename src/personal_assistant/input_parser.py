@@ -0,0 +1,17 @@
+import shlex
+
+def parse_input(user_input):
+    """
+    Parse the user input into a command and its arguments.
+    Splits the input string by spaces while respecting quoted substrings,
+    allowing for multi-word arguments enclosed in quotes.
+    Args:
+        user_input (str): The raw input string from the user.
+    Returns:
+        tuple: A tuple containing the command name and arguments.
+    """
+    parts = shlex.split(user_input)
+    cmd = parts[0].lower() if parts else ""
+    args = parts[1:] if len(parts) > 1 else []
+
+    return cmd, args
@@ -0,0 +1,114 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LatencyHistogram:
+    """
+    Distribution of durations in power-of-two microsecond buckets.
+
+    Bucket i holds durations from 2**(i-1) up to 2**i microseconds (bucket 0
+    everything below a microsecond), and the last bucket everything longer, so
+    recording a duration is a bit_length() and percentiles are accurate to
+    within a factor of two whatever the range of the durations.
+
+    Attributes:
+        count (int): Number of recorded durations
+        total (float): Sum of the recorded durations in seconds
+        max (float): Longest recorded duration in seconds
+    """
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.buckets[min(int(seconds * 1_000_000).bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Returns an upper bound in seconds for the given percentile of the recorded durations."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        # The last bucket has no upper bound but the longest duration
+        for bucket, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= rank:
+                return min((1 << bucket) / 1_000_000, self.max)
+        return self.max
+
+    def __str__(self):
+        mean = self.total / self.count if self.count else 0.0
+        return (f"count {self.count}, mean {mean * 1000:.3f} ms, p50 {self.percentile(50) * 1000:.3f} ms, "
+                f"p99 {self.percentile(99) * 1000:.3f} ms, max {self.max * 1000:.3f} ms")
+
+
+class Metrics:
+    """
+    Thread-safe registry of named latency histograms and counters.
+
+    The commands handler records the latency of every command here, the
+    managers their cache hits and index builds, and the storage layer how long
+    loading and saving take and how many bytes they move. The 'stats' command
+    prints the report. Recording takes a lock and a dictionary lookup, so it is
+    cheap enough for every command but is kept out of per-record loops.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+        self.__counters = {}
+
+    def observe(self, name: str, seconds: float):
+        """Records a duration in the histogram 'name'."""
+        with self.__lock:
+            histogram = self.__histograms.get(name)
+            if histogram is None:
+                histogram = self.__histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Records how long the block takes in the histogram 'name', also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def increment(self, name: str, amount: int = 1):
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def counter(self, name: str) -> int:
+        with self.__lock:
+            return self.__counters.get(name, 0)
+
+    def histogram(self, name: str) -> LatencyHistogram | None:
+        with self.__lock:
+            return self.__histograms.get(name)
+
+    def reset(self):
+        with self.__lock:
+            self.__histograms.clear()
+            self.__counters.clear()
+
+    def report(self) -> list[str]:
+        """Returns one line per histogram and counter, sorted by name."""
+        with self.__lock:
+            lines = [f"{name}: {histogram}" for name, histogram in sorted(self.__histograms.items())]
+            lines.extend(f"{name}: {value}" for name, value in sorted(self.__counters.items()))
+        return lines
+
+
+# Shared by every layer of the process
+METRICS = Metrics()
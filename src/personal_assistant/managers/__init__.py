@@ -6,9 +6,13 @@ Exposed classes:
   editing, searching, and deleting contact information.
 - NotesManager: Manages note-taking functionality, including creating, editing,
   searching, and deleting notes.
+- ReadWriteLock: Lock used by the managers in thread-safe mode.
+- Checkpointer: Background thread that saves a manager periodically.
 """
 
 from .address_book_manager import AddressBookManager
 from .notes_manager import NotesManager
+from .locking import ReadWriteLock
+from .checkpointer import Checkpointer
 
-__all__ = ['AddressBookManager', 'NotesManager']
\ No newline at end of file
+__all__ = ['AddressBookManager', 'NotesManager', 'ReadWriteLock', 'Checkpointer']
\ No newline at end of file
@@ -1,71 +1,495 @@
-from personal_assistant.models import AddressBook, AddressBookRecord, Phone, Birthday, HomeAddress
+from personal_assistant.models import AddressBook, SqliteAddressBook, AddressBookRecord, Phone, Birthday, HomeAddress, Email
+from personal_assistant.instrumentation import METRICS
+from personal_assistant.models.indexes import BirthdayIndex, BirthdayColumns, PhoneIndex, NameIndex
+from .checkpointer import Checkpointer
+from .locking import ReadWriteLock, NoLock, reading, writing, read_in_chunks
+import csv
+import json
+import os
 import re
-from datetime import datetime
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+
+def _parse_row(row, today: date) -> AddressBookRecord:
+    """Validates an imported row and builds its record; raises ValueError, TypeError or KeyError."""
+    if isinstance(row, Exception):
+        raise ValueError(f"Invalid JSON: {row}")
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+    name = (row.get("name") or "").strip()
+    if not name:
+        raise ValueError("Name is required")
+    record = AddressBookRecord(name)
+    phones = row.get("phones") or []
+    if isinstance(phones, str):
+        phones = phones.split(";")
+    for phone in phones:
+        if str(phone).strip():
+            phone = Phone(str(phone).strip())
+            if phone not in record.phones:
+                record.add_phone(phone)
+    if row.get("birthday"):
+        record.add_birthday(Birthday(row["birthday"], today))
+    if row.get("address"):
+        record.add_address(HomeAddress(row["address"]))
+    if row.get("email"):
+        record.add_email(Email(row["email"]))
+    return record
+
+
+def _parse_rows(rows: list) -> list[tuple]:
+    """
+    Parses a chunk of (line number, row) pairs into (line number, record, error) triples.
+
+    This is a module-level function so that import worker processes can run it.
+    """
+    today = date.today()
+    parsed = []
+    for line_number, row in rows:
+        try:
+            parsed.append((line_number, _parse_row(row, today), None))
+        except (ValueError, TypeError, KeyError) as e:
+            parsed.append((line_number, None, str(e)))
+    return parsed
 
 
 class AddressBookManager:
-    def __init__(self):
-        self.__address_book = AddressBook()
+    """
+    Business logic for contacts on top of an AddressBook or SqliteAddressBook.
+
+    With thread_safe=True the manager can be shared by many threads: lookups take
+    a shared read lock and run in parallel, while changes take an exclusive write
+    lock, so read-modify-write operations like add_phone never lose updates.
+    Listings are copied under the read lock before they are returned;
+    iter_records() copies them in chunks, so streaming the whole book neither
+    holds the lock for long nor copies every record at once.
+
+    With a checkpoint_interval, the changes are also saved every that many
+    seconds by a background Checkpointer, which implies thread_safe.
+
+    Every change bumps a version counter. iter_rendered() keeps the last
+    PAGE_CACHE_SIZE rendered pages of up to MAX_CACHED_PAGE records for the
+    current version, so paging through an unchanged book again does not render
+    it again.
+
+    Attributes:
+        lock (ReadWriteLock | NoLock): The lock guarding the address book and its indexes
+    """
+
+    CONTACT_FIELDS = ["name", "phones", "birthday", "address", "email"]
+    MAX_REPORTED_ERRORS = 100
+    PAGE_CACHE_SIZE = 32
+    MAX_CACHED_PAGE = 10_000
+
+    def __init__(self, address_book: AddressBook | SqliteAddressBook = None, thread_safe: bool = False,
+                 checkpoint_interval: float = None):
+        self.__address_book = address_book if address_book is not None else AddressBook()
+        # Checkpoints run in a background thread, so they need the locks too
+        self.thread_safe = thread_safe or checkpoint_interval is not None
+        self.lock = ReadWriteLock() if self.thread_safe else NoLock()
+        self.__checkpointer = Checkpointer(self.flush, checkpoint_interval) if checkpoint_interval else None
+        # Indexes are built on first use, so creating the manager does not read the address book
+        self.__indexes = {}
+        self.__version = 0
+        # Rendered pages of self.__pages_version, least recently used first; readers share it
+        self.__pages = OrderedDict()
+        self.__pages_version = 0
+        self.__pages_lock = threading.Lock()
+
+    @property
+    def __birthday_index(self) -> BirthdayIndex:
+        index = self.__indexes.get("birthday")
+        if index is None:
+            with METRICS.timer("index.birthday.build"):
+                index = BirthdayIndex()
+                for name, birth_date in self.__address_book.iter_birthdays():
+                    index.add(name, birth_date)
+            # Readers may build an index concurrently; only a complete one is published
+            index = self.__indexes.setdefault("birthday", index)
+        return index
 
+    @property
+    def __birthday_columns(self) -> BirthdayColumns:
+        columns = self.__indexes.get("columns")
+        if columns is None:
+            with METRICS.timer("index.columns.build"):
+                columns = BirthdayColumns()
+                for name, birth_date in self.__address_book.iter_birthdays():
+                    columns.add(name, birth_date)
+            # Readers may build an index concurrently; only a complete one is published
+            columns = self.__indexes.setdefault("columns", columns)
+        return columns
+
+    @property
+    def __phone_index(self) -> PhoneIndex:
+        index = self.__indexes.get("phone")
+        if index is None:
+            with METRICS.timer("index.phone.build"):
+                index = PhoneIndex()
+                for name, phone in self.__address_book.iter_phones():
+                    index.add(phone, name)
+            # Readers may build an index concurrently; only a complete one is published
+            index = self.__indexes.setdefault("phone", index)
+        return index
+
+    @property
+    def __name_index(self) -> NameIndex:
+        index = self.__indexes.get("name")
+        if index is None:
+            with METRICS.timer("index.name.build"):
+                index = NameIndex()
+                for name in self.__address_book:
+                    index.add(name)
+            # Readers may build an index concurrently; only a complete one is published
+            index = self.__indexes.setdefault("name", index)
+        return index
+
+    @writing
     def add_record(self, name: str) -> AddressBookRecord:
+        replaced = self.__address_book.get(name)
+        if replaced:
+            self.__unindex(replaced)
         record = AddressBookRecord(name)
         self.__address_book[name] = record
+        self.__update_index("name", lambda index: index.add(name))
+        self.__version += 1
         return record
 
+    @reading
     def find(self, name: str) -> AddressBookRecord | None:
         return self.__address_book.get(name)
 
+    @reading
+    def find_by_prefix(self, prefix: str, limit: int = 10) -> list[AddressBookRecord]:
+        return self.__counted("index.name", [self.__address_book[name]
+                                             for name in self.__name_index.find_by_prefix(prefix, limit)])
+
+    @reading
+    def find_similar(self, name: str, limit: int = 10) -> list[AddressBookRecord]:
+        return self.__counted("index.name", [self.__address_book[match]
+                                             for match in self.__name_index.find_similar(name, limit)])
+
+    @reading
+    def find_by_phone(self, phone: Phone | str) -> list[AddressBookRecord]:
+        return self.__counted("index.phone", [self.__address_book[name] for name in self.__phone_index.find(phone)])
+
+    @staticmethod
+    def __counted(metric: str, results: list) -> list:
+        METRICS.increment(metric + (".hit" if results else ".miss"))
+        return results
+
+    @writing
     def delete(self, name: str) -> AddressBookRecord:
         deleted = self.__address_book.pop(name, None)
         if not deleted:
             raise KeyError(f"No record found for {name}.")
+        self.__unindex(deleted)
+        self.__version += 1
         return deleted
 
+    @writing
     def add_phone(self, name: str, phone: Phone) -> AddressBookRecord:
         record = self.__address_book.get(name)
         if record:
             record.add_phone(phone)
+            self.__update_index("phone", lambda index: index.add(phone, name))
+            self.__address_book.mark_dirty(name)
+            self.__version += 1
             return record
         raise KeyError(f"No record found for {name}.")
 
+    @writing
     def remove_phone(self, name: str, phone: Phone) -> AddressBookRecord:
         record = self.__address_book.get(name)
         if record:
             record.remove_phone(phone)
+            self.__update_index("phone", lambda index: index.remove(phone, name))
+            self.__address_book.mark_dirty(name)
+            self.__version += 1
             return record
         raise KeyError(f"No record found for {name}.")
 
+    @writing
     def add_birthday(self, name: str, birthday: Birthday) -> AddressBookRecord:
         record = self.__address_book.get(name)
         if record:
             record.add_birthday(birthday)
+            self.__update_index("birthday", lambda index: index.add(name, birthday.value))
+            self.__update_index("columns", lambda columns: columns.add(name, birthday.value))
+            self.__address_book.mark_dirty(name)
+            self.__version += 1
             return record
         raise KeyError(f"No record found for {name}.")
 
+    @writing
     def add_address(self, name: str, address: HomeAddress) -> AddressBookRecord:
         record = self.__address_book.get(name)
         if record:
             record.add_address(address)
+            self.__address_book.mark_dirty(name)
+            self.__version += 1
             return record
         raise KeyError(f"No record found for {name}.")
 
-    def get_all_records(self) -> list[AddressBookRecord]:
-        return list(self.__address_book.values())
+    def import_contacts(self, filename: str, chunk_size: int = 1000, workers: int = 1) -> dict:
+        """
+        Imports contacts from a CSV or JSONL file without loading the whole file.
+
+        Each row has the fields name, phones (a list, or a ';'-separated string in
+        CSV), birthday, address and email. Rows are validated as they are read and
+        committed to the address book in chunks of 'chunk_size'. A row that fails
+        validation is reported and skipped; it does not stop the import. Contacts
+        that already exist are merged: new phones are added and the other fields
+        are overwritten when present.
+
+        With workers > 1, chunks of rows are validated and parsed in a pool of
+        worker processes, and the parsed records are merged into the book in this
+        process, in file order.
 
-    def get_upcoming_birthdays(self, days = 7):
-        today = datetime.now().date()
-        upcoming = []
-        for record in self.__address_book.values():
-            next_date = record.get_next_birthday()
-            if not next_date:
+        Returns:
+            dict: 'imported' and 'failed' row counts and 'errors', a list of
+                (line number, message) for the first MAX_REPORTED_ERRORS failed rows
+        """
+        result = {"imported": 0, "failed": 0, "errors": []}
+        chunk = {}
+        for line_number, record, error in self.__parse_rows(filename, chunk_size, workers):
+            if error is not None:
+                result["failed"] += 1
+                if len(result["errors"]) < self.MAX_REPORTED_ERRORS:
+                    result["errors"].append((line_number, error))
                 continue
+            if record.name in chunk:
+                self.__merge_into(chunk[record.name], record)
+            else:
+                chunk[record.name] = record
+            result["imported"] += 1
+            if len(chunk) >= chunk_size:
+                self.__commit(chunk)
+                chunk = {}
+        self.__commit(chunk)
+        return result
 
-            delta = (next_date - today).days
-            if 0 <= delta <= days:
-                years_reached = next_date.year - record.birthday.value.year
-                upcoming.append({
+    def __parse_rows(self, filename: str, chunk_size: int, workers: int):
+        """Yields (line number, record, error) for every row, parsing in worker processes if workers > 1."""
+        rows = self.__read_rows(filename)
+        if workers <= 1:
+            while rows_chunk := list(islice(rows, chunk_size)):
+                yield from _parse_rows(rows_chunk)
+            return
+
+        with ProcessPoolExecutor(workers) as executor:
+            # A few chunks per worker are in flight, so the file is never read ahead completely
+            pending = deque()
+            while rows_chunk := list(islice(rows, chunk_size)):
+                pending.append(executor.submit(_parse_rows, rows_chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    @reading
+    def export_contacts(self, filename: str) -> int:
+        """Writes every contact to a CSV or JSONL file, one at a time, and returns how many were written."""
+        extension = self.__file_format(filename)
+        exported = 0
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            if extension == ".csv":
+                writer = csv.writer(f)
+                writer.writerow(self.CONTACT_FIELDS)
+            for record in self.__address_book.values():
+                row = {
                     "name": record.name,
-                    "next_date": next_date,
-                    "years_reached": years_reached
-                })
-        return upcoming
+                    "phones": [str(phone) for phone in record.phones],
+                    "birthday": str(record.birthday) if record.birthday else None,
+                    "address": str(record.address) if record.address else None,
+                    "email": str(record.email) if record.email else None,
+                }
+                if extension == ".csv":
+                    row["phones"] = ";".join(row["phones"])
+                    writer.writerow(row[field] or "" for field in self.CONTACT_FIELDS)
+                else:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                exported += 1
+        return exported
+
+    @staticmethod
+    def __file_format(filename: str) -> str:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in (".csv", ".jsonl"):
+            raise ValueError(f"Unsupported file format '{extension}'. Use .csv or .jsonl")
+        return extension
+
+    def __read_rows(self, filename: str):
+        """Yields (line number, row dict) from a CSV or JSONL file."""
+        extension = self.__file_format(filename)
+        with open(filename, encoding="utf-8", newline="") as f:
+            if extension == ".csv":
+                reader = csv.DictReader(f)
+                for row in reader:
+                    yield reader.line_num, row
+                return
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # A plain ValueError, so it can be sent to import worker processes
+                    row = ValueError(str(e))
+                yield line_number, row
+
+    @staticmethod
+    def __merge_into(record: AddressBookRecord, imported: AddressBookRecord):
+        for phone in imported.phones:
+            if phone not in record.phones:
+                record.add_phone(phone)
+        if imported.birthday:
+            record.add_birthday(imported.birthday)
+        if imported.address:
+            record.add_address(imported.address)
+        if imported.email:
+            record.add_email(imported.email)
+
+    @writing
+    def __commit(self, chunk: dict):
+        """Merges a chunk of imported records into the address book and the indexes."""
+        for name, imported in chunk.items():
+            existing = self.__address_book.get(name)
+            if existing:
+                self.__unindex(existing)
+                self.__merge_into(existing, imported)
+                chunk[name] = existing
+        self.__address_book.update(chunk)
+        for name, record in chunk.items():
+            self.__index(record)
+        self.__version += 1
+
+    def flush(self):
+        """
+        Saves the contacts changed since the last flush. Only the snapshot is taken
+        under the write lock; it is encoded and written after the lock is released.
+        """
+        write = self.__checkpoint()
+        if write is not None:
+            write()
+
+    @writing
+    def __checkpoint(self):
+        return self.__address_book.checkpoint()
+
+    def close(self):
+        """Persists the address book; the manager should not be used afterwards."""
+        if self.__checkpointer is not None:
+            # Stopped before taking the write lock, which a running checkpoint may be waiting for
+            self.__checkpointer.stop()
+        self.__close()
+
+    @writing
+    def __close(self):
+        self.__address_book.close()
+
+    def __index(self, record: AddressBookRecord):
+        name = record.name
+        self.__update_index("name", lambda index: index.add(name))
+        if record.birthday:
+            birth_date = record.birthday.value
+            self.__update_index("birthday", lambda index: index.add(name, birth_date))
+            self.__update_index("columns", lambda columns: columns.add(name, birth_date))
+        phone_index = self.__indexes.get("phone")
+        if phone_index is not None:
+            for phone in record.phones:
+                phone_index.add(phone, name)
+
+    def __unindex(self, record: AddressBookRecord):
+        name = record.name
+        self.__update_index("birthday", lambda index: index.remove(name))
+        self.__update_index("columns", lambda columns: columns.remove(name))
+        self.__update_index("name", lambda index: index.remove(name))
+        phone_index = self.__indexes.get("phone")
+        if phone_index is not None:
+            for phone in record.phones:
+                phone_index.remove(phone, name)
+
+    def __update_index(self, key: str, update):
+        # Changes only go into indexes that were built (the phone loops above do the same):
+        # building one here would read the whole book on the first write, and an index
+        # built later sees the change anyway
+        index = self.__indexes.get(key)
+        if index is not None:
+            update(index)
+
+    @reading
+    def get_all_records(self) -> list[AddressBookRecord]:
+        return list(self.__address_book.values())
+
+    def iter_records(self, offset: int = 0, limit: int = None):
+        """Yields records one by one, skipping 'offset' records and stopping after 'limit'."""
+        stop = offset + limit if limit is not None else None
+        if not self.thread_safe:
+            yield from islice(self.__address_book.values(), offset, stop)
+            return
+        yield from read_in_chunks(self.lock, self.__address_book.values, lambda: self.__version, offset, stop)
+
+    def iter_rendered(self, offset: int = 0, limit: int = None):
+        """Yields records rendered with str(), like iter_records(); small pages come from the page cache."""
+        if limit is None or limit > self.MAX_CACHED_PAGE:
+            for record in self.iter_records(offset, limit):
+                yield str(record)
+            return
+        yield from self.__rendered_page(offset, limit)
+
+    @reading
+    def __rendered_page(self, offset: int, limit: int) -> tuple[str, ...]:
+        key = (offset, limit)
+        with self.__pages_lock:
+            if self.__pages_version != self.__version:
+                self.__pages.clear()
+                self.__pages_version = self.__version
+            page = self.__pages.get(key)
+            if page is not None:
+                self.__pages.move_to_end(key)
+                METRICS.increment("cache.pages.hit")
+                return page
+        METRICS.increment("cache.pages.miss")
+        page = tuple(str(record) for record in islice(self.__address_book.values(), offset, offset + limit))
+        with self.__pages_lock:
+            self.__pages[key] = page
+            if len(self.__pages) > self.PAGE_CACHE_SIZE:
+                self.__pages.popitem(last=False)
+        return page
+
+    @reading
+    def get_upcoming_birthdays(self, days = 7, today: date = None):
+        today = today or datetime.now().date()
+        return [
+            {
+                "name": name,
+                "next_date": next_date,
+                "years_reached": next_date.year - birth_date.year
+            }
+            for name, birth_date, next_date in self.__birthday_index.upcoming(today, days)
+        ]
+
+    @reading
+    def get_birthday_stats(self, weeks: int = 52, today: date = None) -> list[tuple[date, int]]:
+        """Returns (first day of the week, number of birthdays) for each of the next 'weeks' weeks."""
+        today = today or datetime.now().date()
+        counts = self.__birthday_columns.weekly_counts(today, weeks)
+        return [(today + timedelta(weeks=week), count) for week, count in enumerate(counts)]
+
+    @reading
+    def get_turning(self, age: int, days: int = 365, today: date = None):
+        """Returns the contacts whose birthday number 'age' is in the next 'days' days, soonest first."""
+        today = today or datetime.now().date()
+        return [
+            {
+                "name": name,
+                "next_date": next_date,
+                "years_reached": age
+            }
+            for name, birth_date, next_date in self.__birthday_columns.turning(age, today, today + timedelta(days=days))
+        ]
@@ -0,0 +1,48 @@
+import sys
+import threading
+import weakref
+
+
+class Checkpointer:
+    """
+    Saves a manager every 'interval' seconds from a background thread.
+
+    The thread calls the manager's flush(), which takes the manager's write lock
+    only to snapshot the changed data, so checkpoints never see a half-applied
+    change, and encodes and writes the snapshot after releasing it, so the
+    interactive path never waits for the disk. The manager is referenced weakly;
+    the thread ends when the manager is garbage collected or stop() is called.
+    A failed checkpoint is reported on stderr and retried at the next interval.
+
+    Attributes:
+        interval (float): Seconds between two checkpoints
+    """
+
+    def __init__(self, flush, interval: float):
+        """
+        Args:
+            flush (method): Bound flush method of the manager to checkpoint
+            interval (float): Seconds between two checkpoints
+        """
+        self.interval = interval
+        self.__flush = weakref.WeakMethod(flush)
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="checkpointer", daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        while not self.__stopped.wait(self.interval):
+            flush = self.__flush()
+            if flush is None:
+                return
+            try:
+                flush()
+            except Exception as e:
+                print(f"Checkpoint failed: {e}", file=sys.stderr)
+            del flush
+
+    def stop(self):
+        """Stops the checkpoints and waits for a running one to finish."""
+        self.__stopped.set()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
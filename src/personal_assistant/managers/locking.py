@@ -0,0 +1,116 @@
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+
+
+class ReadWriteLock:
+    """
+    A lock that lets many readers or a single writer in at a time.
+
+    Waiting writers block new readers, so a steady stream of reads cannot starve
+    writes. The thread holding the write lock may take the read or write lock
+    again, which lets a write operation call read helpers; readers must not
+    take the lock again while holding it.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__waiting_writers = 0
+        self.__writer = None
+        self.__writer_depth = 0
+
+    @contextmanager
+    def read(self):
+        if self.__writer == threading.get_ident():
+            yield
+            return
+        with self.__condition:
+            while self.__writer is not None or self.__waiting_writers:
+                self.__condition.wait()
+            self.__readers += 1
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self.__condition:
+            if self.__writer != me:
+                self.__waiting_writers += 1
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+                self.__waiting_writers -= 1
+                self.__writer = me
+            self.__writer_depth += 1
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__writer_depth -= 1
+                if not self.__writer_depth:
+                    self.__writer = None
+                    self.__condition.notify_all()
+
+
+class NoLock:
+    """Stand-in for ReadWriteLock when a manager is used from a single thread."""
+
+    def read(self):
+        return nullcontext()
+
+    def write(self):
+        return nullcontext()
+
+
+def reading(method):
+    """Runs a manager method while holding the manager's read lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def writing(method):
+    """Runs a manager method while holding the manager's write lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def read_in_chunks(lock, items, version, offset: int = 0, stop: int = None, chunk_size: int = 1000):
+    """
+    Yields items()[offset:stop], copying at most chunk_size items at a time under the read lock.
+
+    The lock is released between chunks, so a long listing neither blocks writers
+    nor is copied into memory at once. While version() is unchanged the same
+    iterator is resumed; after a change the listing goes on from the same
+    position in a fresh iterator, like the next page of a paged listing.
+
+    Args:
+        lock (ReadWriteLock | NoLock): The lock guarding the items
+        items (callable): Returns a new iterator over the items
+        version (callable): Returns a value that changes whenever the items change
+    """
+    position = offset
+    iterator = seen_version = None
+    while stop is None or position < stop:
+        count = chunk_size if stop is None else min(chunk_size, stop - position)
+        with lock.read():
+            if iterator is None or version() != seen_version:
+                iterator = islice(items(), position, None)
+                seen_version = version()
+            chunk = list(islice(iterator, count))
+        if not chunk:
+            return
+        yield from chunk
+        position += len(chunk)
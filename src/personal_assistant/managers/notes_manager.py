@@ -1,32 +1,126 @@
+from itertools import islice
+from personal_assistant.instrumentation import METRICS
 from personal_assistant.models import Notebook
+from personal_assistant.models.indexes import TextIndex
+from .checkpointer import Checkpointer
+from .locking import ReadWriteLock, NoLock, reading, writing, read_in_chunks
 
 class NotesManager:
-    def __init__(self):
-        self.__notebook = Notebook()
+    """
+    Business logic for notes, with full-text search.
 
+    With thread_safe=True the manager can be shared by many threads, with the
+    same read/write locking as AddressBookManager. A checkpoint_interval saves
+    the notes periodically in the background, as it does for AddressBookManager.
+
+    Attributes:
+        lock (ReadWriteLock | NoLock): The lock guarding the notebook and its index
+    """
+
+    def __init__(self, stemming: bool = False, notebook: Notebook = None, thread_safe: bool = False,
+                 checkpoint_interval: float = None):
+        self.__notebook = notebook if notebook is not None else Notebook()
+        # Checkpoints run in a background thread, so they need the locks too
+        self.thread_safe = thread_safe or checkpoint_interval is not None
+        self.lock = ReadWriteLock() if self.thread_safe else NoLock()
+        self.__checkpointer = Checkpointer(self.flush, checkpoint_interval) if checkpoint_interval else None
+        self.__stemming = stemming
+        # The index is built on first use, so creating the manager does not read the notebook
+        self.__index = None
+        # Bumped by every change, so listings read in chunks notice them
+        self.__version = 0
+
+    @property
+    def __text_index(self) -> TextIndex:
+        index = self.__index
+        if index is None:
+            with METRICS.timer("index.text.build"):
+                index = TextIndex(self.__stemming)
+                for title, content in self.__notebook.data.items():
+                    index.add(title, f"{title} {content}")
+            # Readers may build the index concurrently; only a complete one is published
+            self.__index = index
+        return index
+
+    @writing
     def add_note(self, title: str, content: str):
         note_exists = self.__notebook.get(title)
         if note_exists:
             raise ValueError(f"Note with title '{title}' already exists.")
         self.__notebook[title] = content
+        self.__text_index.add(title, f"{title} {content}")
+        self.__version += 1
 
+    @writing
     def update(self, title: str, content: str):
         if title in self.__notebook:
             self.__notebook[title] = content
+            self.__text_index.add(title, f"{title} {content}")
+            self.__version += 1
         else:
             raise KeyError(f"Note with title '{title}' not found.")
 
+    @reading
     def find(self, title: str):
         return self.__notebook.get(title) or None
 
+    @reading
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        """
+        Full-text search over note titles and content.
+
+        Returns the titles of the best matching notes, best match first. The query
+        can contain words, "quoted phrases" and prefixes ending with *.
+        """
+        titles = [title for title, _ in self.__text_index.search(query, limit)]
+        METRICS.increment("index.text.hit" if titles else "index.text.miss")
+        return titles
+
+    @writing
     def delete(self, title: str):
         if title in self.__notebook:
             del self.__notebook[title]
+            self.__text_index.remove(title)
+            self.__version += 1
         else:
             raise KeyError(f"Note with title '{title}' not found.")
 
     def get_all_notes(self) -> list[str]:
-        return list(f"{title}: {content}" for title, content in self.__notebook.data.items())
+        return list(self.iter_notes())
+
+    def iter_notes(self, offset: int = 0, limit: int = None):
+        """Yields notes as 'title: content' strings, skipping 'offset' notes and stopping after 'limit'."""
+        stop = offset + limit if limit is not None else None
+        if self.thread_safe:
+            notes = read_in_chunks(self.lock, self.__notebook.data.items, lambda: self.__version, offset, stop)
+        else:
+            notes = islice(self.__notebook.data.items(), offset, stop)
+        for title, content in notes:
+            yield f"{title}: {content}"
+
+    def flush(self):
+        """
+        Saves the notes changed since the last flush. Only the snapshot is taken
+        under the write lock; it is encoded and written after the lock is released.
+        """
+        write = self.__checkpoint()
+        if write is not None:
+            write()
+
+    @writing
+    def __checkpoint(self):
+        return self.__notebook.checkpoint()
+
+    def close(self):
+        """Persists the notebook; the manager should not be used afterwards."""
+        if self.__checkpointer is not None:
+            # Stopped before taking the write lock, which a running checkpoint may be waiting for
+            self.__checkpointer.stop()
+        self.__close()
+
+    @writing
+    def __close(self):
+        self.__notebook.close()
 
     def __str__(self):
         return "\n".join(f"{title}: {content}" for title, content in self.__notebook.data.items())
\ No newline at end of file
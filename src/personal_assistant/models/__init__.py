@@ -11,18 +11,27 @@ The models provide:
 
 Main Classes:
     AddressBook: Container for managing contact records
+    SqliteAddressBook: AddressBook alternative stored in an indexed SQLite database
     Notebook: Container for managing notes
     AddressBookRecord: Individual contact record
     Phone: Phone number with validation
     Birthday: Birthday date with validation
     HomeAddress: Address information
+    SnapshotStorage, PickleStorage, JournalStorage, ShardedStorage: Storage backends for AddressBook and Notebook
+    MappedStorage: Memory-mapped read-mostly storage backend for AddressBook
+    PickleCodec, JsonCodec, BinaryCodec: File formats of SnapshotStorage
 
 The models use proper encapsulation and validation to ensure data integrity
 and provide a robust foundation for the application's functionality.
 """
 
 from .address_book import AddressBook
+from .sqlite_address_book import SqliteAddressBook
+from .mapped_storage import MappedStorage
 from .notebook import Notebook
 from .address_book_entities import AddressBookRecord, Phone, Birthday, HomeAddress, Email
+from .interfaces import SnapshotStorage, PickleStorage, JournalStorage, ShardedStorage, PickleCodec, JsonCodec, BinaryCodec
 
-__all__ = ['AddressBook', 'Notebook', 'AddressBookRecord', 'HomeAddress', 'Phone', 'Birthday', 'Email']
\ No newline at end of file
+__all__ = ['AddressBook', 'SqliteAddressBook', 'Notebook', 'AddressBookRecord', 'HomeAddress', 'Phone', 'Birthday', 'Email',
+           'SnapshotStorage', 'PickleStorage', 'JournalStorage', 'ShardedStorage', 'MappedStorage',
+           'PickleCodec', 'JsonCodec', 'BinaryCodec']
\ No newline at end of file
@@ -1,5 +1,5 @@
 from .address_book_entities import AddressBookRecord
-from .interfaces import CacheableDict
+from .interfaces import CacheableDict, StorageBackend
 
 class AddressBook(CacheableDict):
     """
@@ -8,15 +8,42 @@ class AddressBook(CacheableDict):
     This class extends CacheableDict to provide a specialized storage container
     for contact records. Contacts are automatically persisted to 'addressbook_state.pkl'
     file and type validation ensures only AddressBookRecord instances are stored.
+    A different storage backend (for example JournalStorage) can be passed to opt
+    out of the plain pickle file. Records are saved as tuples (see
+    AddressBookRecord.to_tuple), not as pickled objects.
     """
-    
-    def __init__(self):
-        CacheableDict.__init__(self, "addressbook_state.pkl")
+
+    value_type = AddressBookRecord
+
+    def __init__(self, storage: StorageBackend = None):
+        CacheableDict.__init__(self, "addressbook_state.pkl", storage)
 
     def __setitem__(self, name, record: AddressBookRecord):
         if not isinstance(record, AddressBookRecord):
             raise TypeError("Item must be an instance of Record")
-        self.data[name] = record
+        super().__setitem__(name, record)
+
+    def iter_birthdays(self):
+        """Yields (name, birth date) for every contact that has a birthday."""
+        data = self.data
+        if hasattr(data, "iter_birthdays"):
+            # A MappedStorage reads the birthdays without decoding the records
+            yield from data.iter_birthdays()
+            return
+        for name, record in data.items():
+            if record.birthday:
+                yield name, record.birthday.value
+
+    def iter_phones(self):
+        """Yields (name, phone) for every phone number of every contact."""
+        data = self.data
+        if hasattr(data, "iter_phones"):
+            # A MappedStorage reads the phones without keeping decoded records
+            yield from data.iter_phones()
+            return
+        for name, record in data.items():
+            for phone in record.phones:
+                yield name, str(phone)
 
     def __str__(self):
         return "\n".join(str(record) for record in self.data.values())
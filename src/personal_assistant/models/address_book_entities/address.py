@@ -1,10 +1,11 @@
-class HomeAddress:
+from .field import Field
+
+class HomeAddress(Field):
+    __slots__ = ()
+
     def __init__(self, *args):
         try:
             # todo: validate address format
-            self.value = " ".join(args)
+            super().__init__(" ".join(args))
         except ValueError:
             raise ValueError("Invalid format for address.")
-
-    def __str__(self):
-        return self.value
@@ -2,48 +2,126 @@ from .phone import Phone
 from .birthday import Birthday
 from .address import HomeAddress
 from .email import Email
-from datetime import datetime, date
+from datetime import date
 
 class AddressBookRecord:
+    """
+    A contact of the address book.
+
+    Phones are kept in an insertion-ordered dict used as a set, so adding,
+    removing and checking a phone take constant time even for contacts with
+    thousands of numbers.
+
+    to_tuple() and from_tuple() convert a record to and from plain data
+    (name, phones, birthday as a date ordinal, address, email), which is how
+    storage codecs save it.
+
+    str() of a record is rendered once and cached until one of the add_* or
+    remove_* methods changes the record, so listing an unchanged address book
+    again does no string formatting. The cache is not pickled.
+    """
+
+    FIELDS = ("name", "phones", "birthday", "address", "email")
+    # Storages keep decoded records in weak caches
+    __slots__ = FIELDS + ("__rendered", "__weakref__")
+
     def __init__(self, name: str):
         self.name = name
-        self.phones = []
+        self.phones = {}
         self.birthday = None
         self.address = None
         self.email = None
+        self.__rendered = None
 
     def add_phone(self, phone: Phone):
         if phone in self.phones:
             raise ValueError(f"Phone number {phone} already exists for contact {self.name}.")
-        self.phones.append(phone)
+        self.phones[phone] = None
+        self.__rendered = None
 
     def add_birthday(self, date: Birthday):
         self.birthday = date
+        self.__rendered = None
 
     def add_address(self, address: HomeAddress):
         self.address = address
+        self.__rendered = None
 
     def remove_phone(self, old_phone: Phone):
         try:
-            self.phones.remove(old_phone)
-        except ValueError:
+            del self.phones[old_phone]
+        except KeyError:
             raise KeyError(f"Phone number {old_phone} does not exist for contact {self.name}.")
+        self.__rendered = None
 
     def add_email(self, email: Email):
         self.email = email
+        self.__rendered = None
+
+    def to_tuple(self) -> tuple:
+        """Returns the record as plain data that any storage codec can encode."""
+        return (
+            self.name,
+            [phone.value for phone in self.phones],
+            self.birthday.value.toordinal() if self.birthday else None,
+            self.address.value if self.address else None,
+            self.email.value if self.email else None,
+        )
 
-    def get_next_birthday(self) -> date | None:
+    @classmethod
+    def from_tuple(cls, values) -> "AddressBookRecord":
+        """Rebuilds a record from to_tuple() data; lists are accepted in place of tuples."""
+        name, phones, birthday, address, email = values
+        record = cls(name)
+        record.phones = dict.fromkeys(Phone.from_value(phone) for phone in phones)
+        if birthday is not None:
+            record.birthday = Birthday.from_value(date.fromordinal(birthday))
+        if address is not None:
+            record.address = HomeAddress.from_value(address)
+        if email is not None:
+            record.email = Email.from_value(email)
+        return record
+
+    def __getstate__(self):
+        # The rendered string is left out, so it never outlives a change made elsewhere
+        return None, {name: getattr(self, name) for name in self.FIELDS}
+
+    def __setstate__(self, state):
+        # Pickles written before records had __slots__ hold the instance __dict__,
+        # newer ones a (None, slots) pair
+        if isinstance(state, tuple):
+            state = state[1]
+        for name in self.FIELDS:
+            setattr(self, name, state.get(name))
+        # Phones used to be kept in a list
+        self.phones = dict.fromkeys(self.phones or ())
+        self.__rendered = None
+
+    def get_next_birthday(self, today: date = None) -> date | None:
+        """Returns the next date the birthday is celebrated, counting from 'today' (default: the current date)."""
         if not self.birthday:
             return None
-        today = datetime.now().date()
-        current_year_birthday = self.birthday.value.replace(year=today.year).date()
-        if current_year_birthday < today:
-            next_birthday = current_year_birthday.replace(year=today.year + 1)
-        else:
-            next_birthday = current_year_birthday
+        today = today or date.today()
+        next_birthday = self.__birthday_in_year(today.year)
+        if next_birthday < today:
+            next_birthday = self.__birthday_in_year(today.year + 1)
         return next_birthday
 
+    def __birthday_in_year(self, year: int) -> date:
+        birth_date = self.birthday.value
+        try:
+            return birth_date.replace(year=year)
+        except ValueError:
+            # 29 February is celebrated on 28 February in non-leap years
+            return date(year, 2, 28)
+
     def __str__(self):
+        rendered = self.__rendered
+        if rendered is None:
+            rendered = self.__rendered = self.__render()
+        return rendered
+
+    def __render(self) -> str:
         phones_str = ", Phones: [" + ", ".join(str(phone) for phone in self.phones) + "]" if self.phones else ""
         birthday_str = ", Birthday: " + str(self.birthday) if self.birthday else ""
         address_str = ", Address: " + str(self.address) if self.address else ""
@@ -1,16 +1,52 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from .field import Field
 
-class Birthday:
-    def __init__(self, value: str):
-        try:
-            date = datetime.strptime(value, "%d.%m.%Y")
-        except ValueError:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
-        if date > datetime.now():
+@lru_cache(maxsize=65536)
+def _parse_date(value: str) -> date:
+    # A century holds about 36500 distinct dates, so imports mostly hit the cache
+    if len(value) == 10 and value[2] == "." and value[5] == ".":
+        # fromisoformat only accepts ASCII digits, which makes the fixed-width path strict
+        return date.fromisoformat(f"{value[6:]}-{value[3:5]}-{value[:2]}")
+    return datetime.strptime(value, Birthday.FORMAT).date()
+
+
+class Birthday(Field):
+    """
+    A birth date, entered as DD.MM.YYYY and stored as a datetime.date.
+
+    Dates in the exact DD.MM.YYYY form are parsed by slicing, without going
+    through strptime, and parsed dates are cached; other spellings strptime
+    accepts (like 1.2.1990) still work through the slow path. Callers
+    validating many values can pass the current date as 'today' instead of
+    letting every value look it up.
+    """
+
+    __slots__ = ()
+
+    FORMAT = "%d.%m.%Y"
+
+    def __init__(self, value: str, today: date = None):
+        birth_date = self.parse(value)
+        if birth_date > (today or date.today()):
             raise ValueError("Birthday cannot be in the future")
+        super().__init__(birth_date)
+
+    @classmethod
+    def parse(cls, value: str) -> date:
+        """Parses a DD.MM.YYYY string into a date; raises ValueError if it is not a valid date."""
+        try:
+            return _parse_date(value)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
-        self.value = date
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Birthdays used to be stored as datetime
+        if isinstance(self.value, datetime):
+            self.value = self.value.date()
 
     def __str__(self):
-        return self.value.strftime("%d.%m.%Y")
+        value = self.value
+        return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
@@ -1,7 +1,8 @@
-class Email:
+from .field import Field
+
+class Email(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         # todo validate, raise exсeption
-        self.value = value
-
-    def __str__(self):
-        return str(self.value)
+        super().__init__(value)
@@ -0,0 +1,30 @@
+class Field:
+    """
+    Base class for the single-value fields of an address book record.
+
+    Fields use __slots__ instead of a per-instance __dict__, which matters when
+    the address book holds millions of them.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    @classmethod
+    def from_value(cls, value):
+        """Recreates a field from a value that was already validated, e.g. one read from storage."""
+        field = cls.__new__(cls)
+        field.value = value
+        return field
+
+    def __setstate__(self, state):
+        # Pickles written before fields had __slots__ hold the instance __dict__,
+        # newer ones a (None, slots) pair
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __str__(self):
+        return str(self.value)
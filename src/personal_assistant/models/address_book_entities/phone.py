@@ -1,7 +1,45 @@
-class Phone:
+import re
+import sys
+from .field import Field
+
+class Phone(Field):
+    """
+    A phone number stored as its digits.
+
+    Phones are values: two phones are equal when their digits are equal, so
+    '123-456 7890' and '1234567890' are the same phone and can be used as
+    dictionary keys and set members.
+    """
+
+    __slots__ = ()
+
+    NON_DIGITS = re.compile(r"\D")
+
     def __init__(self, value):
-        # todo validate, raise exсeption
-        self.value = value
+        # todo validate length
+        normalized = self.normalize(value)
+        if not normalized:
+            raise ValueError(f"Invalid phone number '{value}'. It must contain digits.")
+        # Interning makes all records that share a number share one string
+        super().__init__(sys.intern(normalized))
+
+    @classmethod
+    def normalize(cls, value) -> str:
+        """Returns the digits of a phone number, so '123-456 7890' matches '1234567890'."""
+        return cls.NON_DIGITS.sub("", str(value))
+
+    @classmethod
+    def from_value(cls, value):
+        return super().from_value(sys.intern(value))
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.value = sys.intern(self.normalize(self.value))
+
+    def __eq__(self, other):
+        if not isinstance(other, Phone):
+            return NotImplemented
+        return self.value == other.value
 
-    def __str__(self):
-        return str(self.value)
+    def __hash__(self):
+        return hash(self.value)
@@ -0,0 +1,21 @@
+"""Indexes Package
+
+This package contains in-memory secondary indexes over the address book and
+notebook, maintained by the managers so that lookups do not have to scan every
+record.
+
+Indexes:
+    BirthdayIndex: Calendar index of birthdays for upcoming-birthday queries
+    BirthdayColumns: Columnar birthday arrays for bucketed and whole-book birthday analytics
+    PhoneIndex: Reverse index from phone numbers to contact names
+    NameIndex: Trie and trigram index for prefix and fuzzy name search
+    TextIndex: Inverted full-text index with BM25 ranking for notes
+"""
+
+from .birthday_index import BirthdayIndex
+from .birthday_columns import BirthdayColumns
+from .phone_index import PhoneIndex
+from .name_index import NameIndex
+from .text_index import TextIndex
+
+__all__ = ['BirthdayIndex', 'BirthdayColumns', 'PhoneIndex', 'NameIndex', 'TextIndex']
\ No newline at end of file
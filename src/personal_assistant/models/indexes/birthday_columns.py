@@ -0,0 +1,155 @@
+from array import array
+from datetime import date
+
+try:
+    import numpy
+except ImportError:  # optional, queries fall back to plain Python loops
+    numpy = None
+
+# Days in the months before each month of a non-leap year
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def _ordinal_in_year(year, month, day, days_before_month):
+    """
+    Returns the ordinal of the birthday (month, day) celebrated in 'year'.
+
+    Works on ints as well as on NumPy arrays, elementwise. 29 February falls on
+    28 February in non-leap years.
+    """
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    previous = year - 1
+    days_before_year = 365 * previous + previous // 4 - previous // 100 + previous // 400
+    day_of_year = days_before_month[month - 1] + day + ((month > 2) & leap) - ((month == 2) & (day == 29) & (leap == 0))
+    return days_before_year + day_of_year
+
+
+class BirthdayColumns:
+    """
+    Columnar copy of contact birthdays for analytic queries over huge books.
+
+    Birth years, months and days are kept in three parallel int32 arrays, one
+    row per contact with a birthday. Adding a row appends to them and removing
+    one moves the last row into its place, so the columns are kept in sync with
+    the address book at constant cost per change. Queries compute the birthday
+    of every row at once; with NumPy installed they run as vectorized operations
+    over zero-copy views of the arrays, otherwise as a Python loop.
+
+    BirthdayIndex is faster for short upcoming-birthday windows; the columns
+    answer bucketed and whole-book questions in a single pass.
+    """
+
+    def __init__(self):
+        self.__names = []
+        self.__rows = {}
+        self.__years = array("i")
+        self.__months = array("i")
+        self.__days = array("i")
+
+    def add(self, name: str, birth_date: date):
+        row = self.__rows.get(name)
+        if row is None:
+            self.__rows[name] = len(self.__names)
+            self.__names.append(name)
+            self.__years.append(birth_date.year)
+            self.__months.append(birth_date.month)
+            self.__days.append(birth_date.day)
+        else:
+            self.__years[row] = birth_date.year
+            self.__months[row] = birth_date.month
+            self.__days[row] = birth_date.day
+
+    def remove(self, name: str):
+        row = self.__rows.pop(name, None)
+        if row is None:
+            return
+        last_name = self.__names.pop()
+        for column in (self.__years, self.__months, self.__days):
+            last_value = column.pop()
+            if row < len(column):
+                column[row] = last_value
+        if row < len(self.__names):
+            self.__names[row] = last_name
+            self.__rows[last_name] = row
+
+    def clear(self):
+        self.__names.clear()
+        self.__rows.clear()
+        for column in (self.__years, self.__months, self.__days):
+            del column[:]
+
+    def weekly_counts(self, today: date, weeks: int = 52) -> list[int]:
+        """
+        Counts the birthdays in each of the next 'weeks' weeks, the first week starting today.
+
+        Every contact is counted at its next birthday, so 'weeks' is limited to 52.
+        """
+        if not 1 <= weeks <= 52:
+            raise ValueError("Weeks must be between 1 and 52")
+        offsets = self.__next_birthdays(today)
+        if numpy is not None:
+            offsets = offsets - today.toordinal()
+            return numpy.bincount(offsets[offsets < weeks * 7] // 7, minlength=weeks).tolist()
+        counts = [0] * weeks
+        for next_birthday in offsets:
+            week = (next_birthday - today.toordinal()) // 7
+            if week < weeks:
+                counts[week] += 1
+        return counts
+
+    def upcoming(self, today: date, days: int):
+        """Yields (name, birth_date, next_date) for birthdays in the next 'days' days, ordered like BirthdayIndex."""
+        first = today.toordinal()
+        return self.__report(self.__next_birthdays(today), first, first + days)
+
+    def turning(self, age: int, start: date, end: date):
+        """Yields (name, birth_date, birthday) for everyone whose birthday number 'age' falls from start to end."""
+        if numpy is not None:
+            years, months, days = self.__columns()
+            ordinals = _ordinal_in_year(years.astype(numpy.int64) + age, months, days, numpy.array(_DAYS_BEFORE_MONTH))
+        else:
+            ordinals = [_ordinal_in_year(year + age, month, day, _DAYS_BEFORE_MONTH)
+                        for year, month, day in zip(self.__years, self.__months, self.__days)]
+        return self.__report(ordinals, start.toordinal(), end.toordinal())
+
+    def __columns(self):
+        # Zero-copy views, widened to int64 by the arithmetic; they only live for one query,
+        # as an array cannot grow while it is viewed
+        return tuple(numpy.frombuffer(column, dtype=numpy.int32) if column else numpy.zeros(0, dtype=numpy.int32)
+                     for column in (self.__years, self.__months, self.__days))
+
+    def __next_birthdays(self, today: date):
+        """Returns the ordinal of the next birthday of every row, as a NumPy array or a list."""
+        first = today.toordinal()
+        if numpy is not None:
+            _, months, days = self.__columns()
+            days_before_month = numpy.array(_DAYS_BEFORE_MONTH)
+            this_year = _ordinal_in_year(numpy.int64(today.year), months, days, days_before_month)
+            next_year = _ordinal_in_year(numpy.int64(today.year + 1), months, days, days_before_month)
+            return numpy.where(this_year < first, next_year, this_year)
+        next_birthdays = []
+        for month, day in zip(self.__months, self.__days):
+            ordinal = _ordinal_in_year(today.year, month, day, _DAYS_BEFORE_MONTH)
+            if ordinal < first:
+                ordinal = _ordinal_in_year(today.year + 1, month, day, _DAYS_BEFORE_MONTH)
+            next_birthdays.append(ordinal)
+        return next_birthdays
+
+    def __report(self, ordinals, first: int, last: int):
+        """Yields (name, birth_date, date) for the rows whose ordinal is from first to last, by date and name."""
+        if numpy is not None:
+            rows = numpy.nonzero((ordinals >= first) & (ordinals <= last))[0]
+            matches = zip(ordinals[rows].tolist(), rows.tolist())
+        else:
+            matches = ((ordinal, row) for row, ordinal in enumerate(ordinals) if first <= ordinal <= last)
+        # Copied out before yielding, so the columns can change while the results are consumed
+        results = sorted((ordinal, self.__names[row], date(self.__years[row], self.__months[row], self.__days[row]))
+                         for ordinal, row in matches)
+        for ordinal, name, birth_date in results:
+            yield name, birth_date, date.fromordinal(ordinal)
+
+    def __len__(self):
+        return len(self.__names)
+
+    def __contains__(self, name):
+        return name in self.__rows
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+class BirthdayIndex:
+    """
+    Calendar index of contact birthdays.
+
+    Names are bucketed by the (month, day) of their birthday, so finding the
+    birthdays in the next N days only visits N calendar days plus the matching
+    names, no matter how many contacts the address book holds.
+
+    People born on 29 February celebrate on 28 February in non-leap years.
+    """
+
+    def __init__(self):
+        self.__by_day = {}
+        self.__by_name = {}
+
+    def add(self, name: str, birth_date: date):
+        self.remove(name)
+        key = (birth_date.month, birth_date.day)
+        self.__by_day.setdefault(key, set()).add(name)
+        self.__by_name[name] = birth_date
+
+    def remove(self, name: str):
+        birth_date = self.__by_name.pop(name, None)
+        if birth_date is None:
+            return
+        key = (birth_date.month, birth_date.day)
+        names = self.__by_day[key]
+        names.discard(name)
+        if not names:
+            del self.__by_day[key]
+
+    def clear(self):
+        self.__by_day.clear()
+        self.__by_name.clear()
+
+    def upcoming(self, today: date, days: int):
+        """
+        Yields (name, birth_date, next_date) for birthdays in the next 'days' days.
+
+        Results are ordered by the next birthday date and then by name. Every
+        contact is reported once, even if the window is longer than a year.
+        """
+        visited = set()
+        for offset in range(days + 1):
+            current = today + timedelta(days=offset)
+            key = (current.month, current.day)
+            if key in visited:
+                break
+            visited.add(key)
+
+            names = set(self.__by_day.get(key, ()))
+            if key == (2, 28) and not self.is_leap_year(current.year):
+                names.update(self.__by_day.get((2, 29), ()))
+            for name in sorted(names):
+                yield name, self.__by_name[name], current
+
+    @staticmethod
+    def is_leap_year(year: int) -> bool:
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+    def __len__(self):
+        return len(self.__by_name)
+
+    def __contains__(self, name):
+        return name in self.__by_name
@@ -0,0 +1,147 @@
+import heapq
+from collections import Counter
+
+class _TrieNode:
+    __slots__ = ("children", "names")
+
+    def __init__(self):
+        self.children = {}
+        self.names = set()
+
+class NameIndex:
+    """
+    Index of contact names for prefix and typo-tolerant search.
+
+    Names are case-folded and stored in a trie for prefix queries ("Jo*") and in a
+    trigram index for fuzzy queries, so a misspelled name still finds the contact.
+    Both queries only visit the names that share a prefix or a trigram with the
+    query, never the whole address book.
+
+    A typo in a short name leaves few trigrams in common ("jhon" and "john" only
+    share the first one), so short queries also match a name, or a word of it,
+    within MAX_EDITS edits, a swap of two adjacent letters counting as one.
+
+    Attributes:
+        min_similarity (float): Lowest trigram similarity reported by find_similar
+    """
+
+    # Queries up to this many characters are also compared by edit distance
+    SHORT_QUERY = 8
+    MAX_EDITS = 1
+
+    def __init__(self, min_similarity: float = 0.3):
+        self.min_similarity = min_similarity
+        self.__root = _TrieNode()
+        self.__names_by_trigram = {}
+        self.__trigram_counts = {}
+
+    def add(self, name: str):
+        if name in self.__trigram_counts:
+            return
+        node = self.__root
+        for char in name.casefold():
+            node = node.children.setdefault(char, _TrieNode())
+        node.names.add(name)
+
+        trigrams = self.__trigrams(name)
+        for trigram in trigrams:
+            self.__names_by_trigram.setdefault(trigram, set()).add(name)
+        self.__trigram_counts[name] = len(trigrams)
+
+    def remove(self, name: str):
+        if self.__trigram_counts.pop(name, None) is None:
+            return
+        path = [self.__root]
+        for char in name.casefold():
+            path.append(path[-1].children[char])
+        path[-1].names.discard(name)
+        for char, parent, node in zip(reversed(name.casefold()), reversed(path[:-1]), reversed(path[1:])):
+            if node.names or node.children:
+                break
+            del parent.children[char]
+
+        for trigram in self.__trigrams(name):
+            names = self.__names_by_trigram[trigram]
+            names.discard(name)
+            if not names:
+                del self.__names_by_trigram[trigram]
+
+    def clear(self):
+        self.__root = _TrieNode()
+        self.__names_by_trigram.clear()
+        self.__trigram_counts.clear()
+
+    def find_by_prefix(self, prefix: str, limit: int = 10) -> list[str]:
+        """Returns up to 'limit' names starting with prefix, in alphabetical order."""
+        node = self.__root
+        for char in prefix.casefold():
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        found = []
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            found.extend(sorted(node.names))
+            stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+        return found[:limit]
+
+    def find_similar(self, name: str, limit: int = 10) -> list[str]:
+        """Returns up to 'limit' names most similar to name, best match first."""
+        trigrams = self.__trigrams(name)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self.__names_by_trigram.get(trigram, ()))
+
+        query = name.casefold().strip()
+        short = len(query) <= self.SHORT_QUERY
+        scored = []
+        for candidate, count in shared.items():
+            similarity = count / (len(trigrams) + self.__trigram_counts[candidate] - count)
+            if short:
+                similarity = max(similarity, self.__edit_similarity(query, candidate))
+            if similarity >= self.min_similarity:
+                scored.append((similarity, candidate))
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        return [candidate for _, candidate in best]
+
+    @classmethod
+    def __edit_similarity(cls, query: str, candidate: str) -> float:
+        """Returns 1 - edits / length for the closest of the name and its words, or 0 if all are too far."""
+        folded = candidate.casefold()
+        best = 0.0
+        for word in {folded, *folded.split()}:
+            edits = cls.__edit_distance(query, word, cls.MAX_EDITS)
+            if edits <= cls.MAX_EDITS:
+                best = max(best, 1 - edits / max(len(query), len(word)))
+        return best
+
+    @staticmethod
+    def __edit_distance(a: str, b: str, limit: int) -> int:
+        """Returns the optimal string alignment distance of a and b, or limit + 1 once it exceeds limit."""
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        before_previous = None
+        previous = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            current = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    current[j] = min(current[j], before_previous[j - 2] + 1)
+            if min(current) > limit:
+                return limit + 1
+            before_previous, previous = previous, current
+        return previous[-1]
+
+    @staticmethod
+    def __trigrams(name: str) -> set[str]:
+        padded = f"  {name.casefold()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def __len__(self):
+        return len(self.__trigram_counts)
+
+    def __contains__(self, name):
+        return name in self.__trigram_counts
@@ -0,0 +1,33 @@
+from ..address_book_entities import Phone
+
+class PhoneIndex:
+    """
+    Reverse index from normalized phone numbers to contact names.
+
+    Used for caller-ID style lookups: finding the contacts that own a number is a
+    single dictionary lookup instead of a scan over every record and its phones.
+    """
+
+    def __init__(self):
+        self.__names_by_phone = {}
+
+    def add(self, phone, name: str):
+        self.__names_by_phone.setdefault(Phone.normalize(phone), set()).add(name)
+
+    def remove(self, phone, name: str):
+        key = Phone.normalize(phone)
+        names = self.__names_by_phone.get(key)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            del self.__names_by_phone[key]
+
+    def clear(self):
+        self.__names_by_phone.clear()
+
+    def find(self, phone) -> list[str]:
+        return sorted(self.__names_by_phone.get(Phone.normalize(phone), ()))
+
+    def __len__(self):
+        return len(self.__names_by_phone)
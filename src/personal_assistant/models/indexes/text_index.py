@@ -0,0 +1,169 @@
+import math
+import re
+import shlex
+from bisect import bisect_left
+
+class TextIndex:
+    """
+    Inverted full-text index with BM25 ranking.
+
+    Every document is tokenized into case-folded words (optionally stemmed), and
+    each word keeps the positions where it occurs in every document. Queries are
+    ranked with BM25 and support:
+        - plain words: documents containing any of the words rank higher the more
+          and the rarer words they match
+        - "quoted phrases": only documents containing the exact phrase match
+        - prefixes ending with *: match every word starting with the prefix
+
+    Attributes:
+        stemming (bool): Strip common English suffixes so 'buying' matches 'buy'
+        k1 (float): BM25 term frequency saturation
+        b (float): BM25 document length normalization
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    SUFFIXES = ("ingly", "edly", "ings", "ing", "ies", "ied", "ed", "es", "ly", "s")
+
+    def __init__(self, stemming: bool = False, k1: float = 1.2, b: float = 0.75):
+        self.stemming = stemming
+        self.k1 = k1
+        self.b = b
+        self.__postings = {}
+        self.__document_terms = {}
+        self.__document_lengths = {}
+        self.__total_length = 0
+        self.__vocabulary = None
+
+    def add(self, document_id, text: str):
+        self.remove(document_id)
+        positions_by_term = {}
+        tokens = self.tokenize(text)
+        for position, term in enumerate(tokens):
+            positions_by_term.setdefault(term, []).append(position)
+        for term, positions in positions_by_term.items():
+            if term not in self.__postings:
+                self.__postings[term] = {}
+                self.__vocabulary = None
+            self.__postings[term][document_id] = positions
+        self.__document_terms[document_id] = list(positions_by_term)
+        self.__document_lengths[document_id] = len(tokens)
+        self.__total_length += len(tokens)
+
+    def remove(self, document_id):
+        terms = self.__document_terms.pop(document_id, None)
+        if terms is None:
+            return
+        self.__total_length -= self.__document_lengths.pop(document_id)
+        for term in terms:
+            documents = self.__postings[term]
+            del documents[document_id]
+            if not documents:
+                del self.__postings[term]
+                self.__vocabulary = None
+
+    def clear(self):
+        self.__postings.clear()
+        self.__document_terms.clear()
+        self.__document_lengths.clear()
+        self.__total_length = 0
+        self.__vocabulary = None
+
+    def tokenize(self, text: str) -> list[str]:
+        tokens = self.TOKEN_PATTERN.findall(text.casefold())
+        if self.stemming:
+            tokens = [self.stem(token) for token in tokens]
+        return tokens
+
+    @classmethod
+    def stem(cls, word: str) -> str:
+        for suffix in cls.SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                return word[:-len(suffix)]
+        return word
+
+    def search(self, query: str, limit: int = 10) -> list[tuple]:
+        """
+        Returns up to 'limit' (document_id, score) pairs, best match first.
+
+        Args:
+            query (str): Words, "quoted phrases" and prefixes ending with *
+            limit (int): Maximum number of results
+        """
+        terms, phrases = self.__parse_query(query)
+        candidates = None
+        for phrase in phrases:
+            matching = self.__documents_with_phrase(phrase)
+            candidates = matching if candidates is None else candidates & matching
+            terms.extend(phrase)
+        if candidates is None:
+            candidates = set()
+            for term in terms:
+                candidates.update(self.__postings.get(term, ()))
+
+        scores = {document_id: self.__score(document_id, terms) for document_id in candidates}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+        return ranked[:limit]
+
+    def __parse_query(self, query: str):
+        try:
+            parts = shlex.split(query)
+        except ValueError:
+            parts = query.replace('"', " ").split()
+        terms, phrases = [], []
+        for part in parts:
+            if " " in part.strip():
+                phrase = self.tokenize(part)
+                if phrase:
+                    phrases.append(phrase)
+            elif part.endswith("*"):
+                terms.extend(self.__expand_prefix(part[:-1].casefold()))
+            else:
+                terms.extend(self.tokenize(part))
+        return terms, phrases
+
+    def __expand_prefix(self, prefix: str) -> list[str]:
+        if not prefix:
+            return []
+        if self.__vocabulary is None:
+            self.__vocabulary = sorted(self.__postings)
+        start = bisect_left(self.__vocabulary, prefix)
+        expanded = []
+        for term in self.__vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def __documents_with_phrase(self, phrase: list[str]) -> set:
+        postings = [self.__postings.get(term) for term in phrase]
+        if not all(postings):
+            return set()
+        documents = set(postings[0]).intersection(*postings[1:])
+        matching = set()
+        for document_id in documents:
+            starts = set(postings[0][document_id])
+            for offset, term_postings in enumerate(postings[1:], start=1):
+                starts &= {position - offset for position in term_postings[document_id]}
+                if not starts:
+                    break
+            if starts:
+                matching.add(document_id)
+        return matching
+
+    def __score(self, document_id, terms: list[str]) -> float:
+        documents_count = len(self.__document_lengths)
+        average_length = self.__total_length / documents_count if documents_count else 0
+        length = self.__document_lengths[document_id]
+        score = 0.0
+        for term in set(terms):
+            documents = self.__postings.get(term)
+            if not documents or document_id not in documents:
+                continue
+            frequency = len(documents[document_id])
+            idf = math.log(1 + (documents_count - len(documents) + 0.5) / (len(documents) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * length / average_length) if average_length else self.k1
+            score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return score
+
+    def __len__(self):
+        return len(self.__document_lengths)
@@ -1,3 +1,6 @@
 from .cacheable_dict import CacheableDict
+from .codecs import Codec, PickleCodec, JsonCodec, BinaryCodec, codec_for
+from .storage import StorageBackend, SnapshotStorage, PickleStorage, JournalStorage, ShardedStorage
 
-__all__ = ['CacheableDict']
\ No newline at end of file
+__all__ = ['CacheableDict', 'Codec', 'PickleCodec', 'JsonCodec', 'BinaryCodec', 'codec_for',
+           'StorageBackend', 'SnapshotStorage', 'PickleStorage', 'JournalStorage', 'ShardedStorage']
\ No newline at end of file
@@ -1,40 +1,147 @@
-import pickle
+import threading
+import weakref
 from collections import UserDict
+from ...instrumentation import METRICS
+from .storage import StorageBackend, SnapshotStorage
+
+
+class _Persistence:
+    """The storage of a CacheableDict and its loaded data, kept apart so the finalizer does not hold the dict."""
+
+    __slots__ = ("storage", "data", "metric")
+
+    def __init__(self, storage: StorageBackend, metric: str):
+        self.storage = storage
+        self.data = None
+        # Prefix of the load, flush and close timings in METRICS
+        self.metric = metric
+
+    def close(self):
+        if self.storage:
+            if self.data is not None:
+                with METRICS.timer(self.metric + ".close"):
+                    self.storage.close(self.data)
+            self.storage = None
+
 
 class CacheableDict(UserDict):
     """
     A dictionary with automatic persistence capabilities.
-    
+
     This class extends UserDict to provide automatic loading and saving of
-    dictionary data using pickle serialization. Data is loaded from a file
-    during initialization and automatically saved when the object is destroyed.
-    
+    dictionary data. Data is loaded through a storage backend on first access, so
+    creating the dictionary is cheap no matter how much data was saved. Every change
+    is reported to the backend, and the backend is closed by close(), when the
+    object is garbage collected, or at the latest when the interpreter exits,
+    before modules are torn down. By default the whole dictionary is saved into
+    one file, which is replaced atomically, in the format given by the file
+    extension (see SnapshotStorage). Subclasses set value_type to save their
+    values as plain tuples instead of pickled objects.
+
+    Loading, flushing and closing are timed in METRICS under
+    'storage.<class name>', which is also how a load can be observed; it
+    prints nothing.
+
+    Values changed in place (for example a record whose phone was added) are
+    invisible to the dictionary, so their owner reports them with mark_dirty().
+    flush() asks the backend to persist what changed; the managers' Checkpointer
+    calls it periodically.
+
     Attributes:
-        __state_storage_filename (str): The filename used for persistence
+        value_type (type): Class of the values, with to_tuple() and from_tuple(), or None
+        __persistence (_Persistence): The backend that persists the data and the loaded data
     """
 
-    def __init__(self, filename):
+    value_type = None
+
+    def __init__(self, filename, storage: StorageBackend = None):
         """
-        Constructor that loads existing dictionary data from the specified file if it exists,
-        otherwise do nothing, so a new empty dictionary is created by default
+        Constructor that only remembers where the data lives. Existing data is loaded
+        from the specified file the first time the dictionary is used, otherwise a new
+        empty dictionary is created
+
+        Args:
+            filename (str): The filename used for persistence
+            storage (StorageBackend, optional): Backend to use instead of a single snapshot file
         """
-        super().__init__()
-        self.__state_storage_filename = filename
-        UserDict.__init__(self)
-        try:
-            with open(self.__state_storage_filename, "rb") as f:
-                data = pickle.load(f)
-                self.data.update(data)
-                print(f"Cache data loaded from file {self.__state_storage_filename}.")
-        except FileNotFoundError:
-            pass # do nothing
-
-    def __del__(self):
+        # UserDict.__init__ is not called, it would replace the lazily loaded data
+        self.__persistence = _Persistence(storage or SnapshotStorage(filename, value_type=self.value_type),
+                                          "storage." + type(self).__name__)
+        self.__load_lock = threading.Lock()
+        # Unlike __del__, a finalizer also runs at interpreter exit, while modules are still usable
+        self.__finalizer = weakref.finalize(self, self.__persistence.close)
+
+    @property
+    def data(self):
+        persistence = self.__persistence
+        if persistence.data is None:
+            # Concurrent readers must not load the data twice
+            with self.__load_lock:
+                if persistence.data is None:
+                    with METRICS.timer(persistence.metric + ".load"):
+                        data = persistence.storage.load() if persistence.storage else {}
+                    persistence.data = data
+        return persistence.data
+
+    @data.setter
+    def data(self, value):
+        self.__persistence.data = value
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the data has been read from storage yet."""
+        return self.__persistence.data is not None
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        storage = self.__persistence.storage
+        if storage:
+            storage.on_set(key, value)
+
+    def __delitem__(self, key):
+        del self.data[key]
+        storage = self.__persistence.storage
+        if storage:
+            storage.on_delete(key)
+
+    def mark_dirty(self, key):
+        """Reports that the value stored under key was changed in place."""
+        storage = self.__persistence.storage
+        if storage:
+            storage.on_set(key, self.data[key])
+
+    def flush(self):
+        """Persists the changes made so far through the storage backend."""
+        persistence = self.__persistence
+        if persistence.storage and persistence.data is not None:
+            with METRICS.timer(persistence.metric + ".flush"):
+                persistence.storage.flush(persistence.data)
+
+    def checkpoint(self):
+        """
+        Takes a snapshot of the changes made so far and returns a callable that
+        persists it, or None if there is nothing to write; see
+        StorageBackend.checkpoint(). The dictionary may change again as soon as
+        this returns.
+        """
+        persistence = self.__persistence
+        if not persistence.storage or persistence.data is None:
+            return None
+        write = persistence.storage.checkpoint(persistence.data)
+        if write is None:
+            return None
+
+        def timed_write():
+            with METRICS.timer(persistence.metric + ".flush"):
+                write()
+        return timed_write
+
+    def close(self):
         """
-        Destructor that automatically saves the dictionary data.
-        
-        Uses pickle to serialize the current dictionary data to the storage file.
-        This ensures data persistence when the object is garbage collected.
+        Saves the dictionary data through the storage backend.
+
+        Data that was never loaded is left untouched on disk. After closing,
+        changes are no longer persisted, so the dictionary should not be
+        modified anymore. Closing more than once has no effect.
         """
-        with open(self.__state_storage_filename, "wb") as f:
-            pickle.dump(self.data, f)
+        self.__finalizer()
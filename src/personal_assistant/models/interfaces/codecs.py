@@ -0,0 +1,228 @@
+import json
+import os
+import pickle
+import struct
+
+try:
+    import msgpack
+except ImportError:  # optional, BinaryCodec falls back to its own encoder
+    msgpack = None
+
+
+class Codec:
+    """
+    Turns the data of a CacheableDict into bytes on disk and back.
+
+    Codecs handle plain data: dicts with string keys, lists, tuples, strings,
+    bytes, numbers, booleans and None. Records are turned into tuples before
+    they reach a codec (see SnapshotStorage), so files do not depend on where
+    the entity classes live. Tuples may come back as lists.
+
+    Attributes:
+        extension (str): File extension that selects this codec in codec_for()
+    """
+
+    extension = None
+
+    def dump(self, data: dict, f):
+        """Writes data to the binary file f."""
+        raise NotImplementedError
+
+    def load(self, f) -> dict:
+        """Reads data written by dump() from the binary file f."""
+        raise NotImplementedError
+
+
+class PickleCodec(Codec):
+    """
+    Pickle with protocol 5, the fastest codec in CPython.
+
+    Loading a pickle can run arbitrary code, so only load files you wrote.
+    """
+
+    extension = ".pkl"
+
+    def __init__(self, protocol: int = 5):
+        self.protocol = protocol
+
+    def dump(self, data: dict, f):
+        pickle.dump(data, f, self.protocol)
+
+    def load(self, f) -> dict:
+        return pickle.load(f)
+
+
+class JsonCodec(Codec):
+    """Compact UTF-8 JSON; safe to load and readable by other tools."""
+
+    extension = ".json"
+
+    def dump(self, data: dict, f):
+        f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    def load(self, f) -> dict:
+        return json.loads(f.read())
+
+
+class BinaryCodec(Codec):
+    """
+    Compact binary encoding in the MessagePack format; safe to load.
+
+    Uses the msgpack package when it is installed and a built-in encoder for
+    the same format otherwise, so files are interchangeable between the two.
+    """
+
+    extension = ".bin"
+
+    def dump(self, data: dict, f):
+        f.write(self.dumps(data))
+
+    def load(self, f) -> dict:
+        return self.loads(f.read())
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        """Encodes a single plain value."""
+        if msgpack is not None:
+            return msgpack.packb(value, use_bin_type=True)
+        out = bytearray()
+        _pack(value, out)
+        return bytes(out)
+
+    @staticmethod
+    def loads(buffer: bytes):
+        """Decodes a value encoded by dumps()."""
+        if msgpack is not None:
+            return msgpack.unpackb(buffer, raw=False, strict_map_key=False)
+        value, end = _unpack(buffer, 0)
+        if end != len(buffer):
+            raise ValueError("Trailing data after the encoded value")
+        return value
+
+
+CODECS = (PickleCodec(), JsonCodec(), BinaryCodec())
+
+
+def codec_for(filename: str) -> Codec:
+    """Returns the codec for the extension of filename; pickle for unknown extensions."""
+    extension = os.path.splitext(filename)[1].lower()
+    for codec in CODECS:
+        if codec.extension == extension:
+            return codec
+    return CODECS[0]
+
+
+def _pack_header(out: bytearray, size: int, fix_mask: int, fix_limit: int, code8: int | None, code16: int, code32: int):
+    if size < fix_limit:
+        out.append(fix_mask | size)
+    elif code8 is not None and size < 0x100:
+        out += bytes((code8, size))
+    elif size < 0x10000:
+        out.append(code16)
+        out += size.to_bytes(2, "big")
+    else:
+        out.append(code32)
+        out += size.to_bytes(4, "big")
+
+
+def _pack(value, out: bytearray):
+    """Appends value in the MessagePack format to out."""
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if -0x20 <= value < 0x80:
+            out += value.to_bytes(1, "big", signed=True)
+        else:
+            signed = value < 0
+            for width, code in ((1, 0xd0 if signed else 0xcc), (2, 0xd1 if signed else 0xcd),
+                                (4, 0xd2 if signed else 0xce), (8, 0xd3 if signed else 0xcf)):
+                limit = 1 << (width * 8 - signed)
+                if -limit <= value < limit:
+                    out.append(code)
+                    out += value.to_bytes(width, "big", signed=signed)
+                    break
+            else:
+                raise OverflowError("Integers must fit in 64 bits")
+    elif isinstance(value, float):
+        out.append(0xcb)
+        out += struct.pack(">d", value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        _pack_header(out, len(encoded), 0xa0, 0x20, 0xd9, 0xda, 0xdb)
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_header(out, len(value), 0, 0, 0xc4, 0xc5, 0xc6)
+        out += value
+    elif isinstance(value, (list, tuple)):
+        _pack_header(out, len(value), 0x90, 0x10, None, 0xdc, 0xdd)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        _pack_header(out, len(value), 0x80, 0x10, None, 0xde, 0xdf)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} values")
+
+
+_INTS = {
+    0xcc: (1, False), 0xcd: (2, False), 0xce: (4, False), 0xcf: (8, False),
+    0xd0: (1, True), 0xd1: (2, True), 0xd2: (4, True), 0xd3: (8, True),
+}
+_SIZES = {0xd9: 1, 0xda: 2, 0xdb: 4, 0xc4: 1, 0xc5: 2, 0xc6: 4, 0xdc: 2, 0xdd: 4, 0xde: 2, 0xdf: 4}
+
+
+def _unpack(buffer: bytes, position: int):
+    """Decodes the MessagePack value at position; returns the value and the position after it."""
+    code = buffer[position]
+    position += 1
+    if code < 0x80:
+        return code, position
+    if code >= 0xe0:
+        return code - 0x100, position
+    if 0xa0 <= code <= 0xbf or code in (0xd9, 0xda, 0xdb):
+        size, position = _size(buffer, position, code, code & 0x1f)
+        return buffer[position:position + size].decode("utf-8"), position + size
+    if 0x90 <= code <= 0x9f or code in (0xdc, 0xdd):
+        size, position = _size(buffer, position, code, code & 0x0f)
+        items = []
+        for _ in range(size):
+            item, position = _unpack(buffer, position)
+            items.append(item)
+        return items, position
+    if 0x80 <= code <= 0x8f or code in (0xde, 0xdf):
+        size, position = _size(buffer, position, code, code & 0x0f)
+        items = {}
+        for _ in range(size):
+            key, position = _unpack(buffer, position)
+            items[key], position = _unpack(buffer, position)
+        return items, position
+    if code == 0xc0:
+        return None, position
+    if code == 0xc2:
+        return False, position
+    if code == 0xc3:
+        return True, position
+    if code in _INTS:
+        width, signed = _INTS[code]
+        return int.from_bytes(buffer[position:position + width], "big", signed=signed), position + width
+    if code == 0xcb:
+        return struct.unpack_from(">d", buffer, position)[0], position + 8
+    if code == 0xca:
+        return struct.unpack_from(">f", buffer, position)[0], position + 4
+    if code in (0xc4, 0xc5, 0xc6):
+        size, position = _size(buffer, position, code, 0)
+        return bytes(buffer[position:position + size]), position + size
+    raise ValueError(f"Unsupported MessagePack type 0x{code:02x}")
+
+
+def _size(buffer: bytes, position: int, code: int, fixed_size: int) -> tuple[int, int]:
+    width = _SIZES.get(code)
+    if width is None:
+        return fixed_size, position
+    return int.from_bytes(buffer[position:position + width], "big"), position + width
@@ -0,0 +1,568 @@
+import gc
+import os
+import pickle
+import shutil
+import stat
+import tempfile
+import threading
+import zlib
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from ...instrumentation import METRICS
+from .codecs import Codec, PickleCodec, codec_for
+
+
+# Read once, as reading the umask means changing it, which would race with threads creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write(filename: str, write):
+    """
+    Calls write(f) on a new binary file that replaces filename once it is complete.
+
+    The data is written to a temporary file next to filename, forced to disk and
+    then renamed over filename, so the file is always either the old or the new
+    version. A crash at any point leaves the previous file intact, and the
+    temporary file is removed if write fails. The new file keeps the permissions
+    of the file it replaces, or gets the umask defaults if there was none, rather
+    than the owner-only ones of temporary files.
+    """
+    directory = os.path.dirname(filename) or "."
+    try:
+        mode = stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, temp_filename = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.chmod(temp_filename, mode)
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+            METRICS.increment("storage.bytes_written", f.tell())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try:
+            os.remove(temp_filename)
+        except FileNotFoundError:
+            pass
+        raise
+    # The rename itself is only durable once the directory entry is on disk
+    if hasattr(os, "O_DIRECTORY"):
+        directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Disables the cyclic garbage collector for the duration of the block.
+
+    Decoding a snapshot allocates millions of containers, none of them garbage;
+    without this, the collector rescans them over and over and takes more time
+    than the decoding itself.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _atomic_dump(value, filename: str):
+    """Pickles value into filename atomically, see _atomic_write."""
+    _atomic_write(filename, lambda f: pickle.dump(value, f))
+
+
+class StorageBackend:
+    """
+    Base class for the persistence backends used by CacheableDict.
+
+    A backend decides how the dictionary data is laid out on disk. CacheableDict
+    notifies it about every change and asks it to persist the data on shutdown.
+    """
+
+    def load(self) -> dict:
+        """Returns the persisted data, or an empty dict if nothing was saved yet."""
+        return {}
+
+    def on_set(self, key, value):
+        """Called after a key was added or overwritten."""
+
+    def on_delete(self, key):
+        """Called after a key was removed."""
+
+    def flush(self, data: dict):
+        """Persists the changes reported so far; called by CacheableDict.flush()."""
+
+    def checkpoint(self, data: dict):
+        """
+        Takes what flush() would persist and returns a callable that writes it, or
+        None if nothing is left to write.
+
+        The caller holds off changes to data only until checkpoint() returns, so
+        the expensive part of a save can run outside its locks. By default the
+        changes are flushed right away.
+        """
+        self.flush(data)
+        return None
+
+    def close(self, data: dict):
+        """Called once when the owning dictionary is destroyed."""
+
+
+class SnapshotStorage(StorageBackend):
+    """
+    Keeps the whole dictionary in one file that is rewritten on close.
+
+    The file format is given by a Codec, chosen by the file extension unless one
+    is passed: '.pkl' for pickle, '.json' for JSON and '.bin' for a compact
+    binary format. With a value_type (a class with to_tuple() and from_tuple(),
+    like AddressBookRecord), values are saved as plain tuples rather than live
+    objects, so the JSON and binary files are safe to load and no file depends
+    on where the entity classes live. Values that were saved as objects by
+    older versions are loaded as they are.
+
+    flush() also rewrites the whole file, but only if something changed since
+    the last save. checkpoint() only copies the plain data (tuples, or the
+    values themselves without a value_type, which are then expected to be
+    replaced rather than changed in place, like the notes' strings) and leaves
+    encoding and writing to the returned callable. The file is replaced
+    atomically, so a crash while saving keeps the previous version instead of a
+    truncated file.
+
+    Attributes:
+        filename (str): The snapshot file
+        codec (Codec): Encodes the plain data into the file
+        value_type (type): Class the values are converted from and to, or None
+    """
+
+    def __init__(self, filename: str, codec: Codec = None, value_type: type = None):
+        self.filename = filename
+        self.codec = codec or codec_for(filename)
+        self.value_type = value_type
+        self.__changed = False
+        # Snapshots are numbered, so one written late never replaces a newer one
+        self.__taken = 0
+        self.__written = 0
+        self.__write_lock = threading.Lock()
+
+    def load(self) -> dict:
+        try:
+            with open(self.filename, "rb") as f, _gc_paused():
+                METRICS.increment("storage.bytes_read", os.fstat(f.fileno()).st_size)
+                data = self.codec.load(f)
+                value_type = self.value_type
+                if value_type is None:
+                    return data
+                return {key: value if isinstance(value, value_type) else value_type.from_tuple(value)
+                        for key, value in data.items()}
+        except FileNotFoundError:
+            return {}
+
+    def on_set(self, key, value):
+        self.__changed = True
+
+    def on_delete(self, key):
+        self.__changed = True
+
+    def flush(self, data: dict):
+        write = self.checkpoint(data)
+        if write is not None:
+            write()
+
+    def checkpoint(self, data: dict):
+        if not self.__changed:
+            return None
+        return self.__writer(data)
+
+    def close(self, data: dict):
+        # Always written, so in-place changes that were never reported are saved too
+        self.__writer(data)()
+
+    def __writer(self, data: dict):
+        """Copies data as plain values and returns a callable that encodes and writes the copy."""
+        with _gc_paused():
+            if self.value_type is None:
+                snapshot = dict(data)
+            else:
+                to_tuple = self.value_type.to_tuple
+                snapshot = {key: to_tuple(value) for key, value in data.items()}
+        self.__changed = False
+        self.__taken += 1
+        number = self.__taken
+
+        def write():
+            with self.__write_lock:
+                if number < self.__written:
+                    return
+                try:
+                    with _gc_paused():
+                        _atomic_write(self.filename, lambda f: self.codec.dump(snapshot, f))
+                except BaseException:
+                    self.__changed = True
+                    raise
+                self.__written = number
+        return write
+
+
+class PickleStorage(SnapshotStorage):
+    """
+    A SnapshotStorage that always pickles, whatever the file extension.
+
+    This is the original persistence behaviour of CacheableDict. Without a
+    value_type the values are pickled as live objects.
+    """
+
+    def __init__(self, filename: str, value_type: type = None):
+        super().__init__(filename, PickleCodec(), value_type)
+
+
+class JournalStorage(StorageBackend):
+    """
+    Write-ahead journal persistence.
+
+    Every change is appended to '<filename>.journal' as a small pickled
+    (operation, key, value) entry, so a write costs about the size of the changed
+    item and nothing is lost on a crash. The journal is fsynced every 'sync_every'
+    entries. Once it grows past 'compact_after' entries, it is rotated and a
+    background thread writes the data, pickled beforehand, into the snapshot
+    file '<filename>'. A compaction that failed leaves the rotated journal in
+    place, later rotations append to it, and the error is raised by the next
+    flush(), close() or wait_for_compaction().
+
+    Recovery loads the snapshot and replays the rotated journal (if a compaction
+    was interrupted) and the current journal on top of it.
+
+    The snapshot is a PickleStorage file, so with the same value_type it can be
+    read and written by the default storage as well.
+
+    Attributes:
+        filename (str): Snapshot file, same format as PickleStorage
+        sync_every (int): Number of journal entries between two fsync calls
+        compact_after (int): Number of journal entries that triggers a compaction
+        value_type (type): Class the snapshot values are converted from and to, or None
+    """
+
+    SET = "set"
+    DELETE = "del"
+
+    def __init__(self, filename: str, sync_every: int = 32, compact_after: int = 10000, value_type: type = None):
+        self.filename = filename
+        self.value_type = value_type
+        self.journal_filename = filename + ".journal"
+        self.rotated_journal_filename = filename + ".journal.old"
+        self.sync_every = max(1, sync_every)
+        self.compact_after = compact_after
+        self.__journal = None
+        self.__entries = 0
+        self.__unsynced = 0
+        self.__data = None
+        self.__compaction = None
+        self.__compaction_error = None
+        self.__lock = threading.Lock()
+
+    def load(self) -> dict:
+        data = PickleStorage(self.filename, self.value_type).load()
+        interrupted_compaction = os.path.exists(self.rotated_journal_filename)
+        for journal_filename in (self.rotated_journal_filename, self.journal_filename):
+            self.__entries = self.__replay(journal_filename, data)
+        if interrupted_compaction:
+            self.__write_snapshot(self.__snapshot(data))
+        self.__data = data
+        self.__journal = open(self.journal_filename, "ab")
+        return data
+
+    def on_set(self, key, value):
+        self.__append((self.SET, key, value))
+
+    def on_delete(self, key):
+        self.__append((self.DELETE, key, None))
+
+    def sync(self):
+        """Flushes buffered journal entries and forces them to disk."""
+        with self.__lock:
+            self.__sync()
+
+    def flush(self, data: dict):
+        self.sync()
+        self.wait_for_compaction()
+
+    def compact(self, data: dict, wait: bool = False):
+        """
+        Rotates the journal and writes a fresh snapshot in a background thread.
+
+        Args:
+            data (dict): The current dictionary data
+            wait (bool): Block until the snapshot is written
+        """
+        self.wait_for_compaction()
+        self.__start_compaction(data)
+        if wait:
+            self.wait_for_compaction()
+
+    def __start_compaction(self, data: dict):
+        with self.__lock:
+            self.__sync()
+            self.__journal.close()
+            self.__rotate()
+            self.__journal = open(self.journal_filename, "ab")
+            self.__entries = 0
+        # Pickled here, while the caller holds off changes, as the records keep changing once it returns
+        snapshot = pickle.dumps(self.__snapshot(data))
+        self.__compaction = threading.Thread(target=self.__compact, args=(snapshot,), daemon=True)
+        self.__compaction.start()
+
+    def __rotate(self):
+        """Moves the journal entries into the rotated journal, after the entries a failed compaction left there."""
+        if not os.path.exists(self.rotated_journal_filename):
+            os.replace(self.journal_filename, self.rotated_journal_filename)
+            return
+        with open(self.journal_filename, "rb") as journal, open(self.rotated_journal_filename, "ab") as rotated:
+            shutil.copyfileobj(journal, rotated)
+            rotated.flush()
+            os.fsync(rotated.fileno())
+        # Replaying entries twice after a crash right here gives the same data
+        os.remove(self.journal_filename)
+
+    def __compact(self, snapshot: bytes):
+        try:
+            _atomic_write(self.filename, lambda f: f.write(snapshot))
+            os.remove(self.rotated_journal_filename)
+        except BaseException as error:
+            self.__compaction_error = error
+
+    def close(self, data: dict):
+        if self.__journal is None:
+            return
+        self.compact(data, wait=True)
+        self.__journal.close()
+        self.__journal = None
+        os.remove(self.journal_filename)
+
+    def __append(self, entry):
+        blob = pickle.dumps(entry)
+        with self.__lock:
+            self.__journal.write(blob)
+            self.__entries += 1
+            self.__unsynced += 1
+            if self.__unsynced >= self.sync_every:
+                self.__sync()
+        METRICS.increment("storage.bytes_written", len(blob))
+        if self.__entries >= self.compact_after and self.__data is not None:
+            self.__join_compaction()
+            # A failed compaction is reported by flush() or close(), not to the writer
+            if self.__compaction_error is None:
+                self.__start_compaction(self.__data)
+
+    def __sync(self):
+        if self.__unsynced:
+            self.__journal.flush()
+            os.fsync(self.__journal.fileno())
+            self.__unsynced = 0
+
+    def __snapshot(self, data: dict) -> dict:
+        """Returns the data to save, with values converted to tuples if there is a value_type."""
+        if self.value_type is None:
+            return dict(data)
+        to_tuple = self.value_type.to_tuple
+        return {key: to_tuple(value) for key, value in data.items()}
+
+    def __write_snapshot(self, snapshot: dict):
+        _atomic_dump(snapshot, self.filename)
+        os.remove(self.rotated_journal_filename)
+
+    def wait_for_compaction(self):
+        """Blocks until a running background compaction has finished and raises the error it failed with."""
+        self.__join_compaction()
+        error, self.__compaction_error = self.__compaction_error, None
+        if error is not None:
+            raise error
+
+    def __join_compaction(self):
+        if self.__compaction is not None:
+            self.__compaction.join()
+            self.__compaction = None
+
+    @classmethod
+    def __replay(cls, journal_filename: str, data: dict) -> int:
+        """
+        Applies journal entries to data and returns how many were applied.
+
+        An entry torn by a crash ends the replay and is cut off the journal, so
+        new entries are not appended after unreadable bytes.
+        """
+        applied = 0
+        try:
+            with open(journal_filename, "r+b") as f:
+                valid_size = 0
+                while True:
+                    try:
+                        operation, key, value = pickle.load(f)
+                    except (EOFError, pickle.UnpicklingError, ValueError):
+                        break
+                    if operation == cls.SET:
+                        data[key] = value
+                    else:
+                        data.pop(key, None)
+                    applied += 1
+                    valid_size = f.tell()
+                f.truncate(valid_size)
+        except FileNotFoundError:
+            pass
+        return applied
+
+
+class ShardedStorage(StorageBackend):
+    """
+    Splits the dictionary into shard files that are read only when needed.
+
+    Keys are assigned to one of 'shards' files by the CRC32 of the key, inside the
+    directory '<filename>.shards'. A small manifest lists every key with its shard,
+    so opening the storage, iterating over keys, len() and 'in' only read the
+    manifest, and looking up a key reads the single shard that holds it. On close,
+    only the shards that were changed are rewritten.
+
+    When no sharded data exists yet but '<filename>' holds a PickleStorage
+    snapshot, it is loaded and split into shards on close; with a value_type,
+    values saved as tuples are converted back on loading.
+
+    Attributes:
+        filename (str): Legacy single-file snapshot that is migrated on first use
+        directory (str): Directory holding the manifest and the shard files
+        shards (int): Number of shard files
+        value_type (type): Class of the values in the legacy snapshot, or None
+    """
+
+    MANIFEST = "manifest.pkl"
+
+    def __init__(self, filename: str, shards: int = 64, value_type: type = None):
+        self.filename = filename
+        self.value_type = value_type
+        self.directory = filename + ".shards"
+        self.shards = shards
+        self.__data = None
+
+    @property
+    def loaded_shards(self) -> int:
+        """Number of shard files read so far."""
+        return self.__data.loaded_shards if self.__data is not None else 0
+
+    def load(self) -> MutableMapping:
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST), "rb") as f:
+                manifest = pickle.load(f)
+            self.shards = manifest["shards"]
+            self.__data = _ShardedData(self, manifest["keys"])
+        except FileNotFoundError:
+            self.__data = _ShardedData(self, {})
+            for key, value in PickleStorage(self.filename, self.value_type).load().items():
+                self.__data[key] = value
+        return self.__data
+
+    def shard_of(self, key) -> int:
+        return zlib.crc32(str(key).encode()) % self.shards
+
+    def read_shard(self, shard: int) -> dict:
+        try:
+            with open(self.__shard_filename(shard), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def on_set(self, key, value):
+        # Also reached for values changed in place, through CacheableDict.mark_dirty
+        self.__data.mark_dirty(key)
+
+    def flush(self, data: MutableMapping):
+        """Rewrites the shards changed since the last flush, and the manifest if keys were added or removed."""
+        if self.__data is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for shard, values in self.__data.dirty_shards():
+            _atomic_dump(values, self.__shard_filename(shard))
+        manifest = self.__data.changed_manifest()
+        if manifest is not None:
+            # Written after the shards, so the manifest never lists keys missing from them
+            _atomic_dump({"shards": self.shards, "keys": manifest}, os.path.join(self.directory, self.MANIFEST))
+
+    def close(self, data: MutableMapping):
+        self.flush(data)
+        self.__data = None
+
+    def __shard_filename(self, shard: int) -> str:
+        return os.path.join(self.directory, f"shard-{shard:04d}.pkl")
+
+
+class _ShardedData(MutableMapping):
+    """The dictionary data of a ShardedStorage, reading shard files on demand."""
+
+    def __init__(self, storage: ShardedStorage, shard_by_key: dict):
+        self.__storage = storage
+        self.__shard_by_key = shard_by_key
+        self.__shards = {}
+        self.__dirty = set()
+        self.__keys_changed = False
+
+    @property
+    def loaded_shards(self) -> int:
+        return len(self.__shards)
+
+    def __shard(self, shard: int) -> dict:
+        values = self.__shards.get(shard)
+        if values is None:
+            values = self.__shards[shard] = self.__storage.read_shard(shard)
+        return values
+
+    def __getitem__(self, key):
+        shard = self.__shard_by_key.get(key)
+        if shard is None:
+            raise KeyError(key)
+        return self.__shard(shard)[key]
+
+    def __setitem__(self, key, value):
+        shard = self.__shard_by_key.get(key)
+        if shard is None:
+            shard = self.__shard_by_key[key] = self.__storage.shard_of(key)
+            self.__keys_changed = True
+        self.__shard(shard)[key] = value
+        self.__dirty.add(shard)
+
+    def __delitem__(self, key):
+        shard = self.__shard_by_key.pop(key)
+        del self.__shard(shard)[key]
+        self.__dirty.add(shard)
+        self.__keys_changed = True
+
+    def __contains__(self, key):
+        return key in self.__shard_by_key
+
+    def __iter__(self):
+        return iter(self.__shard_by_key)
+
+    def __len__(self):
+        return len(self.__shard_by_key)
+
+    def mark_dirty(self, key):
+        shard = self.__shard_by_key.get(key)
+        if shard is not None:
+            self.__dirty.add(shard)
+
+    def dirty_shards(self):
+        """Yields (shard, values) for every shard changed since loading."""
+        for shard in sorted(self.__dirty):
+            yield shard, self.__shards[shard]
+        self.__dirty.clear()
+
+    def changed_manifest(self) -> dict | None:
+        """Returns the key to shard map if keys were added or removed since the last call, else None."""
+        if not self.__keys_changed:
+            return None
+        self.__keys_changed = False
+        return dict(self.__shard_by_key)
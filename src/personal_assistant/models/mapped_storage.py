@@ -0,0 +1,292 @@
+import heapq
+import mmap
+import struct
+import weakref
+from bisect import insort
+from collections.abc import MutableMapping
+from datetime import date
+from .address_book_entities import AddressBookRecord
+from .interfaces import StorageBackend, SnapshotStorage, BinaryCodec
+from .interfaces.storage import _atomic_write
+
+
+class MappedStorage(StorageBackend):
+    """
+    Keeps an AddressBook in an immutable snapshot file that is memory-mapped.
+
+    The file '<filename>.map' holds a table of fixed-size entries sorted by
+    name, the names, and every record packed on its own with BinaryCodec. Opening
+    it only maps the file: looking a contact up binary-searches the mapped table
+    and decodes that single record, iterating names decodes no record at all, and
+    birthdays are kept in the table, so upcoming birthdays are found without
+    decoding records either. Building the phone index decodes the records one by
+    one without keeping them. Processes that open the same snapshot share it in
+    the page cache instead of each holding its own copy.
+
+    The snapshot is never changed in place: changed records are kept in memory
+    and, if there were any, flush() and close() write a new snapshot that
+    atomically replaces the old one; only the changed records are encoded, the
+    others are copied without being decoded. Records changed in place must be
+    reported with CacheableDict.mark_dirty(), as AddressBookManager does.
+    Unchanged records are only cached while they are in use, so listing the whole
+    book does not keep it in memory. Contacts are iterated in name order.
+
+    When no snapshot exists yet but '<filename>' holds a SnapshotStorage file, it
+    is loaded and written as a snapshot on close.
+
+    Attributes:
+        filename (str): Legacy single-file snapshot that is migrated on first use
+        mapped_filename (str): The memory-mapped snapshot
+    """
+
+    MAGIC = b"PAMAP001"
+    # magic, entry count, offset of the names, offset of the record blobs
+    HEADER = struct.Struct("<8sIQQ")
+    # name offset, name length, blob offset, blob length, birthday ordinal (0 if none)
+    ENTRY = struct.Struct("<IIQIi")
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.mapped_filename = filename + ".map"
+        self.__data = None
+        self.__changed = False
+
+    @property
+    def decoded_records(self) -> int:
+        """Number of records decoded from the snapshot so far."""
+        return self.__data.decoded_records if self.__data is not None else 0
+
+    @property
+    def changed_records(self) -> int:
+        """Number of records kept in memory to be written by the next flush()."""
+        return self.__data.changed_records if self.__data is not None else 0
+
+    def load(self) -> MutableMapping:
+        try:
+            with open(self.mapped_filename, "rb") as f:
+                snapshot = _Snapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            self.__data = _MappedData(None)
+            legacy = SnapshotStorage(self.filename, value_type=AddressBookRecord).load()
+            for name, record in legacy.items():
+                self.__data[name] = record
+            self.__changed = bool(legacy)
+        else:
+            self.__data = _MappedData(snapshot)
+        return self.__data
+
+    def on_set(self, key, value):
+        self.__changed = True
+        # Records changed in place are reported here and join the changed ones
+        self.__data[key] = value
+
+    def on_delete(self, key):
+        self.__changed = True
+
+    def flush(self, data: MutableMapping):
+        """Writes a new snapshot if anything changed; the old one stays mapped until close()."""
+        if self.__data is None or not self.__changed:
+            return
+        entries = sorted(self.__data.entries())
+        _atomic_write(self.mapped_filename, lambda f: self.__write(f, entries))
+        self.__changed = False
+
+    def close(self, data: MutableMapping):
+        if self.__data is None:
+            return
+        self.flush(data)
+        self.__data.close()
+        self.__data = None
+
+    @classmethod
+    def __write(cls, f, entries: list[tuple[bytes, bytes, int]]):
+        names_offset = cls.HEADER.size + cls.ENTRY.size * len(entries)
+        blobs_offset = names_offset + sum(len(name) for name, _, _ in entries)
+        f.write(cls.HEADER.pack(cls.MAGIC, len(entries), names_offset, blobs_offset))
+        name_position = blob_position = 0
+        table = bytearray()
+        for name, blob, birthday in entries:
+            table += cls.ENTRY.pack(name_position, len(name), blob_position, len(blob), birthday)
+            name_position += len(name)
+            blob_position += len(blob)
+        f.write(table)
+        f.write(b"".join(name for name, _, _ in entries))
+        for _, blob, _ in entries:
+            f.write(blob)
+
+
+class _Snapshot:
+    """Read access to a mapped snapshot file."""
+
+    def __init__(self, mapped: mmap.mmap):
+        magic, self.count, self.__names_offset, self.__blobs_offset = MappedStorage.HEADER.unpack_from(mapped, 0)
+        if magic != MappedStorage.MAGIC:
+            raise ValueError("Not an address book snapshot")
+        self.__mapped = mapped
+
+    def __entry(self, index: int) -> tuple:
+        entry = MappedStorage.ENTRY
+        return entry.unpack_from(self.__mapped, MappedStorage.HEADER.size + index * entry.size)
+
+    def encoded_name(self, index: int) -> bytes:
+        name_offset, name_length, _, _, _ = self.__entry(index)
+        start = self.__names_offset + name_offset
+        return self.__mapped[start:start + name_length]
+
+    def blob(self, index: int) -> bytes:
+        _, _, blob_offset, blob_length, _ = self.__entry(index)
+        start = self.__blobs_offset + blob_offset
+        return self.__mapped[start:start + blob_length]
+
+    def scan(self):
+        """Yields (encoded name, birthday ordinal) for every entry in table order, in a single pass."""
+        table_end = MappedStorage.HEADER.size + self.count * MappedStorage.ENTRY.size
+        names = self.__mapped[self.__names_offset:self.__blobs_offset]
+        with memoryview(self.__mapped)[MappedStorage.HEADER.size:table_end] as table:
+            for name_offset, name_length, _, _, birthday in MappedStorage.ENTRY.iter_unpack(table):
+                yield names[name_offset:name_offset + name_length], birthday
+
+    def entries(self):
+        """Yields (encoded name, record blob, birthday ordinal) for every entry in table order."""
+        table_end = MappedStorage.HEADER.size + self.count * MappedStorage.ENTRY.size
+        mapped = self.__mapped
+        names_offset, blobs_offset = self.__names_offset, self.__blobs_offset
+        with memoryview(mapped)[MappedStorage.HEADER.size:table_end] as table:
+            for name_offset, name_length, blob_offset, blob_length, birthday in MappedStorage.ENTRY.iter_unpack(table):
+                name_start = names_offset + name_offset
+                blob_start = blobs_offset + blob_offset
+                yield mapped[name_start:name_start + name_length], mapped[blob_start:blob_start + blob_length], birthday
+
+    def find(self, name: str) -> int:
+        """Returns the index of the entry for name, or -1; a binary search over the sorted table."""
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.encoded_name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.count and self.encoded_name(low) == key else -1
+
+    def close(self):
+        self.__mapped.close()
+
+
+class _MappedData(MutableMapping):
+    """The records of a MappedStorage: the snapshot plus the changes made since it was written."""
+
+    def __init__(self, snapshot: _Snapshot | None):
+        self.__snapshot = snapshot
+        # Records set or changed in place since the snapshot was written
+        self.__changed = {}
+        # Unchanged decoded records, the same object for as long as anyone holds it
+        self.__decoded = weakref.WeakValueDictionary()
+        # Names that are not in the snapshot, kept sorted so iteration stays in name order
+        self.__added = []
+        self.__deleted = set()
+        self.decoded_records = 0
+
+    def __snapshot_index(self, name) -> int:
+        if self.__snapshot is None or not isinstance(name, str):
+            return -1
+        return self.__snapshot.find(name)
+
+    def __index(self, name) -> int:
+        return -1 if name in self.__deleted else self.__snapshot_index(name)
+
+    @property
+    def changed_records(self) -> int:
+        return len(self.__changed)
+
+    def __getitem__(self, name) -> AddressBookRecord:
+        record = self.__changed.get(name)
+        if record is None:
+            record = self.__decoded.get(name)
+        if record is not None:
+            return record
+        index = self.__index(name)
+        if index < 0:
+            raise KeyError(name)
+        record = AddressBookRecord.from_tuple(BinaryCodec.loads(self.__snapshot.blob(index)))
+        self.decoded_records += 1
+        # Concurrent readers may decode the same record; all of them get the first copy
+        return self.__decoded.setdefault(name, record)
+
+    def __setitem__(self, name, record: AddressBookRecord):
+        if name in self.__deleted:
+            self.__deleted.discard(name)
+        elif name not in self.__changed and self.__snapshot_index(name) < 0:
+            insort(self.__added, name)
+        self.__changed[name] = record
+        self.__decoded.pop(name, None)
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self.__changed.pop(name, None)
+        self.__decoded.pop(name, None)
+        if self.__index(name) >= 0:
+            self.__deleted.add(name)
+        else:
+            self.__added.remove(name)
+
+    def __contains__(self, name):
+        return name in self.__changed or self.__index(name) >= 0
+
+    def __iter__(self):
+        # UTF-8 keeps the order of code points, so the snapshot names sort like the added ones
+        return heapq.merge(self.__snapshot_names(), list(self.__added))
+
+    def __snapshot_names(self):
+        if self.__snapshot is not None:
+            for encoded_name, _ in self.__snapshot.scan():
+                name = encoded_name.decode("utf-8")
+                if name not in self.__deleted:
+                    yield name
+
+    def __len__(self):
+        count = self.__snapshot.count if self.__snapshot is not None else 0
+        return count - len(self.__deleted) + len(self.__added)
+
+    def iter_birthdays(self):
+        """Yields (name, birth date) for every contact with a birthday, reading undecoded ones from the table."""
+        if self.__snapshot is not None:
+            skipped = self.__deleted.union(self.__changed)
+            for encoded_name, ordinal in self.__snapshot.scan():
+                if ordinal:
+                    name = encoded_name.decode("utf-8")
+                    if name not in skipped:
+                        yield name, date.fromordinal(ordinal)
+        for name, record in list(self.__changed.items()):
+            if record.birthday:
+                yield name, record.birthday.value
+
+    def iter_phones(self):
+        """Yields (name, phone) for every phone of every contact; records are decoded as data and not kept."""
+        if self.__snapshot is not None:
+            skipped = self.__deleted.union(self.__changed)
+            for encoded_name, blob, _ in self.__snapshot.entries():
+                name = encoded_name.decode("utf-8")
+                if name not in skipped:
+                    for phone in BinaryCodec.loads(blob)[1]:
+                        yield name, phone
+        for name, record in list(self.__changed.items()):
+            for phone in record.phones:
+                yield name, str(phone)
+
+    def entries(self):
+        """Yields (encoded name, record blob, birthday ordinal) for every record, encoding only changed ones."""
+        if self.__snapshot is not None:
+            skipped = self.__deleted.union(self.__changed)
+            for encoded_name, blob, birthday in self.__snapshot.entries():
+                if encoded_name.decode("utf-8") not in skipped:
+                    yield encoded_name, blob, birthday
+        for name, record in list(self.__changed.items()):
+            values = record.to_tuple()
+            yield name.encode("utf-8"), BinaryCodec.dumps(values), values[2] or 0
+
+    def close(self):
+        if self.__snapshot is not None:
+            self.__snapshot.close()
+            self.__snapshot = None
@@ -1,15 +1,16 @@
-from .interfaces import CacheableDict
+from .interfaces import CacheableDict, StorageBackend
 
 class Notebook(CacheableDict):
     """
     A notebook for storing and managing notes with automatic persistence.
     
     This class extends CacheableDict to provide a specialized storage container
-    for notes. Notes are automatically persisted to 'notes_state.pkl' file.
+    for notes. Notes are automatically persisted to 'notes_state.pkl' file,
+    or through the given storage backend.
     """
     
-    def __init__(self):
-        CacheableDict.__init__(self, "notes_state.pkl")
+    def __init__(self, storage: StorageBackend = None):
+        CacheableDict.__init__(self, "notes_state.pkl", storage)
 
     def __setitem__(self, key, value):
         if not isinstance(value, str):
@@ -0,0 +1,218 @@
+import pickle
+import sqlite3
+import weakref
+from datetime import date
+from collections.abc import MutableMapping
+from .address_book_entities import AddressBookRecord, Phone
+
+class SqliteAddressBook(MutableMapping):
+    """
+    An address book stored in an SQLite database instead of a pickle file.
+
+    This class is a drop-in replacement for AddressBook that keeps only the records
+    in use in memory. Each record is pickled into its own row, and the phone numbers,
+    email and birthday month/day are stored in indexed columns, so lookups by name,
+    phone, email or birthday are index seeks rather than full scans. Opening the
+    book does not read any records; they are loaded lazily on access.
+
+    Records returned by get/[] are cached for as long as they are in use, so
+    scanning the book does not keep it in memory. In-place changes must be
+    reported with mark_dirty() (AddressBookManager does this for add_phone,
+    add_birthday, ...); flush() and close() write back only those records. The
+    book is closed by close(), when it is garbage collected, or at the latest
+    when the interpreter exits, before modules are torn down.
+
+    Attributes:
+        filename (str): The SQLite database file
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (
+            name TEXT PRIMARY KEY,
+            email TEXT,
+            birthday_year INTEGER,
+            birthday_month INTEGER,
+            birthday_day INTEGER,
+            record BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS phones (
+            phone TEXT NOT NULL,
+            name TEXT NOT NULL REFERENCES contacts(name) ON DELETE CASCADE,
+            PRIMARY KEY (phone, name)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_phones_name ON phones(name);
+        CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);
+        CREATE INDEX IF NOT EXISTS idx_contacts_birthday ON contacts(birthday_month, birthday_day);
+    """
+
+    def __init__(self, filename: str = "addressbook_state.sqlite3"):
+        self.filename = filename
+        # Thread-safe managers and the server use the book from worker threads
+        self.__connection = sqlite3.connect(filename, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute("PRAGMA foreign_keys=ON")
+        self.__connection.executescript(self.SCHEMA)
+        # Loaded records, the same object for as long as anyone (or the dirty records) holds it
+        self.__loaded = weakref.WeakValueDictionary()
+        # Records reported with mark_dirty(), kept until they are written back
+        self.__dirty = {}
+        # Unlike __del__, a finalizer also runs at interpreter exit, while modules are still usable
+        self.__finalizer = weakref.finalize(self, _close, self.__connection, self.__dirty)
+
+    def __getitem__(self, name) -> AddressBookRecord:
+        record = self.__loaded.get(name)
+        if record is not None:
+            return record
+        row = self.__connection.execute("SELECT record FROM contacts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return self.__loaded.setdefault(name, pickle.loads(row[0]))
+
+    def __setitem__(self, name, record: AddressBookRecord):
+        if not isinstance(record, AddressBookRecord):
+            raise TypeError("Item must be an instance of Record")
+        with self.__connection:
+            _write(self.__connection, name, record)
+        self.__loaded[name] = record
+        self.__dirty.pop(name, None)
+
+    def update(self, records=(), **kwargs):
+        """Writes many records in a single transaction without caching them."""
+        records = dict(records, **kwargs)
+        for record in records.values():
+            if not isinstance(record, AddressBookRecord):
+                raise TypeError("Item must be an instance of Record")
+        with self.__connection:
+            for name, record in records.items():
+                _write(self.__connection, name, record)
+        for name, record in records.items():
+            self.__dirty.pop(name, None)
+            if name in self.__loaded:
+                self.__loaded[name] = record
+
+    def __delitem__(self, name):
+        with self.__connection:
+            deleted = self.__connection.execute("DELETE FROM contacts WHERE name = ?", (name,)).rowcount
+        self.__loaded.pop(name, None)
+        self.__dirty.pop(name, None)
+        if not deleted:
+            raise KeyError(name)
+
+    def __contains__(self, name) -> bool:
+        if name in self.__loaded:
+            return True
+        return self.__connection.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone() is not None
+
+    def __iter__(self):
+        for (name,) in self.__connection.execute("SELECT name FROM contacts ORDER BY name"):
+            yield name
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def values(self):
+        """
+        Iterates over all records without caching them.
+
+        Records that are in use are returned as is, so pending in-place changes
+        are visible; the rest are unpickled on the fly.
+        """
+        for name, blob in self.__connection.execute("SELECT name, record FROM contacts ORDER BY name"):
+            record = self.__loaded.get(name)
+            yield record if record is not None else pickle.loads(blob)
+
+    def clear(self):
+        with self.__connection:
+            self.__connection.execute("DELETE FROM contacts")
+        self.__loaded.clear()
+        self.__dirty.clear()
+
+    def find_by_phone(self, phone) -> list[AddressBookRecord]:
+        rows = self.__connection.execute("SELECT name FROM phones WHERE phone = ? ORDER BY name",
+                                     (Phone.normalize(phone),))
+        return [self[name] for (name,) in rows.fetchall()]
+
+    def find_by_email(self, email) -> list[AddressBookRecord]:
+        rows = self.__connection.execute("SELECT name FROM contacts WHERE email = ? ORDER BY name", (str(email),))
+        return [self[name] for (name,) in rows.fetchall()]
+
+    def find_by_birthday(self, month: int, day: int) -> list[AddressBookRecord]:
+        rows = self.__connection.execute(
+            "SELECT name FROM contacts WHERE birthday_month = ? AND birthday_day = ? ORDER BY name", (month, day))
+        return [self[name] for (name,) in rows.fetchall()]
+
+    def iter_birthdays(self):
+        """Yields (name, birth date) for every contact that has a birthday, loading only records changed since the last flush."""
+        dirty = dict(self.__dirty)
+        rows = self.__connection.execute(
+            "SELECT name, birthday_year, birthday_month, birthday_day FROM contacts WHERE birthday_month IS NOT NULL")
+        for name, year, month, day in rows:
+            if name not in dirty:
+                yield name, date(year, month, day)
+        for name, record in dirty.items():
+            if record.birthday:
+                yield name, record.birthday.value
+
+    def iter_phones(self):
+        """Yields (name, normalized phone) for every phone of every contact, loading only records changed since the last flush."""
+        dirty = dict(self.__dirty)
+        for name, phone in self.__connection.execute("SELECT name, phone FROM phones"):
+            if name not in dirty:
+                yield name, phone
+        for name, record in dirty.items():
+            for phone in record.phones:
+                yield name, Phone.normalize(phone)
+
+    def mark_dirty(self, name):
+        """Reports that a cached record was changed in place."""
+        record = self.__loaded.get(name)
+        if record is not None:
+            self.__dirty[name] = record
+
+    def flush(self):
+        """Writes the records reported with mark_dirty() back to the database."""
+        _flush(self.__connection, self.__dirty)
+
+    def checkpoint(self):
+        """Writes the reported changes right away, as they are only the changed rows; returns None."""
+        self.flush()
+        return None
+
+    def close(self):
+        """Writes back the reported changes and closes the database; closing more than once has no effect."""
+        self.__finalizer()
+        self.__loaded.clear()
+
+    def __str__(self):
+        return "\n".join(str(record) for record in self.values())
+
+
+def _write(connection: sqlite3.Connection, name, record: AddressBookRecord):
+    birthday = record.birthday.value if record.birthday else None
+    connection.execute(
+        "INSERT INTO contacts (name, email, birthday_year, birthday_month, birthday_day, record) "
+        "VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET email = excluded.email, birthday_year = excluded.birthday_year, "
+        "birthday_month = excluded.birthday_month, birthday_day = excluded.birthday_day, record = excluded.record",
+        (name,
+         str(record.email) if record.email else None,
+         birthday.year if birthday else None,
+         birthday.month if birthday else None,
+         birthday.day if birthday else None,
+         pickle.dumps(record)))
+    connection.execute("DELETE FROM phones WHERE name = ?", (name,))
+    connection.executemany(
+        "INSERT OR IGNORE INTO phones (phone, name) VALUES (?, ?)",
+        ((Phone.normalize(phone), name) for phone in record.phones))
+
+def _flush(connection: sqlite3.Connection, dirty: dict):
+    with connection:
+        for name, record in dirty.items():
+            _write(connection, name, record)
+    dirty.clear()
+
+def _close(connection: sqlite3.Connection, dirty: dict):
+    """Finalizer of a SqliteAddressBook; it must not hold the book itself."""
+    _flush(connection, dirty)
+    connection.close()
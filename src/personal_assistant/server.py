@@ -0,0 +1,141 @@
+import asyncio
+from contextlib import suppress
+from itertools import islice
+from .commands_handler import CommandsHandler
+from .input_parser import parse_input
+from .managers import AddressBookManager, NotesManager
+
+
+class AssistantServer:
+    """
+    Serves the bot to many concurrent sessions over TCP or a Unix socket.
+
+    Every connection is a session with its own CommandsHandler, and all sessions
+    share one AddressBookManager and one NotesManager. Commands that touch data
+    run in worker threads, so a long import does not stall the other sessions.
+    The managers must be thread safe: their read/write locks let lookups and
+    listings of many sessions run in parallel while changes run one at a time,
+    and contact commands never wait for note commands.
+
+    Protocol: the client sends one command per line, in the same format as the
+    interactive prompt. The server answers with the response lines, prefixing
+    error responses with 'Error: ', and ends every response with a line holding
+    a single '.'. Response lines that start with '.' get another '.' prepended,
+    so they cannot be mistaken for the end of the response. 'exit' ends the
+    session; the data is saved when the server is closed.
+
+    Streamed responses, such as 'all', are sent CHUNK_LINES lines at a time: a
+    worker thread reads and encodes a chunk and the session waits for the
+    client to take it before the next one is read, so a listing of the whole
+    book never sits in memory.
+
+    Attributes:
+        address_book_manager (AddressBookManager): Contacts shared by all sessions
+        notes_manager (NotesManager): Notes shared by all sessions
+        sessions (int): Number of currently connected sessions
+    """
+
+    TERMINATOR = "."
+    CHUNK_LINES = 1000
+
+    def __init__(self, address_book_manager: AddressBookManager = None, notes_manager: NotesManager = None):
+        self.address_book_manager = address_book_manager or AddressBookManager(thread_safe=True)
+        self.notes_manager = notes_manager or NotesManager(thread_safe=True)
+        if not (self.address_book_manager.thread_safe and self.notes_manager.thread_safe):
+            raise ValueError("The server needs managers created with thread_safe=True")
+        self.sessions = 0
+        self.__server = None
+
+    async def start(self, address: str) -> asyncio.Server:
+        """
+        Starts accepting sessions and returns the listening asyncio.Server.
+
+        Args:
+            address (str): 'HOST:PORT' for TCP or 'unix:PATH' for a Unix socket
+        """
+        if address.startswith("unix:"):
+            self.__server = await asyncio.start_unix_server(self.handle_session, address[len("unix:"):])
+        else:
+            host, _, port = address.rpartition(":")
+            self.__server = await asyncio.start_server(self.handle_session, host or None, int(port))
+        return self.__server
+
+    async def serve_forever(self, address: str):
+        """Serves sessions until cancelled, then saves the data."""
+        server = await self.start(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    async def handle_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        commands_handler = CommandsHandler(self.address_book_manager, self.notes_manager)
+        self.sessions += 1
+        try:
+            while line := await reader.readline():
+                response = await self.execute(commands_handler, line.decode("utf-8", errors="replace"))
+                await self.__send(writer, response)
+                if response.should_exit:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def execute(self, commands_handler: CommandsHandler, line: str) -> CommandsHandler.Response:
+        """Runs one line of input, in a worker thread if the command works on a store."""
+        try:
+            cmd, args = parse_input(line)
+        except ValueError as e:
+            return CommandsHandler.Response(f"Parse error: {e}", is_error=True)
+        if not cmd:
+            return CommandsHandler.Response("Please enter a command.", is_error=True)
+
+        store = commands_handler.store_of(cmd)
+        if store is None:
+            return commands_handler.execute_command(cmd, args)
+        return await asyncio.to_thread(commands_handler.execute_command, cmd, args)
+
+    async def __send(self, writer: asyncio.StreamWriter, response: CommandsHandler.Response):
+        lines = iter(response.lines())
+        prefix = "Error: " if response.is_error else ""
+        streamed = isinstance(response, CommandsHandler.StreamResponse)
+        sent = False
+        while True:
+            if streamed:
+                # Streamed responses read the store while they are iterated, which the managers lock in chunks
+                chunk = await asyncio.to_thread(self.__encode_chunk, lines, prefix)
+            else:
+                chunk = self.__encode_chunk(lines, prefix)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+            prefix = ""
+            sent = True
+        if not sent:
+            # An empty response is still one (empty) line
+            writer.write(f"{prefix}\n".encode("utf-8"))
+        writer.write(f"{self.TERMINATOR}\n".encode("utf-8"))
+        await writer.drain()
+
+    def __encode_chunk(self, lines, prefix: str) -> bytes:
+        """Encodes the next CHUNK_LINES lines, the first one prefixed with prefix; returns b"" once lines run out."""
+        encoded = []
+        for line in islice(lines, self.CHUNK_LINES):
+            if prefix:
+                line, prefix = prefix + line, ""
+            encoded.append(f".{line}" if line.startswith(self.TERMINATOR) else line)
+        return ("\n".join(encoded) + "\n").encode("utf-8") if encoded else b""
+
+    def close(self):
+        """Stops accepting sessions and saves contacts and notes."""
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+        self.address_book_manager.close()
+        self.notes_manager.close()
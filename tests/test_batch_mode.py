@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+from unittest.mock import Mock, patch
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from main import run_batch, main, create_commands_handler, create_storage, parse_arguments
+from personal_assistant.models import AddressBookRecord
+from personal_assistant import CommandsHandler
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.handler = Mock()
+        self.handler.execute_command.side_effect = self.execute_command
+        self.output = io.StringIO()
+
+    @staticmethod
+    def execute_command(cmd, args):
+        if cmd == "fail":
+            return CommandsHandler.Response("Boom", is_error=True)
+        if cmd == "exit":
+            return CommandsHandler.Response("Goodbye!", should_exit=True)
+        return CommandsHandler.Response(" ".join([cmd] + args))
+
+    def test_executes_all_commands(self):
+        executed, failed = run_batch(self.handler, ["hello", "add-phone John 123", "fail"], self.output)
+        self.assertEqual((executed, failed), (3, 1))
+        self.assertEqual(self.output.getvalue(), "hello\nadd-phone John 123\nLine 3: Error: Boom\n")
+
+    def test_skips_blank_lines_and_comments(self):
+        executed, _ = run_batch(self.handler, ["", "# comment", "  hello  "], self.output)
+        self.assertEqual(executed, 1)
+        self.handler.execute_command.assert_called_once_with("hello", [])
+
+    def test_errors_only(self):
+        run_batch(self.handler, ["hello", "fail"], self.output, errors_only=True)
+        self.assertEqual(self.output.getvalue(), "Line 2: Error: Boom\n")
+
+    def test_parse_errors_are_reported(self):
+        executed, failed = run_batch(self.handler, ['add-note "unclosed'], self.output)
+        self.assertEqual((executed, failed), (1, 1))
+        self.assertIn("Line 1: Error: Parse error", self.output.getvalue())
+
+    def test_stops_on_exit(self):
+        executed, _ = run_batch(self.handler, ["hello", "exit", "hello"], self.output)
+        self.assertEqual(executed, 2)
+
+    def test_output_is_buffered(self):
+        output = Mock()
+        run_batch(self.handler, ["hello"] * 5, output, buffer_size=2)
+        self.assertEqual(output.write.call_count, 3)
+
+class TestCreateStorage(unittest.TestCase):
+    def test_backends_convert_records(self):
+        for storage in ("file", "journal", "sharded"):
+            with self.subTest(storage=storage):
+                backend = create_storage(parse_arguments(["--storage", storage]), "addressbook_state", AddressBookRecord)
+                self.assertIs(backend.value_type, AddressBookRecord)
+
+class TestCreateCommandsHandler(unittest.TestCase):
+    def test_checkpointing_is_opt_in(self):
+        self.assertEqual(parse_arguments([]).autosave, 0)
+        commands_handler = create_commands_handler(parse_arguments([]))
+        self.assertFalse(commands_handler.address_book_manager.thread_safe)
+        self.assertFalse(commands_handler.notes_manager.thread_safe)
+        commands_handler.close()
+
+    def test_batch_mode_never_checkpoints(self):
+        arguments = parse_arguments(["--batch", "-", "--autosave", "60"])
+        commands_handler = create_commands_handler(arguments)
+        self.assertTrue(commands_handler.address_book_manager.thread_safe)
+        commands_handler.close()
+        commands_handler = create_commands_handler(arguments, checkpoint=False)
+        self.assertFalse(commands_handler.address_book_manager.thread_safe)
+        self.assertFalse(commands_handler.notes_manager.thread_safe)
+        commands_handler.close()
+
+class TestProfile(unittest.TestCase):
+    def test_profile_is_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.__run_profiled(directory)
+
+    def __run_profiled(self, directory):
+        commands = os.path.join(directory, "commands.txt")
+        profile = os.path.join(directory, "session.prof")
+        with open(commands, "w", encoding="utf-8") as f:
+            f.write("hello\nstats\n")
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            with patch("sys.stdout", io.StringIO()) as output, patch("sys.stderr", io.StringIO()) as errors:
+                self.assertEqual(main(["--batch", commands, "--profile", profile]), 0)
+        finally:
+            os.chdir(cwd)
+        self.assertIn("command.hello: count 1", output.getvalue())
+        self.assertIn(f"Profile saved to {profile}.", errors.getvalue())
+        self.assertIn("cumulative", errors.getvalue())
+        self.assertGreater(os.path.getsize(profile), 0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -1,13 +1,17 @@
 import unittest
 import sys
 import os
+from datetime import date
 from unittest.mock import Mock, patch, MagicMock
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from personal_assistant.commands_handler import CommandsHandler
-from personal_assistant.models import Phone, Birthday
+from personal_assistant.commands_palette import COMMANDS
+from personal_assistant.instrumentation import METRICS
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import Phone, Birthday, SqliteAddressBook
 
 
 class TestCommandsHandler(unittest.TestCase):
@@ -130,6 +134,27 @@ class TestCommandsHandler(unittest.TestCase):
             self.assertFalse(response.is_error)
             self.assertEqual(response.message, "No upcoming birthdays in 7 days.")
 
+    def test_birthday_stats(self):
+        """Test birthday-stats command."""
+        stats = [(date(2024, 1, 1), 2), (date(2024, 1, 8), 0)]
+        with patch.object(self.handler.address_book_manager, 'get_birthday_stats', return_value=stats) as mock_stats:
+            response = self.handler.execute_command("birthday-stats", ["2"])
+
+            self.assertFalse(response.is_error)
+            mock_stats.assert_called_once_with(2)
+            self.assertEqual(response.message, "Birthdays per week:\n\tWeek of 2024-01-01: 2\n\tWeek of 2024-01-08: 0")
+
+    def test_turning(self):
+        """Test turning command with and without results."""
+        birthdays = [{"name": "John", "next_date": date(2024, 1, 3), "years_reached": 30}]
+        with patch.object(self.handler.address_book_manager, 'get_turning', return_value=birthdays):
+            response = self.handler.execute_command("turning", ["30"])
+            self.assertFalse(response.is_error)
+            self.assertEqual(response.message, "Turning 30:\n\tJohn - 2024-01-03")
+        with patch.object(self.handler.address_book_manager, 'get_turning', return_value=[]):
+            response = self.handler.execute_command("turning", ["30", "10"])
+            self.assertEqual(response.message, "Nobody turns 30 in 10 days.")
+
     def test_search_contact_found(self):
         """Test search command when contact is found."""
         mock_contact = Mock()
@@ -148,6 +173,58 @@ class TestCommandsHandler(unittest.TestCase):
             self.assertTrue(response.is_error)
             self.assertIn("Contact with name 'NonExistent' not found", response.message)
 
+    def test_search_contact_by_prefix(self):
+        """Test search command with a prefix query."""
+        mock_contact = Mock()
+        mock_contact.__str__ = Mock(return_value="John: phone1")
+        with patch.object(self.handler.address_book_manager, 'find_by_prefix', return_value=[mock_contact]) as mock_find:
+            response = self.handler.execute_command("search", ["Jo*"])
+
+            self.assertFalse(response.is_error)
+            self.assertEqual(response.message, "John: phone1")
+            mock_find.assert_called_once_with("Jo", CommandsHandler.SEARCH_RESULTS_LIMIT)
+
+    def test_search_contact_similar(self):
+        """Test search command with a fuzzy query."""
+        with patch.object(self.handler.address_book_manager, 'find_similar', return_value=[]) as mock_find:
+            response = self.handler.execute_command("search", ["~Jhon"])
+
+            self.assertTrue(response.is_error)
+            self.assertIn("No contact with name similar to 'Jhon' found", response.message)
+            mock_find.assert_called_once_with("Jhon", CommandsHandler.SEARCH_RESULTS_LIMIT)
+
+    def test_search_similar_finds_transposed_letters(self):
+        """Test the documented 'search ~Jhon' example on a real address book."""
+        manager = AddressBookManager(SqliteAddressBook(":memory:"))
+        manager.add_record("John")
+        manager.add_record("Jane Smith")
+        handler = CommandsHandler(manager, Mock())
+
+        response = handler.execute_command("search", ["~Jhon"])
+
+        self.assertFalse(response.is_error)
+        self.assertEqual(response.message, "Name: John")
+        manager.close()
+
+    def test_search_phone_found(self):
+        """Test search-phone command when contacts own the number."""
+        mock_contact = Mock()
+        mock_contact.__str__ = Mock(return_value="John: 1234567890")
+        with patch.object(self.handler.address_book_manager, 'find_by_phone', return_value=[mock_contact]) as mock_find:
+            response = self.handler.execute_command("search-phone", ["1234567890"])
+
+            self.assertFalse(response.is_error)
+            self.assertEqual(response.message, "John: 1234567890")
+            mock_find.assert_called_once_with("1234567890")
+
+    def test_search_phone_not_found(self):
+        """Test search-phone command when no contact owns the number."""
+        with patch.object(self.handler.address_book_manager, 'find_by_phone', return_value=[]):
+            response = self.handler.execute_command("search-phone", ["1234567890"])
+
+            self.assertTrue(response.is_error)
+            self.assertIn("No contact with phone '1234567890' found", response.message)
+
     def test_delete_contact_via_execute_command(self):
         """Test delete command via execute_command."""
         with patch.object(self.handler.address_book_manager, 'delete') as mock_delete:
@@ -157,6 +234,24 @@ class TestCommandsHandler(unittest.TestCase):
             self.assertEqual(response.message, "Contact 'John' deleted.")
             mock_delete.assert_called_once_with("John")
 
+    def test_import_contacts_reports_errors(self):
+        """Test import-contacts command lists failed rows."""
+        result = {"imported": 5, "failed": 3, "errors": [(2, "Invalid date format. Use DD.MM.YYYY")]}
+        with patch.object(self.handler.address_book_manager, 'import_contacts', return_value=result):
+            response = self.handler.execute_command("import-contacts", ["contacts.csv"])
+
+            self.assertFalse(response.is_error)
+            self.assertEqual(response.message,
+                             "Imported 5 contacts from contacts.csv. 3 rows failed:"
+                             "\n\tLine 2: Invalid date format. Use DD.MM.YYYY\n\t... and 2 more.")
+
+    def test_export_contacts(self):
+        """Test export-contacts command."""
+        with patch.object(self.handler.address_book_manager, 'export_contacts', return_value=2):
+            response = self.handler.execute_command("export-contacts", ["contacts.jsonl"])
+
+            self.assertEqual(response.message, "Exported 2 contacts to contacts.jsonl.")
+
     def test_add_note_via_execute_command(self):
         """Test add-note command via execute_command."""
         with patch.object(self.handler.notes_manager, 'add_note') as mock_add_note:
@@ -208,6 +303,23 @@ class TestCommandsHandler(unittest.TestCase):
             self.assertTrue(response.is_error)
             self.assertIn("Note with title 'NonExistent' not found", response.message)
 
+    def test_find_notes(self):
+        """Test find-notes command lists ranked matches."""
+        with patch.object(self.handler.notes_manager, 'search', return_value=["Shopping"]), \
+             patch.object(self.handler.notes_manager, 'find', return_value="Buy milk"):
+            response = self.handler.execute_command("find-notes", ["milk"])
+
+            self.assertFalse(response.is_error)
+            self.assertEqual(response.message, "Shopping: Buy milk")
+
+    def test_find_notes_no_results(self):
+        """Test find-notes command without matches."""
+        with patch.object(self.handler.notes_manager, 'search', return_value=[]):
+            response = self.handler.execute_command("find-notes", ["milk"])
+
+            self.assertTrue(response.is_error)
+            self.assertIn("No notes matching 'milk' found", response.message)
+
     def test_show_all_contacts_via_execute_command(self):
         """Test all command via execute_command."""
         mock_manager = Mock()
@@ -228,6 +340,99 @@ class TestCommandsHandler(unittest.TestCase):
             self.assertFalse(response.is_error)
             self.assertEqual(response.message, "All notes: Note1, Note2")
 
+    def test_show_all_contacts_streams_a_page(self):
+        """Test all command returns a lazily produced page of contacts."""
+        with patch.object(self.handler.address_book_manager, 'iter_rendered',
+                          return_value=iter(["John", "Jane"])) as mock_iter:
+            response = self.handler.execute_command("all", ["10", "2"])
+
+            self.assertIsInstance(response, CommandsHandler.StreamResponse)
+            self.assertFalse(response.is_error)
+            self.assertEqual(list(response.lines()), ["John", "Jane"])
+            mock_iter.assert_called_once_with(10, 2)
+
+    def test_negative_page_is_rejected(self):
+        """Test all and all-notes report a negative offset or limit as a value error."""
+        for cmd, args in (("all", ["-1"]), ("all", ["0", "-5"]), ("all-notes", ["0", "-3"])):
+            with self.subTest(cmd=cmd, args=args):
+                response = self.handler.execute_command(cmd, args)
+                self.assertTrue(response.is_error)
+                self.assertEqual(response.message, "Value error: Offset and limit must not be negative.")
+
+    def test_show_all_notes_streams(self):
+        """Test all-notes command without paging arguments."""
+        with patch.object(self.handler.notes_manager, 'iter_notes', return_value=iter(["a: 1"])) as mock_iter:
+            response = self.handler.execute_command("all-notes", [])
+
+            self.assertEqual(response.message, "a: 1")
+            mock_iter.assert_called_once_with(0, None)
+
+    def test_execute_command_too_many_optional_args(self):
+        """Test argument range check for commands with optional arguments."""
+        response = self.handler.execute_command("all", ["1", "2", "3"])
+
+        self.assertTrue(response.is_error)
+        self.assertIn("Expected 0 to 2 arguments, got 3", response.message)
+
+    def test_execute_command_varargs(self):
+        """Test that varargs handlers accept any number of extra arguments."""
+        with patch.object(self.handler.address_book_manager, 'add_address') as mock_add_address:
+            response = self.handler.execute_command("add-address", ["John", "123", "Main", "St"])
+
+            self.assertFalse(response.is_error)
+            self.assertEqual(str(mock_add_address.call_args[0][1]), "123 Main St")
+
+        response = self.handler.execute_command("add-address", [])
+        self.assertTrue(response.is_error)
+        self.assertIn("Expected at least 1 arguments, got 0", response.message)
+
+    @patch('personal_assistant.commands_handler.get_help_message', return_value="Help for search command")
+    def test_help_message_is_cached(self, mock_help):
+        """Test that the help shown on argument errors is rendered once per command."""
+        for _ in range(3):
+            response = self.handler.execute_command("search", [])
+            self.assertIn("Help for search command", response.message)
+        mock_help.assert_called_once_with("search")
+
+    def test_handlers_do_not_share_managers(self):
+        """Test that each handler dispatches to its own managers."""
+        first_manager, second_manager = Mock(), Mock()
+        first_manager.find.return_value = "First John"
+        second_manager.find.return_value = "Second John"
+        first = CommandsHandler(first_manager, Mock())
+        second = CommandsHandler(second_manager, Mock())
+
+        self.assertEqual(first.execute_command("search", ["John"]).message, "First John")
+        self.assertEqual(second.execute_command("search", ["John"]).message, "Second John")
+
+    def test_command_metadata_is_immutable(self):
+        """Test that the shared command registry cannot be changed."""
+        with self.assertRaises(TypeError):
+            COMMANDS["hello"] = None
+        with self.assertRaises(AttributeError):
+            self.handler.commands["hello"].desc = "Changed"
+
+    def test_commands_are_timed(self):
+        """Test that every executed command is recorded in the latency histograms."""
+        METRICS.reset()
+        self.handler.execute_command("hello", [])
+        self.handler.execute_command("hi", [])
+        self.handler.execute_command("search", ["Nobody"])
+        self.handler.execute_command("no-such-command", [])
+        self.assertEqual(METRICS.histogram("command.hello").count, 2)
+        self.assertEqual(METRICS.histogram("command.search").count, 1)
+        self.assertEqual(METRICS.counter("command.errors"), 1)
+        self.assertEqual(METRICS.counter("command.unknown"), 1)
+
+    def test_stats(self):
+        """Test stats command reports the collected metrics."""
+        METRICS.reset()
+        self.assertEqual(self.handler.execute_command("stats", []).message, "No statistics collected yet.")
+        self.handler.execute_command("hello", [])
+        response = self.handler.execute_command("stats", [])
+        self.assertFalse(response.is_error)
+        self.assertTrue(response.message.startswith("Statistics:\n\tcommand.hello: count 1, mean"))
+
     def test_execute_command_unknown(self):
         """Test execute_command with unknown command."""
         response = self.handler.execute_command("unknown-command", [])
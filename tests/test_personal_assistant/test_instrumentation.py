@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from personal_assistant.instrumentation import LatencyHistogram, Metrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def setUp(self):
+        self.histogram = LatencyHistogram()
+
+    def test_empty(self):
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(self.histogram.percentile(99), 0.0)
+        self.assertIn("count 0", str(self.histogram))
+
+    def test_percentiles_are_bucket_upper_bounds(self):
+        for _ in range(98):
+            self.histogram.record(0.000_100)
+        self.histogram.record(0.010)
+        self.histogram.record(0.020)
+        self.assertEqual(self.histogram.count, 100)
+        self.assertAlmostEqual(self.histogram.total, 0.0398)
+        self.assertEqual(self.histogram.max, 0.020)
+        # 100 microseconds fall in the bucket up to 128
+        self.assertEqual(self.histogram.percentile(50), 0.000_128)
+        self.assertAlmostEqual(self.histogram.percentile(99), 0.016_384)
+        self.assertEqual(self.histogram.percentile(100), 0.020)
+
+    def test_very_long_durations_go_to_the_last_bucket(self):
+        self.histogram.record(1_000_000.0)
+        self.assertEqual(self.histogram.buckets[-1], 1)
+        self.assertEqual(self.histogram.percentile(50), 1_000_000.0)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_counters(self):
+        self.metrics.increment("cache.hit")
+        self.metrics.increment("cache.hit", 2)
+        self.assertEqual(self.metrics.counter("cache.hit"), 3)
+        self.assertEqual(self.metrics.counter("cache.miss"), 0)
+
+    def test_timer_records_also_on_error(self):
+        with self.metrics.timer("work"):
+            pass
+        with self.assertRaises(ValueError):
+            with self.metrics.timer("work"):
+                raise ValueError("boom")
+        self.assertEqual(self.metrics.histogram("work").count, 2)
+        self.assertIsNone(self.metrics.histogram("other"))
+
+    def test_report_and_reset(self):
+        self.metrics.increment("b.counter")
+        self.metrics.observe("z.latency", 0.001)
+        self.metrics.observe("a.latency", 0.002)
+        report = self.metrics.report()
+        self.assertEqual([line.split(":")[0] for line in report], ["a.latency", "z.latency", "b.counter"])
+        self.assertEqual(report[2], "b.counter: 1")
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.report(), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,14 +1,19 @@
 import unittest
 import sys
 import os
+import json
+import shutil
+import tempfile
 from datetime import date
 from unittest.mock import patch
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
 
+from personal_assistant.instrumentation import METRICS
 from personal_assistant.managers import AddressBookManager
-from personal_assistant.models import Phone, Birthday, HomeAddress
+from personal_assistant.models import (Phone, Birthday, HomeAddress, SqliteAddressBook, AddressBookRecord,
+                                      AddressBook, ShardedStorage)
 
 
 class TestAddressBookManager(unittest.TestCase):
@@ -88,6 +93,137 @@ class TestAddressBookManager(unittest.TestCase):
             self.manager.remove_phone("John Doe", Phone("9876543210"))
         self.assertIn('Phone number 9876543210 does not exist for contact John Doe.', str(context.exception))
 
+    def test_iter_records_pages(self):
+        """Test iterating records with offset and limit."""
+        for name in ["A", "B", "C"]:
+            self.manager.add_record(name)
+        names = [record.name for record in self.manager.iter_records()]
+        self.assertEqual(len(names), 4)
+        self.assertEqual([record.name for record in self.manager.iter_records(1, 2)], names[1:3])
+        self.assertEqual(list(self.manager.iter_records(10)), [])
+
+    def test_iter_rendered_caches_pages_until_a_change(self):
+        """Test that rendered pages are reused until the address book changes."""
+        for name in ["A", "B", "C"]:
+            self.manager.add_record(name)
+        names = [record.name for record in self.manager.iter_records()]
+        page = list(self.manager.iter_rendered(1, 2))
+        self.assertEqual(page, [f"Name: {name}" for name in names[1:3]])
+        self.assertEqual(list(self.manager.iter_rendered()), [f"Name: {name}" for name in names])
+
+        with patch.object(AddressBookRecord, "__str__", side_effect=AssertionError("rendered again")):
+            self.assertEqual(list(self.manager.iter_rendered(1, 2)), page)
+
+        self.manager.add_phone(names[1], Phone("1234567890"))
+        self.assertEqual(list(self.manager.iter_rendered(1, 2))[0], f"Name: {names[1]}, Phones: [1234567890]")
+        self.manager.delete(names[2])
+        self.assertEqual(len(list(self.manager.iter_rendered(0, 10))), 3)
+
+    def test_page_cache_and_index_hits_are_counted(self):
+        """Test that page cache and index lookups are counted in METRICS."""
+        METRICS.reset()
+        list(self.manager.iter_rendered(0, 1))
+        list(self.manager.iter_rendered(0, 1))
+        self.manager.find_by_prefix("John")
+        self.manager.find_by_phone("0000000000")
+        self.assertEqual(METRICS.counter("cache.pages.miss"), 1)
+        self.assertEqual(METRICS.counter("cache.pages.hit"), 1)
+        self.assertEqual(METRICS.counter("index.name.hit"), 1)
+        self.assertEqual(METRICS.counter("index.phone.miss"), 1)
+        self.assertEqual(METRICS.histogram("index.phone.build").count, 1)
+
+    def test_page_cache_is_bounded(self):
+        """Test that only the most recently used pages are kept."""
+        self.manager.PAGE_CACHE_SIZE = 2
+        for offset in range(3):
+            list(self.manager.iter_rendered(offset, 1))
+        self.assertEqual(list(self.manager._AddressBookManager__pages), [(1, 1), (2, 1)])
+
+    def test_find_by_prefix_and_similar(self):
+        """Test name search follows added and deleted records."""
+        johnny_record = self.manager.add_record("Johnny Bravo")
+        self.assertEqual(self.manager.find_by_prefix("joh"), [self.john_record, johnny_record])
+        self.assertEqual(self.manager.find_similar("Jon Doe", limit=1), [self.john_record])
+
+        self.manager.delete("John Doe")
+        self.assertEqual(self.manager.find_by_prefix("joh"), [johnny_record])
+
+    def test_find_by_phone(self):
+        """Test reverse phone lookups follow added, removed and deleted phones."""
+        jane_record = self.manager.add_record("Jane Smith")
+        self.manager.add_phone("John Doe", Phone("1234567890"))
+        self.manager.add_phone("Jane Smith", Phone("123-456-7890"))
+        self.assertEqual(self.manager.find_by_phone("(123) 456 7890"), [jane_record, self.john_record])
+
+        self.manager.remove_phone("John Doe", Phone("123 456 7890"))
+        self.assertEqual(self.manager.find_by_phone("1234567890"), [jane_record])
+
+        self.manager.delete("Jane Smith")
+        self.assertEqual(self.manager.find_by_phone("1234567890"), [])
+
+    def test_import_contacts_csv(self):
+        """Test importing contacts from CSV with invalid rows and merging."""
+        self.manager.add_phone("John Doe", Phone("1111111111"))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "contacts.csv")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write("name,phones,birthday,address,email\n"
+                        "John Doe,1111111111;2222222222,03.01.1990,,john@example.com\n"
+                        "Jane Smith,3333333333,not a date,,\n"
+                        ",4444444444,,,\n"
+                        "Bob Wilson,,,1 Main St,\n")
+            result = self.manager.import_contacts(filename, chunk_size=1)
+
+        self.assertEqual(result["imported"], 2)
+        self.assertEqual(result["failed"], 2)
+        self.assertEqual([line for line, _ in result["errors"]], [3, 4])
+        self.assertEqual(str(self.manager.find("John Doe")),
+                         "Name: John Doe, Phones: [1111111111, 2222222222], Birthday: 03.01.1990, "
+                         "Email: john@example.com")
+        self.assertEqual(str(self.manager.find("Bob Wilson")), "Name: Bob Wilson, Address: 1 Main St")
+        self.assertIsNone(self.manager.find("Jane Smith"))
+        self.assertEqual(self.manager.find_by_phone("2222222222"), [self.manager.find("John Doe")])
+        self.assertEqual(self.manager.find_by_prefix("bob"), [self.manager.find("Bob Wilson")])
+
+    def test_export_and_import_jsonl(self):
+        """Test a JSONL export can be imported back."""
+        self.manager.add_phone("John Doe", Phone("1234567890"))
+        self.manager.add_birthday("John Doe", Birthday("03.01.1990"))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "contacts.jsonl")
+            self.assertEqual(self.manager.export_contacts(filename), 1)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.loads(f.readline())["phones"], ["1234567890"])
+
+            self.manager.delete("John Doe")
+            result = self.manager.import_contacts(filename)
+
+        self.assertEqual(result, {"imported": 1, "failed": 0, "errors": []})
+        self.assertEqual(str(self.manager.find("John Doe")),
+                         "Name: John Doe, Phones: [1234567890], Birthday: 03.01.1990")
+
+    def test_import_contacts_in_worker_processes(self):
+        """Test a parallel import gives the same result as a sequential one, in file order."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "contacts.jsonl")
+            with open(filename, "w", encoding="utf-8") as f:
+                for i in range(50):
+                    f.write(json.dumps({"name": f"Contact {i % 40}", "phones": [f"{i:010d}"]}) + "\n")
+                f.write("{broken\n")
+            result = self.manager.import_contacts(filename, chunk_size=7, workers=2)
+
+        self.assertEqual(result["imported"], 50)
+        self.assertEqual(result["failed"], 1)
+        self.assertEqual(result["errors"][0][0], 51)
+        self.assertIn("Invalid JSON", result["errors"][0][1])
+        self.assertEqual(str(self.manager.find("Contact 3")), "Name: Contact 3, Phones: [0000000003, 0000000043]")
+        self.assertEqual(self.manager.find_by_phone("0000000043"), [self.manager.find("Contact 3")])
+
+    def test_import_unsupported_format_raises(self):
+        """Test importing a file with an unknown extension raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.manager.import_contacts("contacts.xml")
+
     def test_add_birthday(self):
         """Test adding a birthday to an existing record."""
         birthday = Birthday("01.01.1990")
@@ -103,97 +239,96 @@ class TestAddressBookManager(unittest.TestCase):
         self.assertEqual(result.address, address)
 
     def test_get_upcoming_birthdays_with_results(self):
-        """Test getting upcoming birthdays with mocked date."""
-        fixed_date = date(2024, 1, 1)  # January 1, 2024
-
-        # Add a birthday that will be "upcoming" relative to our fixed date
-        # January 3, 1990 - so next birthday would be January 3, 2024 (2 days from fixed date)
+        """Test getting upcoming birthdays relative to a fixed date."""
+        # January 3, 1990 - so the next birthday is January 3, 2024, 2 days from January 1
         self.manager.add_birthday("John Doe", Birthday("03.01.1990"))
-        
-        with patch('personal_assistant.managers.address_book_manager.datetime') as mock_datetime:
-            mock_datetime.now.return_value.date.return_value = fixed_date
-            
-            # Mock the get_next_birthday method for John's record
-            john_record = self.manager.find("John Doe")
-            next_birthday_date = date(2024, 1, 3)  # 2 days from fixed date
-            
-            with patch.object(john_record, 'get_next_birthday', return_value=next_birthday_date):
-                upcoming = self.manager.get_upcoming_birthdays(7)
-                self.assertEqual(len(upcoming), 1)
-                self.assertEqual(upcoming[0]["name"], "John Doe")
-                self.assertEqual(upcoming[0]["next_date"], next_birthday_date)
+
+        upcoming = self.manager.get_upcoming_birthdays(7, today=date(2024, 1, 1))
+        self.assertEqual(len(upcoming), 1)
+        self.assertEqual(upcoming[0]["name"], "John Doe")
+        self.assertEqual(upcoming[0]["next_date"], date(2024, 1, 3))
 
     def test_get_upcoming_birthdays_no_results(self):
         """Test getting upcoming birthdays with no results."""
-        fixed_date = date(2024, 1, 1)  # January 1, 2024
-        
-        with patch('personal_assistant.managers.address_book_manager.datetime') as mock_datetime:
-            mock_datetime.now.return_value.date.return_value = fixed_date
-            
-            # Add a birthday that won't be upcoming (more than 7 days away)
-            self.manager.add_birthday("John Doe", Birthday("15.01.1990"))
-            
-            # Mock get_next_birthday to return a date outside the 7-day window
-            john_record = self.manager.find("John Doe")
-            future_birthday_date = date(2024, 1, 15)  # 14 days from fixed date
-            
-            with patch.object(john_record, 'get_next_birthday', return_value=future_birthday_date):
-                upcoming = self.manager.get_upcoming_birthdays(7)
-                self.assertEqual(len(upcoming), 0)
+        # January 15 is 14 days from January 1, outside the 7-day window
+        self.manager.add_birthday("John Doe", Birthday("15.01.1990"))
+
+        upcoming = self.manager.get_upcoming_birthdays(7, today=date(2024, 1, 1))
+        self.assertEqual(len(upcoming), 0)
     
+    def test_birthday_stats_follow_changes(self):
+        """Test that the birthday columns are kept in sync once built."""
+        today = date(2024, 1, 1)
+        self.manager.add_birthday("John Doe", Birthday("03.01.1990"))
+        self.assertEqual(self.manager.get_birthday_stats(2, today=today), [(date(2024, 1, 1), 1), (date(2024, 1, 8), 0)])
+
+        self.manager.add_record("Jane")
+        self.manager.add_birthday("Jane", Birthday("10.01.1990"))
+        self.manager.add_birthday("John Doe", Birthday("09.01.1990"))
+        self.assertEqual(self.manager.get_birthday_stats(2, today=today), [(date(2024, 1, 1), 0), (date(2024, 1, 8), 2)])
+
+        self.manager.delete("Jane")
+        self.assertEqual(self.manager.get_birthday_stats(2, today=today), [(date(2024, 1, 1), 0), (date(2024, 1, 8), 1)])
+
+    def test_get_turning(self):
+        """Test finding the contacts that reach an age."""
+        self.manager.add_birthday("John Doe", Birthday("03.01.1990"))
+        self.manager.add_record("Jane")
+        self.manager.add_birthday("Jane", Birthday("03.01.1991"))
+        turning = self.manager.get_turning(34, days=30, today=date(2024, 1, 1))
+        self.assertEqual(turning, [{"name": "John Doe", "next_date": date(2024, 1, 3), "years_reached": 34}])
+        self.assertEqual(self.manager.get_turning(34, days=1, today=date(2024, 1, 1)), [])
+
     def test_get_upcoming_birthdays_multiple_scenarios(self):
-        """Test various birthday scenarios with mocked dates."""
-        fixed_date = date(2024, 6, 15)  # June 15, 2024
-        
-        with patch('personal_assistant.managers.address_book_manager.datetime') as mock_datetime:
-            mock_datetime.now.return_value.date.return_value = fixed_date
-            
-            # Add multiple people with different birthdays
-            linda_record = self.manager.add_record("Linda Brown")
-            self.manager.add_birthday("Linda Brown", Birthday("16.06.1990"))  # Tomorrow
-            jane_record = self.manager.add_record("Jane Smith")
-            self.manager.add_birthday("Jane Smith", Birthday("20.06.1985"))  # In 5 days
-            bob_record = self.manager.add_record("Bob Wilson")
-            self.manager.add_birthday("Bob Wilson", Birthday("25.06.1995"))  # In 10 days (outside window)
-            
-            # Mock each record's get_next_birthday method
-            linda_next = date(2024, 6, 16)  # Tomorrow (1 day away)
-            jane_next = date(2024, 6, 20)   # 5 days away
-            bob_next = date(2024, 6, 25)    # 10 days away
-            
-            with patch.object(linda_record, 'get_next_birthday', return_value=linda_next), \
-                 patch.object(jane_record, 'get_next_birthday', return_value=jane_next), \
-                 patch.object(bob_record, 'get_next_birthday', return_value=bob_next):
-                
-                # Test with 7-day window - should find Linda and Jane, but not Bob
-                upcoming = self.manager.get_upcoming_birthdays(7)
-                self.assertEqual(len(upcoming), 2)
-                names = [entry["name"] for entry in upcoming]
-                self.assertIn("Linda Brown", names)
-                self.assertIn("Jane Smith", names)
-                self.assertNotIn("Bob Wilson", names)
-                
-                # Test with 15-day window - should find all three
-                upcoming_15 = self.manager.get_upcoming_birthdays(15)
-                self.assertEqual(len(upcoming_15), 3)
-    
+        """Test various birthday scenarios relative to a fixed date."""
+        today = date(2024, 6, 15)
+
+        self.manager.add_record("Linda Brown")
+        self.manager.add_birthday("Linda Brown", Birthday("16.06.1990"))  # Tomorrow
+        self.manager.add_record("Jane Smith")
+        self.manager.add_birthday("Jane Smith", Birthday("20.06.1985"))  # In 5 days
+        self.manager.add_record("Bob Wilson")
+        self.manager.add_birthday("Bob Wilson", Birthday("25.06.1995"))  # In 10 days (outside window)
+
+        # Test with 7-day window - should find Linda and Jane, but not Bob
+        upcoming = self.manager.get_upcoming_birthdays(7, today=today)
+        self.assertEqual([(entry["name"], entry["next_date"]) for entry in upcoming],
+                         [("Linda Brown", date(2024, 6, 16)), ("Jane Smith", date(2024, 6, 20))])
+
+        # Test with 15-day window - should find all three
+        upcoming_15 = self.manager.get_upcoming_birthdays(15, today=today)
+        self.assertEqual(len(upcoming_15), 3)
+        self.assertEqual(upcoming_15[-1]["next_date"], date(2024, 6, 25))
+
     def test_get_upcoming_birthdays_today(self):
         """Test birthday that occurs today."""
-        fixed_date = date(2024, 3, 10)  # March 10, 2024
-        
-        with patch('personal_assistant.managers.address_book_manager.datetime') as mock_datetime:
-            mock_datetime.now.return_value.date.return_value = fixed_date
-            
-            # Add someone with birthday today
-            birthday_record = self.manager.add_record("Birthday Person")
-            self.manager.add_birthday("Birthday Person", Birthday("10.03.1990"))
-            
-            # Mock get_next_birthday to return today's date
-            with patch.object(birthday_record, 'get_next_birthday', return_value=fixed_date):
-                upcoming = self.manager.get_upcoming_birthdays(7)
-                self.assertEqual(len(upcoming), 1)
-                self.assertEqual(upcoming[0]["name"], "Birthday Person")
-                self.assertEqual(upcoming[0]["next_date"], fixed_date)
+        today = date(2024, 3, 10)
+        self.manager.add_record("Birthday Person")
+        self.manager.add_birthday("Birthday Person", Birthday("10.03.1990"))
+
+        upcoming = self.manager.get_upcoming_birthdays(7, today=today)
+        self.assertEqual(len(upcoming), 1)
+        self.assertEqual(upcoming[0]["name"], "Birthday Person")
+        self.assertEqual(upcoming[0]["next_date"], today)
+
+    def test_get_upcoming_birthdays_leap_day_and_year_wrap(self):
+        """Test 29 February birthdays and windows that cross the new year."""
+        self.manager.add_record("Leap Person")
+        self.manager.add_birthday("Leap Person", Birthday("29.02.2000"))
+        self.manager.add_birthday("John Doe", Birthday("02.01.1990"))
+
+        upcoming = self.manager.get_upcoming_birthdays(3, today=date(2025, 2, 27))
+        self.assertEqual(upcoming, [{"name": "Leap Person", "next_date": date(2025, 2, 28), "years_reached": 25}])
+
+        upcoming = self.manager.get_upcoming_birthdays(7, today=date(2024, 12, 30))
+        self.assertEqual(upcoming, [{"name": "John Doe", "next_date": date(2025, 1, 2), "years_reached": 35}])
+
+    def test_deleted_record_has_no_upcoming_birthday(self):
+        """Test that deleting a contact removes it from upcoming birthdays."""
+        self.manager.add_birthday("John Doe", Birthday("03.01.1990"))
+        self.manager.delete("John Doe")
+
+        self.assertEqual(self.manager.get_upcoming_birthdays(7, today=date(2024, 1, 1)), [])
 
     def test_add_duplicate_phone_raises_error(self):
         """Test adding duplicate phone raises ValueError."""
@@ -257,6 +392,57 @@ class TestAddressBookManager(unittest.TestCase):
         self.assertEqual(phone_result, birthday_result)
         self.assertEqual(birthday_result, address_result)
 
+    def test_flush_saves_changes_inside_records(self):
+        """Changes made inside a record are saved by flush()."""
+        filename = os.path.join(tempfile.mkdtemp(), "addressbook_state.pkl")
+        try:
+            manager = AddressBookManager(AddressBook(ShardedStorage(filename)))
+            manager.add_record("Jane Smith")
+            manager.flush()
+            manager.add_phone("Jane Smith", Phone("555-0100"))
+            manager.add_birthday("Jane Smith", Birthday("01.02.1990"))
+            manager.flush()
+
+            saved = AddressBook(ShardedStorage(filename))
+            self.assertEqual(str(saved["Jane Smith"]), "Name: Jane Smith, Phones: [5550100], Birthday: 01.02.1990")
+        finally:
+            shutil.rmtree(os.path.dirname(filename))
+
+    def test_address_book_is_loaded_on_first_use(self):
+        """Creating a manager does not read the saved address book."""
+        filename = os.path.join(tempfile.mkdtemp(), "addressbook_state.pkl")
+        try:
+            storage = ShardedStorage(filename)
+            manager = AddressBookManager(AddressBook(storage))
+            manager.add_record("Jane Smith")
+            manager.add_phone("Jane Smith", Phone("555-0100"))
+            manager.close()
+
+            address_book = AddressBook(ShardedStorage(filename))
+            manager = AddressBookManager(address_book)
+            self.assertFalse(address_book.loaded)
+            self.assertEqual([r.name for r in manager.find_by_prefix("Ja")], ["Jane Smith"])
+            self.assertEqual([r.name for r in manager.find_by_phone("5550100")], ["Jane Smith"])
+        finally:
+            shutil.rmtree(os.path.dirname(filename))
+
+
+class TestAddressBookManagerOnSqlite(TestAddressBookManager):
+    """Runs the same manager tests on top of the SQLite storage engine."""
+
+    def setUp(self):
+        self.dbfile = "test_manager_addressbook.sqlite3"
+        self.address_book = SqliteAddressBook(self.dbfile)
+        self.address_book.clear()
+        self.manager = AddressBookManager(self.address_book)
+        self.john_record = self.manager.add_record("John Doe")
+
+    def tearDown(self):
+        self.address_book.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.dbfile + suffix):
+                os.remove(self.dbfile + suffix)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import Mock, MagicMock
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager, NotesManager, Checkpointer
+
+
+class TestCheckpointer(unittest.TestCase):
+    def test_flushes_periodically_until_stopped(self):
+        flushed = threading.Semaphore(0)
+
+        class Target:
+            def flush(self):
+                flushed.release()
+
+        target = Target()
+        checkpointer = Checkpointer(target.flush, 0.01)
+        for _ in range(3):
+            self.assertTrue(flushed.acquire(timeout=5))
+        checkpointer.stop()
+        while flushed.acquire(blocking=False):
+            pass
+        threading.Event().wait(0.05)
+        self.assertFalse(flushed.acquire(blocking=False))
+
+    def test_failed_checkpoint_is_retried(self):
+        calls = threading.Semaphore(0)
+
+        class Target:
+            def flush(self):
+                calls.release()
+                raise OSError("disk full")
+
+        target = Target()
+        checkpointer = Checkpointer(target.flush, 0.01)
+        for _ in range(2):
+            self.assertTrue(calls.acquire(timeout=5))
+        checkpointer.stop()
+
+
+class TestManagerCheckpoints(unittest.TestCase):
+    def test_address_book_manager_checkpoints(self):
+        address_book = Mock()
+        flushed = threading.Event()
+        # The snapshot is taken under the lock and written by the returned callable
+        address_book.checkpoint.return_value = flushed.set
+        manager = AddressBookManager(address_book, checkpoint_interval=0.01)
+        self.assertTrue(manager.thread_safe)
+        self.assertTrue(flushed.wait(5))
+
+        manager.close()
+        address_book.close.assert_called_once()
+
+    def test_notes_manager_checkpoints(self):
+        notebook = Mock()
+        flushed = threading.Event()
+        notebook.checkpoint.return_value = flushed.set
+        manager = NotesManager(notebook=notebook, checkpoint_interval=0.01)
+        self.assertTrue(flushed.wait(5))
+
+        manager.close()
+        notebook.close.assert_called_once()
+
+    def test_snapshot_is_written_outside_the_lock(self):
+        address_book = MagicMock()
+        manager = AddressBookManager(address_book, thread_safe=True)
+        changed_while_writing = []
+
+        def write():
+            change = threading.Thread(target=manager.add_record, args=("Jane",))
+            change.start()
+            change.join(5)
+            changed_while_writing.append(not change.is_alive())
+        address_book.checkpoint.return_value = write
+        manager.flush()
+        self.assertEqual(changed_while_writing, [True])
+
+    def test_no_checkpoints_by_default(self):
+        manager = AddressBookManager(Mock())
+        self.assertFalse(manager.thread_safe)
+        manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
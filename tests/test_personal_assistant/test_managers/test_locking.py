@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager, NotesManager, ReadWriteLock
+from personal_assistant.managers.locking import read_in_chunks
+from personal_assistant.models import AddressBook, Notebook, Phone
+from personal_assistant.models.interfaces import StorageBackend
+
+
+class TestReadWriteLock(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def test_readers_share_the_lock(self):
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.read():
+                both_inside.wait()
+
+        with ThreadPoolExecutor(2) as executor:
+            for future in [executor.submit(read) for _ in range(2)]:
+                future.result()
+
+    def test_writer_excludes_readers(self):
+        events = []
+        writer_inside = threading.Event()
+
+        def write():
+            with self.lock.write():
+                writer_inside.set()
+                threading.Event().wait(0.05)
+                events.append("write done")
+
+        def read():
+            writer_inside.wait(5)
+            with self.lock.read():
+                events.append("read")
+
+        with ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(write), executor.submit(read)]
+            for future in futures:
+                future.result()
+        self.assertEqual(events, ["write done", "read"])
+
+    def test_writer_can_reenter(self):
+        with self.lock.write():
+            with self.lock.read():
+                with self.lock.write():
+                    pass
+        with self.lock.read():
+            pass
+
+
+class TestReadInChunks(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+        self.items = list(range(10))
+        self.version = 0
+        self.iterators = 0
+
+    def __iterate(self):
+        self.iterators += 1
+        return iter(self.items)
+
+    def __read(self, offset=0, stop=None):
+        return read_in_chunks(self.lock, self.__iterate, lambda: self.version, offset, stop, chunk_size=3)
+
+    def test_reads_a_slice_with_one_iterator(self):
+        self.assertEqual(list(self.__read()), self.items)
+        self.assertEqual(list(self.__read(2, 7)), [2, 3, 4, 5, 6])
+        self.assertEqual(self.iterators, 2)
+
+    def test_lock_is_released_between_chunks(self):
+        listing = self.__read()
+        self.assertEqual([next(listing) for _ in range(3)], [0, 1, 2])
+        with self.lock.write():
+            self.items.insert(0, -1)
+            self.version += 1
+        # Goes on from the same position in the changed items
+        self.assertEqual(list(listing), [2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(self.iterators, 2)
+
+
+class TestThreadSafeManagers(unittest.TestCase):
+    THREADS = 8
+    UPDATES = 300
+
+    def setUp(self):
+        # A backend that keeps everything in memory
+        self.manager = AddressBookManager(AddressBook(StorageBackend()), thread_safe=True)
+        self.manager.add_record("Switchboard")
+
+    def test_no_lost_updates(self):
+        def add_phones(thread):
+            for i in range(self.UPDATES):
+                self.manager.add_phone("Switchboard", Phone(f"{thread:02d}{i:06d}"))
+                self.manager.find_by_phone(f"{thread:02d}{i:06d}")
+                self.manager.get_upcoming_birthdays(7)
+
+        with ThreadPoolExecutor(self.THREADS) as executor:
+            for future in [executor.submit(add_phones, thread) for thread in range(self.THREADS)]:
+                future.result()
+
+        record = self.manager.find("Switchboard")
+        self.assertEqual(len(record.phones), self.THREADS * self.UPDATES)
+        self.assertEqual(self.manager.find_by_phone("07000299"), [record])
+
+    def test_listing_is_read_in_chunks(self):
+        for i in range(2500):
+            self.manager.add_record(f"Contact {i:04d}")
+        listing = self.manager.iter_records()
+        self.assertEqual(next(listing).name, "Switchboard")
+        # A writer is not blocked while the listing is being consumed
+        self.manager.delete("Contact 0000")
+        names = [record.name for record in listing]
+        self.assertEqual(len(names), 2499)
+        self.assertEqual(names[-1], "Contact 2499")
+        self.assertEqual([record.name for record in self.manager.iter_records(2000, 3)],
+                         ["Contact 2000", "Contact 2001", "Contact 2002"])
+
+    def test_concurrent_duplicates_are_rejected_once(self):
+        def add_same_phone(_):
+            try:
+                self.manager.add_phone("Switchboard", Phone("1234567890"))
+                return True
+            except ValueError:
+                return False
+
+        with ThreadPoolExecutor(self.THREADS) as executor:
+            added = list(executor.map(add_same_phone, range(self.THREADS * 10)))
+        self.assertEqual(added.count(True), 1)
+
+    def test_notes_no_lost_updates(self):
+        notes_manager = NotesManager(notebook=Notebook(StorageBackend()), thread_safe=True)
+
+        def add_notes(thread):
+            for i in range(self.UPDATES):
+                notes_manager.add_note(f"note {thread}-{i}", f"thread{thread} content")
+                notes_manager.search(f"thread{thread}")
+
+        with ThreadPoolExecutor(self.THREADS) as executor:
+            for future in [executor.submit(add_notes, thread) for thread in range(self.THREADS)]:
+                future.result()
+
+        self.assertEqual(len(notes_manager.get_all_notes()), self.THREADS * self.UPDATES)
+        self.assertEqual(len(notes_manager.search("thread3", limit=1000)), self.UPDATES)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -53,6 +53,12 @@ class TestNotesManager(unittest.TestCase):
         self.assertIn("Title 2: Note 2", all_notes)
         self.assertEqual(len(all_notes), 2)
 
+    def test_iter_notes_pages(self):
+        for i in range(5):
+            self.manager.add_note(f"Title {i}", f"Note {i}")
+        self.assertEqual(list(self.manager.iter_notes(3)), ["Title 3: Note 3", "Title 4: Note 4"])
+        self.assertEqual(list(self.manager.iter_notes(1, 1)), ["Title 1: Note 1"])
+
     def test_update_note_existing(self):
         self.manager.add_note("Update Title", "Old content")
         self.manager.update("Update Title", "New content")
@@ -68,5 +74,17 @@ class TestNotesManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.manager.add_note("Duplicate Title", "Second content")
 
+    def test_search_follows_updates(self):
+        self.manager.add_note("Shopping", "Buy milk")
+        self.manager.add_note("Work", "Send the report")
+        self.assertEqual(self.manager.search("milk"), ["Shopping"])
+        self.assertEqual(self.manager.search("work"), ["Work"])
+
+        self.manager.update("Shopping", "Buy bread")
+        self.assertEqual(self.manager.search("milk"), [])
+
+        self.manager.delete("Work")
+        self.assertEqual(self.manager.search("report"), [])
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
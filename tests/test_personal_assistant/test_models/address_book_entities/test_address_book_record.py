@@ -1,6 +1,8 @@
 import unittest
 import sys
 import os
+import pickle
+from datetime import date, datetime
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
@@ -22,6 +24,17 @@ class TestAddressBookRecord(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.record.add_phone(phone)
 
+    def test_add_same_number_in_other_format_raises(self):
+        self.record.add_phone(Phone("123-456-7890"))
+        with self.assertRaises(ValueError):
+            self.record.add_phone(Phone("(123) 456 7890"))
+
+    def test_phones_keep_insertion_order(self):
+        for number in ("333", "111", "222"):
+            self.record.add_phone(Phone(number))
+        self.record.remove_phone(Phone("111"))
+        self.assertEqual([str(phone) for phone in self.record.phones], ["333", "222"])
+
     def test_add_birthday(self):
         birthday = Birthday("01.01.1990")
         self.record.add_birthday(birthday)
@@ -60,5 +73,73 @@ class TestAddressBookRecord(unittest.TestCase):
         expected_str = "Name: John Doe, Phones: [1234567890], Birthday: 31.01.1990, Address: 123 Main St, Email: john.doe@example.com"
         self.assertEqual(str(self.record), expected_str)
 
+    def test_str_is_cached_until_changed(self):
+        self.record.add_phone(Phone("1234567890"))
+        rendered = str(self.record)
+        self.assertIs(str(self.record), rendered)
+
+        self.record.add_birthday(Birthday("31.01.1990"))
+        self.assertEqual(str(self.record), "Name: John Doe, Phones: [1234567890], Birthday: 31.01.1990")
+        self.record.add_address(HomeAddress("123 Main St"))
+        self.assertIn("Address: 123 Main St", str(self.record))
+        self.record.add_email(Email("john.doe@example.com"))
+        self.assertIn("Email: john.doe@example.com", str(self.record))
+        self.record.remove_phone(Phone("1234567890"))
+        self.assertNotIn("Phones", str(self.record))
+        self.record.add_phone(Phone("0987654321"))
+        self.assertIn("Phones: [0987654321]", str(self.record))
+
+    def test_rendered_str_is_not_pickled(self):
+        str(self.record)
+        restored = pickle.loads(pickle.dumps(self.record))
+        self.assertEqual(pickle.dumps(restored), pickle.dumps(AddressBookRecord("John Doe")))
+        self.assertEqual(self.record.to_tuple(), ("John Doe", [], None, None, None))
+
+    def test_get_next_birthday_from_given_today(self):
+        self.record.add_birthday(Birthday("15.03.1990"))
+        self.assertEqual(self.record.get_next_birthday(date(2024, 3, 1)), date(2024, 3, 15))
+        self.assertEqual(self.record.get_next_birthday(date(2024, 3, 16)), date(2025, 3, 15))
+
+    def test_pickle_round_trip(self):
+        self.record.add_phone(Phone("1234567890"))
+        self.record.add_birthday(Birthday("31.01.1990"))
+        restored = pickle.loads(pickle.dumps(self.record))
+        self.assertEqual(str(restored), str(self.record))
+        self.assertFalse(hasattr(restored, "__dict__"))
+
+    def test_restores_state_pickled_before_slots(self):
+        # Objects pickled before __slots__ were restored from their __dict__
+        birthday = Birthday.__new__(Birthday)
+        birthday.__setstate__({"value": datetime(1990, 1, 31)})
+        phone = Phone.__new__(Phone)
+        phone.__setstate__({"value": "123-456-7890"})
+        record = AddressBookRecord.__new__(AddressBookRecord)
+        record.__setstate__({"name": "John Doe", "phones": [phone], "birthday": birthday,
+                             "address": None, "email": None})
+
+        self.assertEqual(birthday.value, date(1990, 1, 31))
+        self.assertIn(Phone("1234567890"), record.phones)
+        self.assertEqual(str(record), "Name: John Doe, Phones: [1234567890], Birthday: 31.01.1990")
+
+    def test_tuple_round_trip(self):
+        self.record.add_phone(Phone("1234567890"))
+        self.record.add_phone(Phone("0987654321"))
+        self.record.add_birthday(Birthday("31.01.1990"))
+        self.record.add_address(HomeAddress("Main", "St"))
+        self.record.add_email(Email("john@example.com"))
+
+        values = self.record.to_tuple()
+        self.assertEqual(values, ("John Doe", ["1234567890", "0987654321"], date(1990, 1, 31).toordinal(),
+                                  "Main St", "john@example.com"))
+        restored = AddressBookRecord.from_tuple(list(values))
+        self.assertEqual(str(restored), str(self.record))
+        self.assertIn(Phone("0987654321"), restored.phones)
+        self.assertEqual(restored.birthday.value, date(1990, 1, 31))
+
+    def test_tuple_round_trip_of_empty_record(self):
+        restored = AddressBookRecord.from_tuple(self.record.to_tuple())
+        self.assertEqual(str(restored), "Name: John Doe")
+        self.assertIsNone(restored.birthday)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
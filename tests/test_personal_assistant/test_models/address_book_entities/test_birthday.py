@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+from datetime import date
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
@@ -25,5 +26,21 @@ class TestBirthday(unittest.TestCase):
         with self.assertRaises(ValueError):
             Birthday(future_date)
 
+    def test_birthday_is_stored_as_date(self):
+        self.assertEqual(Birthday("29.02.2000").value, date(2000, 2, 29))
+
+    def test_birthday_invalid_day(self):
+        for value in ("30.02.2001", "00.01.1990", "1a.01.1990", "٠١.٠١.١٩٩٠"):
+            with self.assertRaises(ValueError):
+                Birthday(value)
+
+    def test_birthday_without_leading_zeros(self):
+        self.assertEqual(str(Birthday("1.2.1990")), "01.02.1990")
+
+    def test_birthday_with_given_today(self):
+        with self.assertRaises(ValueError):
+            Birthday("02.01.2020", today=date(2020, 1, 1))
+        self.assertEqual(Birthday("01.01.2020", today=date(2020, 1, 1)).value, date(2020, 1, 1))
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,27 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models import Phone
+
+class TestPhone(unittest.TestCase):
+    def test_phone_is_normalized(self):
+        self.assertEqual(str(Phone("(123) 456-7890")), "1234567890")
+
+    def test_phone_value_is_interned(self):
+        self.assertIs(Phone("123-456-7890").value, Phone("1234567890").value)
+
+    def test_phones_with_same_digits_are_equal(self):
+        self.assertEqual(Phone("(123) 456-7890"), Phone("1234567890"))
+        self.assertEqual(len({Phone("(123) 456-7890"), Phone("1234567890")}), 1)
+        self.assertNotEqual(Phone("1234567890"), Phone("1234567891"))
+
+    def test_phone_without_digits_raises(self):
+        with self.assertRaises(ValueError):
+            Phone("phone")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import random
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models.indexes import BirthdayColumns, BirthdayIndex
+from personal_assistant.models.indexes import birthday_columns
+
+
+class TestBirthdayColumns(unittest.TestCase):
+    def setUp(self):
+        self.columns = BirthdayColumns()
+        self.columns.add("Linda", date(1990, 6, 16))
+        self.columns.add("Jane", date(1985, 6, 20))
+        self.columns.add("Bob", date(1995, 6, 25))
+
+    def names(self, today, days):
+        return [name for name, _, _ in self.columns.upcoming(today, days)]
+
+    def test_upcoming_window(self):
+        self.assertEqual(self.names(date(2024, 6, 15), 7), ["Linda", "Jane"])
+        self.assertEqual(self.names(date(2024, 6, 15), 10), ["Linda", "Jane", "Bob"])
+        self.assertEqual(self.names(date(2024, 6, 16), 0), ["Linda"])
+
+    def test_remove_moves_last_row(self):
+        self.columns.remove("Linda")
+        self.columns.remove("Nobody")
+        self.assertEqual(self.names(date(2024, 6, 15), 10), ["Jane", "Bob"])
+        self.columns.add("Jane", date(1985, 6, 30))
+        self.assertEqual(list(self.columns.upcoming(date(2024, 6, 15), 20)),
+                         [("Bob", date(1995, 6, 25), date(2024, 6, 25)), ("Jane", date(1985, 6, 30), date(2024, 6, 30))])
+        self.assertEqual(len(self.columns), 2)
+        self.assertNotIn("Linda", self.columns)
+
+    def test_weekly_counts(self):
+        self.columns.add("Eve", date(1980, 1, 2))
+        self.assertEqual(self.columns.weekly_counts(date(2024, 6, 15), 2), [2, 1])
+        counts = self.columns.weekly_counts(date(2024, 6, 15))
+        self.assertEqual(len(counts), 52)
+        self.assertEqual(sum(counts), 4)
+        self.assertEqual(counts[28], 1)
+
+    def test_weekly_counts_rejects_more_than_a_year(self):
+        with self.assertRaises(ValueError):
+            self.columns.weekly_counts(date(2024, 6, 15), 53)
+
+    def test_turning(self):
+        self.assertEqual(list(self.columns.turning(30, date(2025, 1, 1), date(2025, 12, 31))),
+                         [("Bob", date(1995, 6, 25), date(2025, 6, 25))])
+        self.assertEqual(list(self.columns.turning(30, date(2025, 6, 26), date(2025, 12, 31))), [])
+
+    def test_leap_day(self):
+        self.columns.add("Leap", date(2000, 2, 29))
+        self.assertEqual(list(self.columns.upcoming(date(2025, 2, 27), 3)),
+                         [("Leap", date(2000, 2, 29), date(2025, 2, 28))])
+        self.assertEqual(list(self.columns.upcoming(date(2024, 2, 27), 3)),
+                         [("Leap", date(2000, 2, 29), date(2024, 2, 29))])
+        self.assertEqual(list(self.columns.turning(25, date(2025, 1, 1), date(2025, 3, 1))),
+                         [("Leap", date(2000, 2, 29), date(2025, 2, 28))])
+
+    def test_empty(self):
+        self.columns.clear()
+        self.assertEqual(len(self.columns), 0)
+        self.assertEqual(self.names(date(2024, 6, 15), 365), [])
+        self.assertEqual(self.columns.weekly_counts(date(2024, 6, 15), 3), [0, 0, 0])
+
+    def test_matches_birthday_index(self):
+        random.seed(7)
+        columns, index = BirthdayColumns(), BirthdayIndex()
+        for i in range(500):
+            name = f"Contact {random.randrange(300)}"
+            if random.random() < 0.2:
+                columns.remove(name)
+                index.remove(name)
+            else:
+                birth_date = date(1950, 1, 1) + timedelta(days=random.randrange(20000))
+                columns.add(name, birth_date)
+                index.add(name, birth_date)
+        for today in (date(2024, 2, 28), date(2023, 12, 30), date(2025, 3, 1)):
+            self.assertEqual(list(columns.upcoming(today, 60)), list(index.upcoming(today, 60)))
+
+    @unittest.skipIf(birthday_columns.numpy is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        self.columns.add("Leap", date(2000, 2, 29))
+        self.columns.add("Eve", date(1980, 1, 2))
+        today = date(2024, 2, 20)
+        vectorized = (list(self.columns.upcoming(today, 200)), self.columns.weekly_counts(today),
+                      list(self.columns.turning(44, today, date(2024, 12, 31))))
+        with patch.object(birthday_columns, "numpy", None):
+            looped = (list(self.columns.upcoming(today, 200)), self.columns.weekly_counts(today),
+                      list(self.columns.turning(44, today, date(2024, 12, 31))))
+        self.assertEqual(vectorized, looped)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models.indexes import BirthdayIndex
+
+class TestBirthdayIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = BirthdayIndex()
+        self.index.add("Linda", date(1990, 6, 16))
+        self.index.add("Jane", date(1985, 6, 20))
+        self.index.add("Bob", date(1995, 6, 25))
+
+    def names(self, today, days):
+        return [name for name, _, _ in self.index.upcoming(today, days)]
+
+    def test_window(self):
+        self.assertEqual(self.names(date(2024, 6, 15), 7), ["Linda", "Jane"])
+        self.assertEqual(self.names(date(2024, 6, 15), 10), ["Linda", "Jane", "Bob"])
+        self.assertEqual(self.names(date(2024, 6, 16), 0), ["Linda"])
+
+    def test_remove_and_readd(self):
+        self.index.remove("Jane")
+        self.index.remove("Nobody")
+        self.assertEqual(self.names(date(2024, 6, 15), 10), ["Linda", "Bob"])
+        self.index.add("Linda", date(1990, 6, 24))
+        self.assertEqual(self.names(date(2024, 6, 15), 10), ["Linda", "Bob"])
+        self.assertEqual(len(self.index), 2)
+
+    def test_year_wrap_around(self):
+        self.index.add("Eve", date(1980, 1, 2))
+        upcoming = list(self.index.upcoming(date(2024, 12, 30), 5))
+        self.assertEqual(upcoming, [("Eve", date(1980, 1, 2), date(2025, 1, 2))])
+
+    def test_leap_day_in_non_leap_year(self):
+        self.index.add("Leap", date(2000, 2, 29))
+        self.assertEqual(list(self.index.upcoming(date(2025, 2, 27), 3)),
+                         [("Leap", date(2000, 2, 29), date(2025, 2, 28))])
+        self.assertEqual(list(self.index.upcoming(date(2024, 2, 27), 3)),
+                         [("Leap", date(2000, 2, 29), date(2024, 2, 29))])
+
+    def test_window_longer_than_a_year_reports_each_name_once(self):
+        self.assertEqual(self.names(date(2024, 6, 17), 1000), ["Jane", "Bob", "Linda"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
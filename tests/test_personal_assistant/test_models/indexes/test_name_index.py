@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models.indexes import NameIndex
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex()
+        for name in ["John Doe", "Johnny Bravo", "Joanna", "jo", "Jane Smith", "Bob Wilson"]:
+            self.index.add(name)
+
+    def test_prefix_is_case_insensitive_and_sorted(self):
+        self.assertEqual(self.index.find_by_prefix("Jo"), ["jo", "Joanna", "John Doe", "Johnny Bravo"])
+        self.assertEqual(self.index.find_by_prefix("JOHN"), ["John Doe", "Johnny Bravo"])
+        self.assertEqual(self.index.find_by_prefix("x"), [])
+
+    def test_prefix_limit(self):
+        self.assertEqual(self.index.find_by_prefix("j", limit=2), ["Jane Smith", "jo"])
+
+    def test_remove(self):
+        self.index.remove("John Doe")
+        self.index.remove("Not There")
+        self.assertEqual(self.index.find_by_prefix("John"), ["Johnny Bravo"])
+        self.assertNotIn("John Doe", self.index.find_similar("John Doe"))
+        self.assertEqual(len(self.index), 5)
+
+    def test_similar_tolerates_typos(self):
+        self.assertEqual(self.index.find_similar("Jhon Doe")[0], "John Doe")
+        self.assertEqual(self.index.find_similar("bob wilsn", limit=1), ["Bob Wilson"])
+        self.assertEqual(self.index.find_similar("Zzzzz"), [])
+
+    def test_similar_tolerates_typos_in_short_names(self):
+        self.index.add("John")
+        self.assertEqual(self.index.find_similar("Jhon")[:2], ["John", "John Doe"])
+        self.assertEqual(self.index.find_similar("Jon")[:2], ["John", "John Doe"])
+        self.assertEqual(self.index.find_similar("Bbo", limit=1), ["Bob Wilson"])
+        self.assertEqual(self.index.find_similar("Jnae", limit=1), ["Jane Smith"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models.indexes import TextIndex
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TextIndex()
+        self.index.add("shopping", "Buy milk and bread, then buy more milk")
+        self.index.add("work", "Send the report and buy a new keyboard")
+        self.index.add("ideas", "Milk the idea of a bread bakery")
+
+    def titles(self, query, limit=10):
+        return [title for title, _ in self.index.search(query, limit)]
+
+    def test_words_are_ranked(self):
+        self.assertEqual(self.titles("milk"), ["shopping", "ideas"])
+        self.assertEqual(self.titles("BREAD Milk"), ["shopping", "ideas"])
+        self.assertEqual(self.titles("nothing"), [])
+
+    def test_phrase(self):
+        self.assertEqual(self.titles('"buy milk"'), ["shopping"])
+        self.assertEqual(self.titles('"milk buy"'), [])
+
+    def test_prefix(self):
+        self.assertEqual(self.titles("key*"), ["work"])
+        self.assertEqual(sorted(self.titles("br*")), ["ideas", "shopping"])
+
+    def test_limit(self):
+        self.assertEqual(len(self.titles("buy milk bread", limit=1)), 1)
+
+    def test_update_and_remove(self):
+        self.index.add("work", "Nothing to do")
+        self.assertEqual(self.titles("keyboard"), [])
+        self.index.remove("shopping")
+        self.assertEqual(self.titles("milk"), ["ideas"])
+        self.assertEqual(len(self.index), 2)
+
+    def test_stemming(self):
+        index = TextIndex(stemming=True)
+        index.add("list", "Buying groceries")
+        self.assertEqual([title for title, _ in index.search("buy")], ["list"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
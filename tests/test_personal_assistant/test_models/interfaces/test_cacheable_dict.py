@@ -1,11 +1,16 @@
 import unittest
 import sys
+import io
 import os
+import subprocess
+import textwrap
+from unittest.mock import Mock, patch
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
 
-from personal_assistant.models.interfaces import CacheableDict
+from personal_assistant.instrumentation import METRICS
+from personal_assistant.models.interfaces import CacheableDict, StorageBackend
 
 class TestCacheableDict(unittest.TestCase):
     def setUp(self):
@@ -36,5 +41,83 @@ class TestCacheableDict(unittest.TestCase):
         self.assertEqual(len(cacheable_dict), 1)
         self.assertEqual(cacheable_dict['key1'], 'value1')
 
+    def test_data_is_loaded_on_first_access(self):
+        storage = Mock(spec=StorageBackend)
+        storage.load.return_value = {'key1': 'value1'}
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        storage.load.assert_not_called()
+        self.assertFalse(cacheable_dict.loaded)
+
+        self.assertEqual(cacheable_dict['key1'], 'value1')
+        storage.load.assert_called_once()
+        self.assertTrue(cacheable_dict.loaded)
+
+    def test_close_without_access_keeps_file(self):
+        old_dict = CacheableDict(self.pklfile)
+        old_dict['key1'] = 'value1'
+        old_dict.close()
+
+        CacheableDict(self.pklfile).close()
+        self.assertEqual(CacheableDict(self.pklfile)['key1'], 'value1')
+
+    def test_mark_dirty_reports_value_changed_in_place(self):
+        storage = Mock(spec=StorageBackend)
+        storage.load.return_value = {'key1': ['value1']}
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        cacheable_dict['key1'].append('value2')
+        cacheable_dict.mark_dirty('key1')
+        storage.on_set.assert_called_once_with('key1', ['value1', 'value2'])
+
+    def test_flush_saves_without_closing(self):
+        cacheable_dict = CacheableDict(self.pklfile)
+        cacheable_dict['key1'] = 'value1'
+        cacheable_dict.flush()
+        self.assertEqual(CacheableDict(self.pklfile)['key1'], 'value1')
+
+    def test_loading_prints_nothing(self):
+        cacheable_dict = CacheableDict(self.pklfile)
+        cacheable_dict['key1'] = 'value1'
+        cacheable_dict.close()
+        with patch('sys.stdout', io.StringIO()) as output:
+            self.assertEqual(CacheableDict(self.pklfile)['key1'], 'value1')
+        self.assertEqual(output.getvalue(), "")
+
+    def test_persistence_is_timed(self):
+        METRICS.reset()
+        cacheable_dict = CacheableDict(self.pklfile)
+        cacheable_dict['key1'] = 'value1'
+        cacheable_dict.flush()
+        cacheable_dict.close()
+        for step in ("load", "flush", "close"):
+            self.assertEqual(METRICS.histogram("storage.CacheableDict." + step).count, 1)
+        self.assertEqual(METRICS.counter("storage.bytes_written"), 2 * os.path.getsize(self.pklfile))
+
+        CacheableDict(self.pklfile)['key1']
+        self.assertEqual(METRICS.counter("storage.bytes_read"), os.path.getsize(self.pklfile))
+
+    def test_close_saves_once(self):
+        storage = Mock(spec=StorageBackend)
+        storage.load.return_value = {}
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        cacheable_dict['key1'] = 'value1'
+        cacheable_dict.close()
+        cacheable_dict.close()
+        del cacheable_dict
+        storage.close.assert_called_once_with({'key1': 'value1'})
+
+    def test_saved_at_interpreter_exit(self):
+        src = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src')
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {os.path.abspath(src)!r})
+            from personal_assistant.models.interfaces import CacheableDict
+            # Kept alive in a module global, so only the exit hook can save it
+            cacheable_dict = CacheableDict({self.pklfile!r})
+            cacheable_dict['key1'] = 'value1'
+            sys.exit(0)
+        """)
+        subprocess.run([sys.executable, "-c", script], check=True)
+        self.assertEqual(CacheableDict(self.pklfile)['key1'], 'value1')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
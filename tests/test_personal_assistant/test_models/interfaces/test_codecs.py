@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import io
+import pickle
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.models import AddressBook, AddressBookRecord, Phone, Birthday
+from personal_assistant.models.interfaces import (BinaryCodec, JsonCodec, PickleCodec, PickleStorage, SnapshotStorage,
+                                                  codec_for)
+
+DATA = {
+    "small": [0, 127, -32, 255, -129, 70000, 2 ** 40, -2 ** 63],
+    "text": ["", "x" * 40, "é" * 300, "d" * 70000],
+    "nested": {"list": [None, True, False, 1.5], "empty": {}},
+}
+
+
+class TestCodecs(unittest.TestCase):
+    def round_trip(self, codec, data):
+        f = io.BytesIO()
+        codec.dump(data, f)
+        f.seek(0)
+        return codec.load(f)
+
+    def test_round_trip(self):
+        for codec in (PickleCodec(), JsonCodec(), BinaryCodec()):
+            with self.subTest(codec=type(codec).__name__):
+                self.assertEqual(self.round_trip(codec, DATA), DATA)
+
+    def test_tuples_may_come_back_as_lists(self):
+        for codec in (JsonCodec(), BinaryCodec()):
+            self.assertEqual(self.round_trip(codec, {"record": ("John", ("123",))}), {"record": ["John", ["123"]]})
+
+    def test_binary_codec_is_msgpack(self):
+        f = io.BytesIO()
+        BinaryCodec().dump({"a": [1, None]}, f)
+        self.assertEqual(f.getvalue(), b"\x81\xa1a\x92\x01\xc0")
+
+    def test_binary_codec_rejects_objects(self):
+        with self.assertRaises(TypeError):
+            BinaryCodec().dump({"phone": Phone("123")}, io.BytesIO())
+
+    def test_codec_for_extension(self):
+        self.assertIsInstance(codec_for("state.json"), JsonCodec)
+        self.assertIsInstance(codec_for("state.BIN"), BinaryCodec)
+        self.assertIsInstance(codec_for("state.pkl"), PickleCodec)
+        self.assertIsInstance(codec_for("state"), PickleCodec)
+
+
+class TestSnapshotStorage(unittest.TestCase):
+    FILENAMES = ("test_snapshot.pkl", "test_snapshot.json", "test_snapshot.bin")
+
+    def setUp(self):
+        self.tearDown()
+
+    def tearDown(self):
+        for filename in self.FILENAMES:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_records_round_trip_in_every_format(self):
+        record = AddressBookRecord("John")
+        record.add_phone(Phone("1234567890"))
+        record.add_birthday(Birthday("31.01.1990"))
+        for filename in self.FILENAMES:
+            with self.subTest(filename=filename):
+                address_book = AddressBook(SnapshotStorage(filename, value_type=AddressBookRecord))
+                address_book["John"] = record
+                address_book.close()
+
+                loaded = AddressBook(SnapshotStorage(filename, value_type=AddressBookRecord))
+                self.assertEqual(str(loaded["John"]), str(record))
+
+    def test_records_are_saved_as_tuples(self):
+        storage = SnapshotStorage("test_snapshot.pkl", value_type=AddressBookRecord)
+        storage.close({"John": AddressBookRecord("John")})
+        with open("test_snapshot.pkl", "rb") as f:
+            self.assertEqual(pickle.load(f), {"John": ("John", [], None, None, None)})
+
+    def test_loads_records_pickled_as_objects(self):
+        record = AddressBookRecord("John")
+        record.add_phone(Phone("1234567890"))
+        PickleStorage("test_snapshot.pkl").close({"John": record})
+
+        loaded = SnapshotStorage("test_snapshot.pkl", value_type=AddressBookRecord).load()
+        self.assertEqual(str(loaded["John"]), str(record))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
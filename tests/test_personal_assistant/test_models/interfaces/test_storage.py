@@ -0,0 +1,304 @@
+import unittest
+import sys
+import os
+import pickle
+import shutil
+import stat
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook, AddressBookRecord, Phone
+from personal_assistant.models.interfaces import (CacheableDict, JournalStorage, PickleStorage, ShardedStorage,
+                                                 SnapshotStorage)
+
+class TestPickleStorage(unittest.TestCase):
+    def setUp(self):
+        self.pklfile = "test_pickle.pkl"
+        if os.path.exists(self.pklfile):
+            os.remove(self.pklfile)
+
+    def tearDown(self):
+        if os.path.exists(self.pklfile):
+            os.remove(self.pklfile)
+
+    def test_failed_save_keeps_previous_file(self):
+        storage = PickleStorage(self.pklfile)
+        storage.close({'key1': 'value1'})
+        with self.assertRaises(Exception):
+            # Lambdas cannot be pickled, so the save fails halfway
+            storage.close({'key1': 'changed', 'key2': lambda: None})
+
+        self.assertEqual(PickleStorage(self.pklfile).load(), {'key1': 'value1'})
+        self.assertEqual([name for name in os.listdir(".") if name.startswith(self.pklfile + ".")], [])
+
+    def test_save_keeps_file_mode(self):
+        storage = PickleStorage(self.pklfile)
+        storage.close({'key1': 'value1'})
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.pklfile).st_mode), 0o666 & ~umask)
+
+        os.chmod(self.pklfile, 0o640)
+        storage.close({'key1': 'changed'})
+        self.assertEqual(stat.S_IMODE(os.stat(self.pklfile).st_mode), 0o640)
+
+    def test_checkpoint_writes_snapshot_taken_before(self):
+        storage = PickleStorage(self.pklfile)
+        data = {'key1': 'value1'}
+        storage.on_set('key1', 'value1')
+        older = storage.checkpoint(data)
+        data['key2'] = 'value2'
+        storage.on_set('key2', 'value2')
+        newer = storage.checkpoint(data)
+        self.assertIsNone(storage.checkpoint(data))
+
+        newer()
+        # Written late, the older snapshot does not replace the newer one
+        older()
+        self.assertEqual(PickleStorage(self.pklfile).load(), {'key1': 'value1', 'key2': 'value2'})
+
+class TestJournalStorage(unittest.TestCase):
+    def setUp(self):
+        self.pklfile = "test_journal.pkl"
+        self.__cleanup()
+
+    def tearDown(self):
+        self.__cleanup()
+
+    def __crash(self, cacheable_dict):
+        # Drop the backend so nothing is saved when the dictionary is destroyed
+        cacheable_dict._CacheableDict__finalizer.detach()
+
+    def __recover(self):
+        storage = JournalStorage(self.pklfile)
+        data = storage.load()
+        storage.close(data)
+        return data
+
+    def __cleanup(self):
+        for suffix in ("", ".journal", ".journal.old", ".tmp"):
+            if os.path.exists(self.pklfile + suffix):
+                os.remove(self.pklfile + suffix)
+
+    def test_changes_are_journaled_before_close(self):
+        cacheable_dict = CacheableDict(self.pklfile, JournalStorage(self.pklfile, sync_every=1))
+        cacheable_dict['key1'] = 'value1'
+        cacheable_dict['key2'] = 'value2'
+        del cacheable_dict['key1']
+
+        self.__crash(cacheable_dict)
+
+        self.assertEqual(self.__recover(), {'key2': 'value2'})
+
+    def test_close_compacts_into_snapshot(self):
+        cacheable_dict = CacheableDict(self.pklfile, JournalStorage(self.pklfile))
+        cacheable_dict['key1'] = 'value1'
+        del cacheable_dict
+
+        self.assertFalse(os.path.exists(self.pklfile + ".journal"))
+        with open(self.pklfile, "rb") as f:
+            self.assertEqual(pickle.load(f), {'key1': 'value1'})
+
+    def test_background_compaction(self):
+        storage = JournalStorage(self.pklfile, compact_after=3)
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        for i in range(5):
+            cacheable_dict[f'key{i}'] = i
+        storage.sync()
+        storage.wait_for_compaction()
+        with open(self.pklfile, "rb") as f:
+            self.assertEqual(pickle.load(f), {f'key{i}': i for i in range(3)})
+
+        self.__crash(cacheable_dict)
+
+        self.assertEqual(self.__recover(), {f'key{i}': i for i in range(5)})
+
+    def test_compaction_snapshot_ignores_later_changes(self):
+        storage = JournalStorage(self.pklfile, compact_after=2)
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        cacheable_dict['key1'] = ['value1']
+        cacheable_dict['key2'] = ['value2']
+        # Changed in place right after the compaction started
+        cacheable_dict['key1'].append('changed')
+        storage.wait_for_compaction()
+        with open(self.pklfile, "rb") as f:
+            self.assertEqual(pickle.load(f), {'key1': ['value1'], 'key2': ['value2']})
+        self.__crash(cacheable_dict)
+
+    def test_failed_compaction_is_reported_and_keeps_entries(self):
+        storage = JournalStorage(self.pklfile, compact_after=2)
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        with patch('personal_assistant.models.interfaces.storage._atomic_write', side_effect=OSError("disk full")):
+            cacheable_dict['key1'] = 'value1'
+            cacheable_dict['key2'] = 'value2'
+            with self.assertRaises(OSError):
+                storage.flush(cacheable_dict.data)
+            cacheable_dict['key3'] = 'value3'
+            with self.assertRaises(OSError):
+                # Rotates the journal again, after the entries of the failed compaction
+                storage.compact(cacheable_dict.data, wait=True)
+        storage.sync()
+
+        self.__crash(cacheable_dict)
+
+        self.assertEqual(self.__recover(), {'key1': 'value1', 'key2': 'value2', 'key3': 'value3'})
+
+    def test_torn_entry_is_discarded(self):
+        cacheable_dict = CacheableDict(self.pklfile, JournalStorage(self.pklfile, sync_every=1))
+        cacheable_dict['key1'] = 'value1'
+        self.__crash(cacheable_dict)
+        with open(self.pklfile + ".journal", "ab") as f:
+            f.write(pickle.dumps(("set", "key2", "value2"))[:-3])
+
+        self.assertEqual(self.__recover(), {'key1': 'value1'})
+
+class TestShardedStorage(unittest.TestCase):
+    def setUp(self):
+        self.pklfile = "test_sharded.pkl"
+        self.__cleanup()
+
+    def tearDown(self):
+        self.__cleanup()
+
+    def __cleanup(self):
+        if os.path.exists(self.pklfile):
+            os.remove(self.pklfile)
+        shutil.rmtree(self.pklfile + ".shards", ignore_errors=True)
+
+    def __fill(self, count):
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile, shards=8))
+        for i in range(count):
+            cacheable_dict[f"key{i}"] = i
+        cacheable_dict.close()
+
+    def test_round_trip_keeps_order(self):
+        self.__fill(50)
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        self.assertEqual(list(cacheable_dict.items()), [(f"key{i}", i) for i in range(50)])
+
+    def test_lookup_reads_one_shard(self):
+        self.__fill(50)
+        storage = ShardedStorage(self.pklfile)
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+
+        self.assertEqual(len(cacheable_dict), 50)
+        self.assertIn("key7", cacheable_dict)
+        self.assertEqual(storage.loaded_shards, 0)
+        self.assertEqual(cacheable_dict["key7"], 7)
+        self.assertEqual(storage.loaded_shards, 1)
+
+    def test_changes_and_deletes_are_saved(self):
+        self.__fill(20)
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        cacheable_dict["key1"] = "changed"
+        del cacheable_dict["key2"]
+        cacheable_dict.close()
+
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        self.assertEqual(cacheable_dict["key1"], "changed")
+        self.assertNotIn("key2", cacheable_dict)
+        self.assertEqual(len(cacheable_dict), 19)
+
+    def test_flush_writes_only_changed_shards(self):
+        self.__fill(20)
+        storage = ShardedStorage(self.pklfile)
+        cacheable_dict = CacheableDict(self.pklfile, storage)
+        self.assertEqual(len(cacheable_dict), 20)
+        manifest = os.path.join(storage.directory, ShardedStorage.MANIFEST)
+        os.remove(manifest)
+        cacheable_dict.flush()
+        self.assertFalse(os.path.exists(manifest))
+
+        shard = os.path.join(storage.directory, f"shard-{storage.shard_of('key3'):04d}.pkl")
+        os.remove(shard)
+        cacheable_dict["key3"] = "changed"
+        cacheable_dict.flush()
+        self.assertTrue(os.path.exists(shard))
+        # Only a value changed, so the key to shard map is still valid
+        self.assertFalse(os.path.exists(manifest))
+
+        cacheable_dict["new key"] = "value"
+        cacheable_dict.flush()
+        self.assertTrue(os.path.exists(manifest))
+
+    def test_values_changed_in_place_are_saved(self):
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        cacheable_dict["key1"] = ["value1"]
+        cacheable_dict.close()
+
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        cacheable_dict["key1"].append("value2")
+        cacheable_dict.mark_dirty("key1")
+        cacheable_dict.close()
+        self.assertEqual(CacheableDict(self.pklfile, ShardedStorage(self.pklfile))["key1"], ["value1", "value2"])
+
+    def test_manager_writes_read_one_shard(self):
+        address_book = AddressBook(ShardedStorage(self.pklfile, value_type=AddressBookRecord))
+        for i in range(200):
+            address_book[f"Contact {i}"] = AddressBookRecord(f"Contact {i}")
+        address_book.close()
+
+        for write in (lambda manager: manager.add_phone("Contact 7", Phone("1234567890")),
+                      lambda manager: manager.delete("Contact 7"),
+                      lambda manager: manager.add_record("Contact 7")):
+            with self.subTest(write=write):
+                storage = ShardedStorage(self.pklfile, value_type=AddressBookRecord)
+                manager = AddressBookManager(AddressBook(storage))
+                write(manager)
+                self.assertEqual(storage.loaded_shards, 1)
+                manager.close()
+
+    def test_migrates_single_file_snapshot(self):
+        PickleStorage(self.pklfile).close({"key1": "value1", "key2": "value2"})
+        migrated = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        self.assertEqual(len(migrated), 2)
+        migrated.close()
+
+        os.remove(self.pklfile)
+        cacheable_dict = CacheableDict(self.pklfile, ShardedStorage(self.pklfile))
+        self.assertEqual(dict(cacheable_dict), {"key1": "value1", "key2": "value2"})
+
+class TestSwitchingStorage(unittest.TestCase):
+    """Contacts saved by the default storage can be opened with the other backends."""
+
+    def setUp(self):
+        self.pklfile = "test_switching.pkl"
+        self.__cleanup()
+        address_book = AddressBook(SnapshotStorage(self.pklfile, value_type=AddressBookRecord))
+        record = AddressBookRecord("John")
+        record.add_phone(Phone("1234567890"))
+        address_book["John"] = record
+        address_book.close()
+
+    def tearDown(self):
+        self.__cleanup()
+
+    def __cleanup(self):
+        for suffix in ("", ".journal", ".journal.old"):
+            if os.path.exists(self.pklfile + suffix):
+                os.remove(self.pklfile + suffix)
+        shutil.rmtree(self.pklfile + ".shards", ignore_errors=True)
+
+    def __check(self, storage):
+        manager = AddressBookManager(AddressBook(storage))
+        self.assertIsInstance(manager.find("John"), AddressBookRecord)
+        manager.add_phone("John", Phone("0987654321"))
+        self.assertEqual(str(manager.find("John")), "Name: John, Phones: [1234567890, 0987654321]")
+        manager.close()
+
+    def test_reload_with_journal(self):
+        self.__check(JournalStorage(self.pklfile, value_type=AddressBookRecord))
+        # The compacted snapshot is still readable by the default storage
+        reloaded = SnapshotStorage(self.pklfile, value_type=AddressBookRecord).load()
+        self.assertEqual(str(reloaded["John"]), "Name: John, Phones: [1234567890, 0987654321]")
+
+    def test_reload_with_sharded(self):
+        self.__check(ShardedStorage(self.pklfile, value_type=AddressBookRecord))
+        reloaded = AddressBook(ShardedStorage(self.pklfile, value_type=AddressBookRecord))
+        self.assertEqual(str(reloaded["John"]), "Name: John, Phones: [1234567890, 0987654321]")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
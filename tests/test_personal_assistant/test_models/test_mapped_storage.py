@@ -0,0 +1,163 @@
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from personal_assistant.managers import AddressBookManager
+from personal_assistant.models import AddressBook, AddressBookRecord, MappedStorage, Phone, Birthday
+from personal_assistant.models.interfaces import SnapshotStorage
+
+
+class TestMappedStorage(unittest.TestCase):
+    def setUp(self):
+        self.filename = "test_mapped.pkl"
+        self.__cleanup()
+
+    def tearDown(self):
+        self.__cleanup()
+
+    def __cleanup(self):
+        for filename in (self.filename, self.filename + ".map"):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def __open(self):
+        self.storage = MappedStorage(self.filename)
+        return AddressBook(self.storage)
+
+    def __fill(self, count):
+        address_book = self.__open()
+        for i in range(count):
+            record = AddressBookRecord(f"Contact {i:03d}")
+            record.add_phone(Phone(f"050{i:07d}"))
+            if i % 2:
+                record.add_birthday(Birthday(f"{i % 28 + 1:02d}.03.1990"))
+            address_book[record.name] = record
+        address_book.close()
+
+    def test_round_trip_in_name_order(self):
+        address_book = self.__open()
+        for name in ("Carol", "Alice", "Émile", "Bob"):
+            address_book[name] = AddressBookRecord(name)
+        address_book["Alice"].add_phone(Phone("1234567890"))
+        address_book.close()
+
+        address_book = self.__open()
+        self.assertEqual(list(address_book), ["Alice", "Bob", "Carol", "Émile"])
+        self.assertEqual(str(address_book["Alice"]), "Name: Alice, Phones: [1234567890]")
+        address_book.close()
+
+    def test_lookup_decodes_one_record(self):
+        self.__fill(100)
+        address_book = self.__open()
+        self.assertEqual(len(address_book), 100)
+        self.assertNotIn("Nobody", address_book)
+        self.assertIsNone(address_book.get("Nobody"))
+        self.assertEqual(self.storage.decoded_records, 0)
+
+        record = address_book["Contact 042"]
+        self.assertIn("Phones: [0500000042]", str(record))
+        self.assertIs(address_book["Contact 042"], record)
+        self.assertEqual(self.storage.decoded_records, 1)
+        address_book.close()
+
+    def test_listing_keeps_only_changed_records(self):
+        self.__fill(100)
+        manager = AddressBookManager(self.__open())
+        self.assertEqual(len(list(manager.iter_records())), 100)
+        manager.add_phone("Contact 001", Phone("0441234567"))
+        manager.flush()
+        # The listing kept no record, so the changed one was decoded again
+        self.assertEqual(self.storage.decoded_records, 101)
+        # and only that one is kept in memory and encoded again
+        self.assertEqual(self.storage.changed_records, 1)
+        manager.close()
+
+        address_book = self.__open()
+        self.assertIn(Phone("0441234567"), address_book["Contact 001"].phones)
+        address_book.close()
+
+    def test_birthdays_are_read_without_decoding(self):
+        self.__fill(10)
+        address_book = self.__open()
+        birthdays = dict(address_book.iter_birthdays())
+        self.assertEqual(birthdays, {f"Contact {i:03d}": date(1990, 3, i + 1) for i in range(1, 10, 2)})
+        self.assertEqual(self.storage.decoded_records, 0)
+        address_book.close()
+
+    def test_changes_are_saved(self):
+        self.__fill(10)
+        manager = AddressBookManager(self.__open())
+        manager.add_phone("Contact 001", Phone("0441234567"))
+        manager.delete("Contact 002")
+        manager.delete("Contact 003")
+        manager.add_record("Contact 003")
+        manager.add_record("Anna")
+        manager.close()
+
+        address_book = self.__open()
+        self.assertEqual(len(address_book), 10)
+        self.assertEqual(list(address_book)[:2], ["Anna", "Contact 000"])
+        self.assertNotIn("Contact 002", address_book)
+        self.assertEqual(str(address_book["Contact 003"]), "Name: Contact 003")
+        self.assertIn(Phone("0441234567"), address_book["Contact 001"].phones)
+        address_book.close()
+
+    def test_added_names_are_iterated_in_name_order(self):
+        self.__fill(3)
+        address_book = self.__open()
+        address_book["Contact 001a"] = AddressBookRecord("Contact 001a")
+        address_book["Anna"] = AddressBookRecord("Anna")
+        address_book["Zoe"] = AddressBookRecord("Zoe")
+        self.assertEqual(list(address_book),
+                         ["Anna", "Contact 000", "Contact 001", "Contact 001a", "Contact 002", "Zoe"])
+        address_book.close()
+
+    def test_phone_index_does_not_keep_records(self):
+        self.__fill(100)
+        manager = AddressBookManager(self.__open())
+        manager.delete("Contact 000")
+        self.assertEqual([record.name for record in manager.find_by_phone("0500000042")], ["Contact 042"])
+        self.assertEqual(manager.find_by_phone("0500000000"), [])
+        # Only the deleted contact and the one that was found are decoded as records
+        self.assertEqual(self.storage.decoded_records, 2)
+        manager.close()
+
+    def test_reading_does_not_rewrite_snapshot(self):
+        self.__fill(10)
+        inode = os.stat(self.filename + ".map").st_ino
+        address_book = self.__open()
+        address_book["Contact 005"]
+        address_book.close()
+        self.assertEqual(os.stat(self.filename + ".map").st_ino, inode)
+
+    def test_upcoming_birthdays_through_manager(self):
+        self.__fill(10)
+        manager = AddressBookManager(self.__open())
+        upcoming = manager.get_upcoming_birthdays(4, today=date(2024, 3, 1))
+        self.assertEqual([birthday["name"] for birthday in upcoming], ["Contact 001", "Contact 003"])
+        self.assertEqual(self.storage.decoded_records, 0)
+        manager.close()
+
+    def test_migrates_single_file_snapshot(self):
+        record = AddressBookRecord("John")
+        record.add_phone(Phone("1234567890"))
+        SnapshotStorage(self.filename, value_type=AddressBookRecord).close({"John": record})
+
+        address_book = self.__open()
+        self.assertEqual(str(address_book["John"]), str(record))
+        address_book.close()
+        self.assertTrue(os.path.exists(self.filename + ".map"))
+
+    def test_rejects_other_files(self):
+        with open(self.filename + ".map", "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            len(self.__open())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from personal_assistant.models import SqliteAddressBook, AddressBookRecord, Phone, Birthday, Email
+
+class TestSqliteAddressBook(unittest.TestCase):
+    def setUp(self):
+        self.dbfile = "test_addressbook.sqlite3"
+        self.address_book = SqliteAddressBook(self.dbfile)
+
+    def tearDown(self):
+        self.address_book.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.dbfile + suffix):
+                os.remove(self.dbfile + suffix)
+
+    def test_add_record(self):
+        self.address_book["John Doe"] = AddressBookRecord("John Doe")
+        self.assertIn("John Doe", self.address_book)
+        self.assertEqual(len(self.address_book), 1)
+        self.assertIs(self.address_book["John Doe"], self.address_book.get("John Doe"))
+
+    def test_add_invalid_record_raises(self):
+        with self.assertRaises(TypeError):
+            self.address_book["Jane Doe"] = "Not a Record"
+
+    def test_delete_record(self):
+        self.address_book["John Doe"] = AddressBookRecord("John Doe")
+        del self.address_book["John Doe"]
+        self.assertIsNone(self.address_book.get("John Doe"))
+        with self.assertRaises(KeyError):
+            del self.address_book["John Doe"]
+
+    def test_in_place_changes_are_persisted(self):
+        self.address_book["John Doe"] = AddressBookRecord("John Doe")
+        record = self.address_book["John Doe"]
+        record.add_phone(Phone("1234567890"))
+        record.add_birthday(Birthday("03.01.1990"))
+        record.add_email(Email("john@example.com"))
+        self.address_book.mark_dirty("John Doe")
+        del record
+        # Closed by the finalizer
+        self.address_book = None
+
+        self.address_book = SqliteAddressBook(self.dbfile)
+        self.assertEqual(str(self.address_book["John Doe"]),
+                         "Name: John Doe, Phones: [1234567890], Birthday: 03.01.1990, Email: john@example.com")
+
+    def test_flush_writes_only_reported_changes(self):
+        for name in ("John Doe", "Jane Smith"):
+            self.address_book[name] = AddressBookRecord(name)
+        john, jane = self.address_book["John Doe"], self.address_book["Jane Smith"]
+        john.add_phone(Phone("1111111111"))
+        jane.add_phone(Phone("2222222222"))
+        self.address_book.mark_dirty("Jane Smith")
+        self.address_book.flush()
+
+        other = SqliteAddressBook(self.dbfile)
+        self.assertEqual(list(other["John Doe"].phones), [])
+        self.assertEqual(list(other["Jane Smith"].phones), [Phone("2222222222")])
+        other.close()
+
+    def test_reading_does_not_keep_or_rewrite_records(self):
+        for name in ("John Doe", "Jane Smith"):
+            self.address_book[name] = AddressBookRecord(name)
+        self.assertEqual(len(list(self.address_book.values())), 2)
+        self.assertEqual(str(self.address_book["John Doe"]), "Name: John Doe")
+        self.assertEqual(len(self.address_book._SqliteAddressBook__loaded), 0)
+
+        # A change that was not reported is not written back by close()
+        record = self.address_book["John Doe"]
+        record.add_phone(Phone("1111111111"))
+        self.address_book.close()
+        self.address_book = SqliteAddressBook(self.dbfile)
+        self.assertEqual(list(self.address_book["John Doe"].phones), [])
+
+    def test_indexed_lookups(self):
+        record = AddressBookRecord("John Doe")
+        record.add_phone(Phone("1234567890"))
+        record.add_birthday(Birthday("03.01.1990"))
+        record.add_email(Email("john@example.com"))
+        self.address_book["John Doe"] = record
+        self.address_book["Jane Doe"] = AddressBookRecord("Jane Doe")
+
+        self.assertEqual([r.name for r in self.address_book.find_by_phone("1234567890")], ["John Doe"])
+        self.assertEqual([r.name for r in self.address_book.find_by_email("john@example.com")], ["John Doe"])
+        self.assertEqual([r.name for r in self.address_book.find_by_birthday(1, 3)], ["John Doe"])
+        self.assertEqual(self.address_book.find_by_phone("0000000000"), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
\ No newline at end of file
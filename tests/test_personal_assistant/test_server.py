@@ -0,0 +1,142 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+import threading
+from unittest.mock import Mock
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from personal_assistant.server import AssistantServer
+
+
+class TestAssistantServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.address_book_manager = Mock()
+        self.notes_manager = Mock()
+        self.server = AssistantServer(self.address_book_manager, self.notes_manager)
+        listening = await self.server.start("127.0.0.1:0")
+        self.port = listening.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+
+    async def connect(self):
+        return await asyncio.open_connection("127.0.0.1", self.port)
+
+    @staticmethod
+    async def request(reader, writer, line):
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        lines = []
+        while (received := (await reader.readline()).decode().rstrip("\n")) != ".":
+            lines.append(received)
+        return lines
+
+    async def test_executes_commands(self):
+        self.address_book_manager.find.return_value = "Name: John"
+        reader, writer = await self.connect()
+
+        self.assertEqual(await self.request(reader, writer, "hi"), ["How can I help you?"])
+        self.assertEqual(await self.request(reader, writer, "search John"), ["Name: John"])
+        self.address_book_manager.find.assert_called_once_with("John")
+        writer.close()
+
+    async def test_errors_are_prefixed(self):
+        reader, writer = await self.connect()
+        self.assertEqual(await self.request(reader, writer, "unknown"), ["Error: Unknown command"])
+        self.assertEqual(await self.request(reader, writer, "search 'John"),
+                         ["Error: Parse error: No closing quotation"])
+        writer.close()
+
+    async def test_lines_starting_with_terminator_are_escaped(self):
+        self.notes_manager.find.return_value = "x"
+        self.notes_manager.search.return_value = [".hidden"]
+        reader, writer = await self.connect()
+        self.assertEqual(await self.request(reader, writer, "find-notes hidden"), ["..hidden: x"])
+        writer.close()
+
+    async def test_listing_is_streamed_in_chunks(self):
+        self.server.CHUNK_LINES = 2
+        threads = set()
+
+        def iter_rendered(offset, limit):
+            for i in range(5):
+                threads.add(threading.current_thread())
+                yield f".{i}" if i == 3 else f"Name: {i}"
+        self.address_book_manager.iter_rendered.side_effect = iter_rendered
+        reader, writer = await self.connect()
+
+        self.assertEqual(await self.request(reader, writer, "all"),
+                         ["Name: 0", "Name: 1", "Name: 2", "..3", "Name: 4"])
+        # Read by worker threads, never by the event loop
+        self.assertNotIn(threading.current_thread(), threads)
+        writer.close()
+
+    async def test_exit_ends_session(self):
+        reader, writer = await self.connect()
+        self.assertEqual(await self.request(reader, writer, "exit"), ["Goodbye!"])
+        self.assertEqual(await reader.read(), b"")
+        self.address_book_manager.close.assert_not_called()
+        writer.close()
+
+    async def test_concurrent_sessions(self):
+        self.address_book_manager.find.side_effect = lambda name: f"Name: {name}"
+
+        async def session(number):
+            reader, writer = await self.connect()
+            responses = [await self.request(reader, writer, f"search User{number}-{i}") for i in range(10)]
+            writer.close()
+            return responses
+
+        results = await asyncio.gather(*(session(number) for number in range(20)))
+        for number, responses in enumerate(results):
+            self.assertEqual(responses, [[f"Name: User{number}-{i}"] for i in range(10)])
+
+    async def test_reads_of_one_store_run_in_parallel(self):
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def find(name):
+            both_inside.wait()
+            return f"Name: {name}"
+        self.address_book_manager.find.side_effect = find
+
+        async def session(name):
+            reader, writer = await self.connect()
+            response = await self.request(reader, writer, f"search {name}")
+            writer.close()
+            return response
+
+        self.assertEqual(await asyncio.gather(session("John"), session("Jane")), [["Name: John"], ["Name: Jane"]])
+
+    def test_rejects_managers_that_are_not_thread_safe(self):
+        with self.assertRaises(ValueError):
+            AssistantServer(Mock(thread_safe=False), Mock())
+
+    async def test_close_saves_managers(self):
+        self.server.close()
+        self.address_book_manager.close.assert_called_once()
+        self.notes_manager.close.assert_called_once()
+
+
+@unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "Unix sockets are not available")
+class TestAssistantServerUnixSocket(unittest.IsolatedAsyncioTestCase):
+    async def test_serves_on_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "assistant.sock")
+            server = AssistantServer(Mock(), Mock())
+            await server.start(f"unix:{path}")
+
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"hello\n")
+            await writer.drain()
+            self.assertEqual(await reader.readline(), b"How can I help you?\n")
+            self.assertEqual(await reader.readline(), b".\n")
+            writer.close()
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)